@@ -0,0 +1,105 @@
+import base64
+import hashlib
+import hmac
+import math
+import os
+import secrets
+import time
+from typing import Optional, Tuple
+
+import orjson
+from dotenv import load_dotenv
+
+from cache import TTLCache
+
+load_dotenv()
+
+# Настройки токенов и ограничения попыток входа (секрет обязателен, например: openssl rand -hex 32)
+AUTH_TOKEN_SECRET = os.getenv("AUTH_TOKEN_SECRET")
+AUTH_TOKEN_TTL_SECONDS = int(os.getenv("AUTH_TOKEN_TTL_SECONDS", "900"))
+LOGIN_MAX_FAILURES = int(os.getenv("LOGIN_MAX_FAILURES", "5"))
+LOGIN_LOCKOUT_SECONDS = float(os.getenv("LOGIN_LOCKOUT_SECONDS", "300"))
+LOGIN_TRACKED_CLIENTS = int(os.getenv("LOGIN_TRACKED_CLIENTS", "10000"))
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+def _digest(value: str) -> bytes:
+    return hashlib.sha256(value.encode("utf8")).digest()
+
+class AdminAuthenticator:
+    """Проверка учетных данных и подписанные токены администратора
+
+    Дайджесты учетных данных вычисляются один раз при создании; токен проверяется
+    одной HMAC без обращения к базе.
+    """
+
+    def __init__(self, username: str, password: str, secret: Optional[str] = AUTH_TOKEN_SECRET,
+                 token_ttl: int = AUTH_TOKEN_TTL_SECONDS):
+        self._username_digest = _digest(username)
+        self._password_digest = _digest(password)
+        # Ключ только из отдельного секрета развертывания (общего для всех процессов):
+        # ключ из учетных данных позволил бы подобрать пароль по любому токену
+        if not secret:
+            raise ValueError("AUTH_TOKEN_SECRET is not set: generate a random secret for the deployment")
+        self._key = hashlib.sha256(secret.encode("utf8")).digest()
+        self.token_ttl = token_ttl
+
+    def check_credentials(self, username: str, password: str) -> bool:
+        """Сравнение за постоянное время (дайджесты одинаковой длины)"""
+        is_correct_username = hmac.compare_digest(_digest(username), self._username_digest)
+        is_correct_password = hmac.compare_digest(_digest(password), self._password_digest)
+        return is_correct_username and is_correct_password
+
+    def _sign(self, payload: str) -> str:
+        return _b64encode(hmac.new(self._key, payload.encode("utf8"), hashlib.sha256).digest())
+
+    def issue_token(self, username: str) -> Tuple[str, int]:
+        """Токен вида payload.signature и срок его действия в секундах"""
+        claims = {"sub": username, "exp": int(time.time()) + self.token_ttl, "jti": secrets.token_hex(8)}
+        payload = _b64encode(orjson.dumps(claims))
+        return f"{payload}.{self._sign(payload)}", self.token_ttl
+
+    def verify_token(self, token: str) -> Optional[str]:
+        """Имя пользователя из действительного токена или None"""
+        payload, _, signature = token.partition(".")
+        # Сравнение байтов: compare_digest не принимает строки с не-ASCII символами
+        if not signature or not hmac.compare_digest(signature.encode("utf8"), self._sign(payload).encode("ascii")):
+            return None
+        try:
+            claims = orjson.loads(_b64decode(payload))
+        except (ValueError, orjson.JSONDecodeError):
+            return None
+        if not isinstance(claims, dict) or claims.get("exp", 0) < time.time():
+            return None
+        return claims.get("sub")
+
+class LoginAttemptLimiter:
+    """Неудачные попытки входа по IP в ограниченном LRU-кэше"""
+
+    def __init__(self, max_failures: int = LOGIN_MAX_FAILURES, window: float = LOGIN_LOCKOUT_SECONDS,
+                 max_clients: int = LOGIN_TRACKED_CLIENTS):
+        self.max_failures = max_failures
+        self.window = window
+        self._failures = TTLCache(maxsize=max_clients, ttl=window)
+
+    def retry_after(self, client: str) -> int:
+        """Секунды до снятия блокировки (0 — попытка разрешена)"""
+        hit, entry = self._failures.get(client)
+        if not hit:
+            return 0
+        count, last_failure = entry
+        if count < self.max_failures:
+            return 0
+        return max(1, math.ceil(last_failure + self.window - time.monotonic()))
+
+    def record_failure(self, client: str) -> None:
+        hit, entry = self._failures.get(client)
+        count = entry[0] + 1 if hit else 1
+        self._failures.set(client, (count, time.monotonic()))
+
+    def reset(self, client: str) -> None:
+        self._failures.invalidate(client)
@@ -0,0 +1,88 @@
+"""Страницы каталога из колоночного снимка: время запроса и память на проект
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_columnar --items 10000 --repeat 200
+"""
+import argparse
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from bson import ObjectId
+
+from benchmarks.bench_serialization import make_documents
+from columnar import ColumnarCatalogue
+from models import ProjectStatus
+from serializers import project_to_dict
+
+FILTERS = [
+    {},
+    {"status": ProjectStatus.ACTIVE.value},
+    {"category": "Категория 3"},
+    {"status": ProjectStatus.ACTIVE.value, "is_project_completed": True},
+    {"status": ProjectStatus.PAUSED.value, "category": "Категория 4", "is_project_completed": True},
+    {"status": ProjectStatus.COMPLETED.value, "is_project_completed": True}
+]
+
+def make_catalogue(count: int) -> List[dict]:
+    """Документы с разными статусами и категориями"""
+    statuses = [s.value for s in ProjectStatus]
+    docs = make_documents(count)
+    for i, doc in enumerate(docs):
+        doc["status"] = statuses[i % len(statuses)]
+        doc["category"] = f"Категория {i % 20}"
+    return docs
+
+def scan_page(docs: List[dict], filter_query: Dict, limit: int) -> List[dict]:
+    """Линейный проход по документам, отсортированным как PROJECTS_SORT"""
+    items = []
+    for doc in docs:
+        if all(doc.get(field) == value for field, value in filter_query.items()):
+            items.append(project_to_dict(doc))
+            if len(items) == limit:
+                break
+    return items
+
+def measure(func, repeat: int) -> float:
+    """Лучшее время вызова в микросекундах"""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best * 1_000_000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=10000)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    docs = make_catalogue(args.items)
+    ordered = sorted(docs, key=lambda doc: (doc["created_at"], doc["_id"]), reverse=True)
+
+    catalogue = ColumnarCatalogue()
+    started = time.perf_counter()
+    catalogue.build(docs)
+    build_ms = (time.perf_counter() - started) * 1000
+    stats = catalogue.stats()
+
+    print(f"items: {args.items}, limit: {args.limit}, repeat: {args.repeat}")
+    print(f"build: {build_ms:.1f} ms, bitmaps: {stats['bitmaps']}, "
+          f"memory: {stats['memory_bytes'] / 1024 / 1024:.1f} MiB ({stats['bytes_per_project']} bytes/project)")
+    for filter_query in FILTERS:
+        items, _ = catalogue.page(filter_query, None, args.limit)
+        assert items == scan_page(ordered, filter_query, args.limit)
+        columnar = measure(lambda: catalogue.page(filter_query, None, args.limit), args.repeat)
+        scan = measure(lambda: scan_page(ordered, filter_query, args.limit), args.repeat)
+        print(f"{str(filter_query):90} bitmaps: {columnar:8.1f} us  scan: {scan:8.1f} us")
+
+    # Инкрементальные изменения: новый проект (в конец) и смена статуса
+    project = dict(docs[0], _id=ObjectId(), created_at=datetime(2030, 1, 1) + timedelta(seconds=1))
+    insert = measure(lambda: catalogue.update(None, dict(project, _id=ObjectId())), 100)
+    update = measure(lambda: catalogue.update(docs[0], dict(docs[0], status=ProjectStatus.PAUSED.value)), 100)
+    print(f"insert newest: {insert:.1f} us, update status: {update:.1f} us")
+
+if __name__ == "__main__":
+    main()
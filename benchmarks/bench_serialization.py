@@ -0,0 +1,91 @@
+"""Сравнение стоимости сериализации списка проектов на один элемент
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_serialization --items 1000 --repeat 20
+"""
+import argparse
+import json
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+import orjson
+from bson import ObjectId
+from pydantic import TypeAdapter
+
+from models import AIAssistantResponse
+from serializers import project_to_dict
+
+
+def make_documents(count: int) -> List[dict]:
+    """Синтетические документы в формате коллекции ai_assistants"""
+    base = datetime(2024, 1, 1)
+    return [
+        {
+            "_id": ObjectId(),
+            "name": f"Assistant {i}",
+            "admin_panel_name": f"assistant_{i}",
+            "project_description": "Интеллектуальный ассистент для автоматизации обработки клиентских запросов",
+            "links": [
+                {"name": "WhatsApp", "url": "https://api.whatsapp.com/send/?phone=77000000000", "type": "whatsapp"},
+                {"name": "Telegram", "url": "https://t.me/example_bot", "type": "telegram"}
+            ],
+            "is_project_completed": i % 2 == 0,
+            "status": "Активен",
+            "features": ["Обработка запросов 24/7", "Интеграция с CRM", "Планирование встреч"],
+            "category": "Бизнес-Автоматизация",
+            "created_at": base + timedelta(minutes=i),
+            "updated_at": base + timedelta(minutes=i)
+        }
+        for i in range(count)
+    ]
+
+
+_adapter = TypeAdapter(List[AIAssistantResponse])
+
+
+def serialize_models(docs: List[dict]) -> bytes:
+    """Прежний путь: модель на документ + валидация response_model + json"""
+    models = []
+    for doc in docs:
+        doc = dict(doc, id=str(doc["_id"]))
+        models.append(AIAssistantResponse(**doc))
+    content = _adapter.dump_python(_adapter.validate_python(models), mode="json")
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def serialize_fast(docs: List[dict]) -> bytes:
+    """Быстрый путь: словари из документов + orjson"""
+    return orjson.dumps([project_to_dict(doc) for doc in docs])
+
+
+def measure(func, docs: List[dict], repeat: int) -> float:
+    """Лучшее время на элемент в микросекундах"""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(docs)
+        best = min(best, time.perf_counter() - started)
+    return best / len(docs) * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    docs = make_documents(args.items)
+    assert orjson.loads(serialize_fast(docs)) == json.loads(serialize_models(docs))
+
+    before = measure(serialize_models, docs, args.repeat)
+    after = measure(serialize_fast, docs, args.repeat)
+
+    print(f"items: {args.items}, repeat: {args.repeat}")
+    print(f"pydantic models + json: {before:8.2f} us/item")
+    print(f"project_to_dict + orjson: {after:8.2f} us/item")
+    print(f"speedup: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
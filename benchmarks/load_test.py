@@ -0,0 +1,212 @@
+"""Нагрузочный тест API на локальной заглушке MongoDB
+
+Заполняет базу N синтетическими проектами (по образцу database.build_sample_projects),
+прогоняет эндпоинты через httpx ASGITransport с заданной конкурентностью и выводит
+пропускную способность и перцентили задержки.
+
+Запуск из корня репозитория:
+    pip install -r benchmarks/requirements.txt
+    python -m benchmarks.load_test --projects 5000 --requests 2000 --concurrency 50
+
+С --mongodb-url тест идет против настоящего сервера (база очищается!).
+--max-p95-ms завершает процесс с кодом 1, если какой-либо сценарий медленнее порога.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+# main.py читает конфигурацию при импорте
+os.environ.setdefault("PORT", "6565")
+os.environ.setdefault("ADMIN_USERNAME", "bench")
+os.environ.setdefault("ADMIN_PASSWORD", "bench")
+os.environ.setdefault("AUTH_TOKEN_SECRET", "bench")
+os.environ.setdefault("DATABASE_NAME", "bench")
+
+import httpx
+
+import database
+import main
+from models import ProjectStatus
+
+def make_projects(count: int) -> list:
+    """Синтетические проекты на основе тестовых данных"""
+    samples = database.build_sample_projects()
+    statuses = [s.value for s in ProjectStatus]
+    base = datetime.utcnow() - timedelta(days=365)
+    projects = []
+    for i in range(count):
+        project = dict(samples[i % len(samples)])
+        project["name"] = f"{project['name']} #{i}"
+        project["status"] = statuses[i % len(statuses)]
+        project["is_project_completed"] = i % 3 == 0
+        project["category"] = f"{project['category']} {i % 10}"
+        project["created_at"] = base + timedelta(seconds=i)
+        project["updated_at"] = project["created_at"]
+        projects.append(project)
+    return projects
+
+def new_project_body(i: int) -> dict:
+    return {
+        "name": f"Bench project {i}",
+        "project_description": "Проект, созданный нагрузочным тестом",
+        "links": [{"name": "Telegram", "url": "https://t.me/bench_bot", "type": "telegram"}],
+        "status": ProjectStatus.ACTIVE.value,
+        "features": ["Нагрузочный тест"],
+        "category": "Benchmark"
+    }
+
+async def setup_database(args):
+    """Подключить main к заглушке или реальному серверу и заполнить данными"""
+    if args.mongodb_url:
+        database.MONGODB_URL = args.mongodb_url
+        await database.connect_to_mongo()
+        client = database.db.client
+    else:
+        try:
+            from mongomock_motor import AsyncMongoMockClient
+        except ImportError:
+            sys.exit("mongomock-motor is required: pip install -r benchmarks/requirements.txt")
+        client = AsyncMongoMockClient()
+
+    main.db_client = database.db.client = client
+    main.db = database.db.database = client[os.environ["DATABASE_NAME"]]
+    collection = main.db[main.COLLECTION_NAME]
+    await collection.delete_many({})
+
+    projects = make_projects(args.projects)
+    for start in range(0, len(projects), 1000):
+        await collection.insert_many(projects[start:start + 1000])
+    return [p["_id"] for p in projects]
+
+def percentile(values: list, q: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(q / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+async def run_scenario(client, name, make_request, total, concurrency):
+    """Выполнить total запросов с заданной конкурентностью"""
+    latencies = []
+    errors = 0
+    counter = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for i in counter:
+            started = time.perf_counter()
+            response = await make_request(client, i)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    ms = [value * 1000 for value in latencies]
+    return {
+        "scenario": name,
+        "requests": total,
+        "errors": errors,
+        "rps": total / elapsed,
+        "mean": statistics.fmean(ms),
+        "p50": percentile(ms, 50),
+        "p95": percentile(ms, 95),
+        "p99": percentile(ms, 99)
+    }
+
+def build_scenarios(ids: list, auth: dict) -> list:
+    created = []
+
+    async def create(client, i):
+        response = await client.post("/api/projects", json=new_project_body(i), headers=auth)
+        if response.status_code == 201:
+            created.append(response.json()["id"])
+        return response
+
+    async def update(client, i):
+        project_id = created[i % len(created)] if created else str(random.choice(ids))
+        return await client.put(
+            f"/api/projects/{project_id}", json={"category": f"Benchmark {i % 5}"}, headers=auth
+        )
+
+    async def delete(client, i):
+        if not created:
+            return httpx.Response(404)
+        return await client.delete(f"/api/projects/{created.pop()}", headers=auth)
+
+    statuses = [s.value for s in ProjectStatus]
+    return [
+        ("get_projects", lambda c, i: c.get("/api/projects")),
+        ("get_projects filtered", lambda c, i: c.get(
+            "/api/projects", params={"status_filter": statuses[i % len(statuses)], "completed": i % 2 == 0}
+        )),
+        ("get_project", lambda c, i: c.get(f"/api/projects/{random.choice(ids)}")),
+        ("get_stats", lambda c, i: c.get("/api/stats")),
+        ("get_categories", lambda c, i: c.get("/api/categories")),
+        ("get_bootstrap", lambda c, i: c.get("/api/bootstrap")),
+        ("create_project", create),
+        ("update_project", update),
+        ("delete_project", delete)
+    ]
+
+async def run(args) -> int:
+    ids = await setup_database(args)
+    if args.no_cache:
+        main.catalogue_cache.maxsize = 0
+    # Все запросы идут от одного клиента — ограничитель измерял бы сам себя
+    main.rate_limiter.enabled = False
+
+    transport = httpx.ASGITransport(app=main.app)
+    results = []
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # Как админ-панель: один вход, дальше токен
+        response = await client.post("/api/auth/login", json={
+            "username": os.environ["ADMIN_USERNAME"],
+            "password": os.environ["ADMIN_PASSWORD"]
+        })
+        response.raise_for_status()
+        auth = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        for name, make_request in build_scenarios(ids, auth):
+            if args.only and name not in args.only:
+                continue
+            results.append(await run_scenario(client, name, make_request, args.requests, args.concurrency))
+
+    print(f"projects: {args.projects}, requests/scenario: {args.requests}, "
+          f"concurrency: {args.concurrency}, cache: {'off' if args.no_cache else 'on'}")
+    print(f"{'scenario':<24}{'rps':>10}{'mean ms':>10}{'p50':>9}{'p95':>9}{'p99':>9}{'errors':>8}")
+    for r in results:
+        print(f"{r['scenario']:<24}{r['rps']:>10.1f}{r['mean']:>10.2f}"
+              f"{r['p50']:>9.2f}{r['p95']:>9.2f}{r['p99']:>9.2f}{r['errors']:>8}")
+
+    if args.max_p95_ms is not None:
+        slow = [r["scenario"] for r in results if r["p95"] > args.max_p95_ms]
+        if slow:
+            print(f"p95 above {args.max_p95_ms} ms: {', '.join(slow)}")
+            return 1
+    return 0
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--projects", type=int, default=1000, help="количество проектов в базе")
+    parser.add_argument("--requests", type=int, default=500, help="запросов на сценарий")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--mongodb-url", help="реальный сервер вместо заглушки")
+    parser.add_argument("--no-cache", action="store_true", help="отключить кэш каталога")
+    parser.add_argument("--only", nargs="*", help="выполнить только указанные сценарии")
+    parser.add_argument("--max-p95-ms", type=float, help="порог p95 для проверки регрессий")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    logging.getLogger().setLevel(logging.WARNING)
+    sys.exit(asyncio.run(run(args)))
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,234 @@
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Настройки кэша
+CACHE_TTL_SECONDS = float(os.getenv("CACHE_TTL_SECONDS", "30"))
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "512"))
+
+# Поля, от которых зависят /api/stats и /api/categories
+_STATS_FIELDS = ("status", "is_project_completed", "category", "rating")
+
+
+class TTLCache:
+    """Ограниченный кэш в памяти процесса с TTL и вытеснением LRU"""
+
+    def __init__(self, maxsize: int = CACHE_MAX_ENTRIES, ttl: float = CACHE_TTL_SECONDS):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.discarded = 0
+        # Поколение растет при каждом сбросе: загрузка, начатая до записи, не кладет в кэш устаревший результат
+        self.generation = 0
+        # Наблюдатель счетчиков (метрики Prometheus): observer(имя счетчика, приращение)
+        self.observer: Optional[Callable[[str, int], None]] = None
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        setattr(self, name, getattr(self, name) + amount)
+        if self.observer is not None:
+            self.observer(name, amount)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """Вернуть (hit, value); просроченные записи удаляются"""
+        entry = self._data.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self._data.move_to_end(key)
+                self._count("hits")
+                return True, value
+            del self._data[key]
+        self._count("misses")
+        return False, None
+
+    def set(self, key: Hashable, value: Any, generation: Optional[int] = None) -> None:
+        """Сохранить значение, вытесняя самые старые записи
+
+        generation — поколение, прочитанное до загрузки значения; если с тех пор
+        кэш сбрасывался, значение могло устареть и не сохраняется.
+        """
+        if generation is not None and generation != self.generation:
+            self._count("discarded")
+            return
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        evicted = 0
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            evicted += 1
+        self._count("stores")
+        if evicted:
+            self._count("evictions", evicted)
+
+    def invalidate(self, key: Hashable) -> None:
+        """Удалить одну запись"""
+        self.generation += 1
+        if self._data.pop(key, None) is not None:
+            self._count("invalidations")
+
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]) -> None:
+        """Удалить все записи, ключ которых удовлетворяет условию"""
+        self.generation += 1
+        keys = [k for k in self._data if predicate(k)]
+        for key in keys:
+            del self._data[key]
+        if keys:
+            self._count("invalidations", len(keys))
+
+    def clear(self) -> None:
+        """Очистить кэш"""
+        self.generation += 1
+        count = len(self._data)
+        self._data.clear()
+        if count:
+            self._count("invalidations", count)
+
+    def stats(self) -> Dict[str, Any]:
+        """Счетчики попаданий и промахов"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "discarded": self.discarded,
+        }
+
+
+catalogue_cache = TTLCache()
+
+
+class SingleFlight:
+    """Одновременные одинаковые загрузки выполняются одним запросом к базе"""
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self.loads = 0
+        self.coalesced = 0
+        # Наблюдатель счетчика объединенных запросов (метрики Prometheus)
+        self.observer: Optional[Callable[[str, int], None]] = None
+
+    async def run(self, key: Hashable, load: Callable[[], Awaitable[Any]]) -> Any:
+        """Результат load() для ключа; пока загрузка идет, остальные ждут ее"""
+        task = self._calls.get(key)
+        if task is not None:
+            self.coalesced += 1
+            if self.observer is not None:
+                self.observer("coalesced", 1)
+        else:
+            self.loads += 1
+            # Отдельная задача: отмена первого запроса не прерывает ожидающих
+            task = asyncio.ensure_future(load())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # Ошибка уже передана ожидающим; здесь только помечаем ее полученной
+            task.exception()
+
+    def forget(self) -> None:
+        """После записи новые запросы не присоединяются к уже идущим загрузкам"""
+        self._calls.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"in_flight": len(self._calls), "loads": self.loads, "coalesced": self.coalesced}
+
+catalogue_flights = SingleFlight()
+
+
+# Ключи кэша публичного каталога
+def projects_key(
+    status_filter: Optional[str],
+    category_filter: Optional[str],
+    completed: Optional[bool],
+    *page: Hashable
+) -> Tuple:
+    """Ключ страницы списка проектов: сначала фильтры, затем параметры страницы"""
+    return ("projects", status_filter, category_filter, completed, *page)
+
+
+def project_key(project_id: str) -> Tuple:
+    return ("project", project_id)
+
+
+def search_key(*parts: Hashable) -> Tuple:
+    return ("search", *parts)
+
+
+STATS_KEY = ("stats",)
+# Счетчики категорий и статусов (из них же строится /api/categories)
+FACETS_KEY = ("facets",)
+
+
+def _list_matches(key: Hashable, project: Dict) -> bool:
+    """Попадает ли документ в выборку, закэшированную под ключом списка"""
+    if not (isinstance(key, tuple) and key[0] == "projects"):
+        return False
+    _, status_filter, category_filter, completed = key[:4]
+    if status_filter and project.get("status") != status_filter:
+        return False
+    if category_filter and project.get("category") != category_filter:
+        return False
+    if completed is not None and project.get("is_project_completed") != completed:
+        return False
+    return True
+
+
+def invalidate_project_write(before: Optional[Dict], after: Optional[Dict]) -> None:
+    """Сбросить записи, затронутые изменением документа
+
+    before — документ до записи (None при создании),
+    after — документ после записи (None при удалении).
+    """
+    versions = [doc for doc in (before, after) if doc is not None]
+    if not versions:
+        return
+
+    catalogue_flights.forget()
+    catalogue_cache.invalidate(project_key(str(versions[0]["_id"])))
+    catalogue_cache.invalidate_where(
+        lambda key: any(_list_matches(key, doc) for doc in versions)
+    )
+    # Релевантность зависит от всей коллекции, поэтому поиск сбрасывается целиком
+    catalogue_cache.invalidate_where(lambda key: key[0] == "search")
+
+    if before is None or after is None:
+        catalogue_cache.invalidate(STATS_KEY)
+        catalogue_cache.invalidate(FACETS_KEY)
+        return
+
+    if any(before.get(f) != after.get(f) for f in _STATS_FIELDS):
+        catalogue_cache.invalidate(STATS_KEY)
+    if before.get("category") != after.get("category") or before.get("status") != after.get("status"):
+        catalogue_cache.invalidate(FACETS_KEY)
+
+def invalidate_external_write(project_id: str) -> None:
+    """Сбросить записи после изменения, о котором известен только id (запись другим процессом)"""
+    catalogue_flights.forget()
+    catalogue_cache.invalidate(project_key(project_id))
+    catalogue_cache.invalidate_where(lambda key: key[0] in ("projects", "search"))
+    catalogue_cache.invalidate(STATS_KEY)
+    catalogue_cache.invalidate(FACETS_KEY)
@@ -0,0 +1,158 @@
+import codecs
+import csv
+import io
+import json
+import os
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+import orjson
+from dotenv import load_dotenv
+
+from serializers import RESPONSE_FIELDS, project_to_dict
+
+load_dotenv()
+
+# Размеры пакетов экспорта/импорта
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "500"))
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "500"))
+
+# Колонки CSV: списки и вложенные объекты хранятся как JSON
+CSV_COLUMNS = ("id",) + RESPONSE_FIELDS
+_CSV_JSON_COLUMNS = {"links", "features"}
+_CSV_OPTIONAL_COLUMNS = {"admin_panel_name", "category", "rating"}
+
+# Поля документа, которые берутся из файла как есть, а не через модель
+_TIMESTAMP_FIELDS = ("created_at", "updated_at")
+
+async def export_ndjson(cursor) -> AsyncIterator[bytes]:
+    """Поток NDJSON: одна строка на проект, запись пакетами"""
+    chunk = []
+    async for project in cursor:
+        chunk.append(orjson.dumps(project_to_dict(project)))
+        if len(chunk) >= EXPORT_BATCH_SIZE:
+            yield b"\n".join(chunk) + b"\n"
+            chunk = []
+    if chunk:
+        yield b"\n".join(chunk) + b"\n"
+
+def _csv_row(project: Dict) -> List:
+    row = []
+    for column in CSV_COLUMNS:
+        value = project.get(column)
+        if column in _CSV_JSON_COLUMNS:
+            value = orjson.dumps(value or []).decode("utf8")
+        elif isinstance(value, datetime):
+            value = value.isoformat()
+        elif value is None:
+            value = ""
+        row.append(value)
+    return row
+
+async def export_csv(cursor) -> AsyncIterator[bytes]:
+    """Поток CSV с заголовком, запись пакетами"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_COLUMNS)
+    rows = 0
+    async for project in cursor:
+        writer.writerow(_csv_row(project_to_dict(project)))
+        rows += 1
+        if rows % EXPORT_BATCH_SIZE == 0:
+            yield buffer.getvalue().encode("utf8")
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf8")
+
+async def _iter_lines(stream: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Строки из потока байтов без накопления всего тела"""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in stream:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+async def iter_ndjson(stream: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, Optional[Dict], Optional[str]]]:
+    """(номер строки, объект, ошибка разбора) для каждой непустой строки NDJSON"""
+    line_number = 0
+    async for line in _iter_lines(stream):
+        line_number += 1
+        if not line.strip():
+            continue
+        try:
+            record = orjson.loads(line)
+        except orjson.JSONDecodeError as e:
+            yield line_number, None, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(record, dict):
+            yield line_number, None, "Expected a JSON object"
+            continue
+        yield line_number, record, None
+
+def _csv_record(row: Dict[str, str]) -> Dict:
+    record = {}
+    for column, value in row.items():
+        if column not in CSV_COLUMNS:
+            continue
+        if column in _CSV_JSON_COLUMNS:
+            record[column] = json.loads(value) if value else []
+        elif column in _CSV_OPTIONAL_COLUMNS or column in ("id",) + _TIMESTAMP_FIELDS:
+            record[column] = value or None
+        else:
+            record[column] = value
+    return record
+
+async def iter_csv(stream: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, Optional[Dict], Optional[str]]]:
+    """(номер строки, объект, ошибка разбора) для каждой записи CSV
+
+    Запись может занимать несколько строк, если в кавычках есть переводы строк:
+    строки накапливаются, пока количество кавычек не станет четным.
+    """
+    header = None
+    pending = []
+    start_line = 0
+    line_number = 0
+    async for line in _iter_lines(stream):
+        line_number += 1
+        if not pending:
+            start_line = line_number
+        pending.append(line)
+        text = "\n".join(pending)
+        if text.count('"') % 2:
+            continue
+        pending = []
+        if not text.strip():
+            continue
+
+        values = next(csv.reader([text]))
+        if header is None:
+            header = values
+            continue
+        if len(values) != len(header):
+            yield start_line, None, f"Expected {len(header)} columns, got {len(values)}"
+            continue
+        try:
+            yield start_line, _csv_record(dict(zip(header, values))), None
+        except ValueError as e:
+            yield start_line, None, f"Invalid JSON column: {e}"
+
+    if pending:
+        yield start_line, None, "Unterminated quoted field"
+
+def parse_timestamps(record: Dict) -> Dict[str, datetime]:
+    """Даты создания/обновления из записи экспорта (если есть и корректны)"""
+    timestamps = {}
+    for field in _TIMESTAMP_FIELDS:
+        value = record.get(field)
+        if isinstance(value, str):
+            try:
+                timestamps[field] = datetime.fromisoformat(value)
+            except ValueError:
+                continue
+    return timestamps
@@ -0,0 +1,294 @@
+import sys
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from enum import Enum
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from bson import ObjectId
+
+from models import ProjectStatus
+from serializers import RESPONSE_DEFAULTS, RESPONSE_FIELDS
+
+# Поля с битовыми индексами (все фильтры get_projects — равенство по этим полям)
+BITMAP_FIELDS = ("status", "category", "is_project_completed")
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_MISSING = object()
+
+def _sort_value(created_at: datetime) -> int:
+    return (created_at - _EPOCH) // _MICROSECOND
+
+def _insert_bit(bitmap: int, position: int, bit: int) -> int:
+    """Вставить бит в позицию, сдвинув старшие биты"""
+    low = bitmap & ((1 << position) - 1)
+    return ((bitmap >> position) << (position + 1)) | (bit << position) | low
+
+def _remove_bit(bitmap: int, position: int) -> int:
+    """Удалить бит в позиции, сдвинув старшие биты вниз"""
+    low = bitmap & ((1 << position) - 1)
+    return ((bitmap >> (position + 1)) << position) | low
+
+def _deep_size(value) -> int:
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(_deep_size(key) + _deep_size(item) for key, item in value.items())
+    elif isinstance(value, (list, tuple)):
+        size += sum(_deep_size(item) for item in value)
+    return size
+
+class ProjectRow:
+    """Поля ответа одного проекта без словаря атрибутов"""
+
+    __slots__ = RESPONSE_FIELDS
+
+    def __init__(self, project: Dict):
+        for name in RESPONSE_FIELDS:
+            value = project.get(name, _MISSING)
+            # После записи через API статус приходит перечислением, из базы — строкой
+            if isinstance(value, Enum):
+                value = value.value
+            # MongoDB хранит даты с точностью до миллисекунд
+            elif isinstance(value, datetime):
+                value = value.replace(microsecond=value.microsecond // 1000 * 1000)
+            # Повторяющиеся значения фильтров хранятся в одном экземпляре
+            if name in BITMAP_FIELDS and isinstance(value, str):
+                value = sys.intern(value)
+            setattr(self, name, value)
+
+    def to_dict(self, object_id: ObjectId, fields: Optional[Dict] = None) -> Dict:
+        """Словарь ответа, как serializers.project_to_dict"""
+        names = RESPONSE_FIELDS if fields is None else [f for f in RESPONSE_FIELDS if f in fields]
+        result = {"id": str(object_id)}
+        for name in names:
+            value = getattr(self, name)
+            if value is not _MISSING:
+                result[name] = value
+            elif name in RESPONSE_DEFAULTS:
+                result[name] = RESPONSE_DEFAULTS[name]()
+        return result
+
+    def size(self) -> int:
+        return sys.getsizeof(self) + sum(
+            _deep_size(getattr(self, name)) for name in RESPONSE_FIELDS
+            if getattr(self, name) is not _MISSING
+        )
+
+class ColumnarCatalogue:
+    """Снимок каталога в памяти для get_projects без запросов к MongoDB
+
+    Проекты хранятся колонками в порядке (created_at, _id) по возрастанию: позиция
+    проекта — номер бита в битовых картах (значение поля -> int-битсет). Комбинация
+    фильтров — пересечение карт, страница — старшие установленные биты. Новые проекты
+    обычно самые поздние и дописываются в конец без сдвига остальных.
+    """
+
+    def __init__(self):
+        self._created = array("q")
+        self._ids: List[ObjectId] = []
+        self._rows: List[ProjectRow] = []
+        self._bitmaps: Dict[Tuple[str, object], int] = {}
+        self._positions: Dict[str, int] = {}
+        self._pending: Optional[List[Tuple[Optional[Dict], Optional[Dict]]]] = None
+        self._stale = False
+        self.built = False
+        # Версия каталога, прочитанная перед загрузкой снимка, и время загрузки
+        self.version = None
+        self.built_at = 0.0
+        self._reset_bitmaps()
+
+    def _reset_bitmaps(self) -> None:
+        self._bitmaps.clear()
+        for status in ProjectStatus:
+            self._bitmaps[("status", status.value)] = 0
+        for completed in (True, False):
+            self._bitmaps[("is_project_completed", completed)] = 0
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def begin_build(self) -> None:
+        """Начать загрузку снимка: изменения до его готовности копятся и применяются после"""
+        self._pending = []
+        self._stale = False
+
+    def abort_build(self) -> None:
+        self._pending = None
+
+    def build(self, projects: Iterable[Dict], version=None) -> None:
+        """Построить снимок заново (документы в любом порядке)"""
+        self.version = version
+        self.built_at = time.monotonic()
+        projects = sorted(projects, key=lambda project: (project["created_at"], project["_id"]))
+        self._ids = [project["_id"] for project in projects]
+        self._rows = [ProjectRow(project) for project in projects]
+        self._created = array("q", (_sort_value(row.created_at) for row in self._rows))
+        self._reset_bitmaps()
+        for position, row in enumerate(self._rows):
+            for field in BITMAP_FIELDS:
+                value = getattr(row, field)
+                if value is not _MISSING and value is not None:
+                    key = (field, value)
+                    self._bitmaps[key] = self._bitmaps.get(key, 0) | (1 << position)
+        self._reindex_positions()
+
+        pending, self._pending = self._pending or [], None
+        self.built = not self._stale
+        for before, after in pending:
+            self.update(before, after)
+
+    def age(self) -> float:
+        """Секунд с загрузки или последней сверки снимка с версией каталога"""
+        return time.monotonic() - self.built_at
+
+    def confirm(self) -> None:
+        """Версия каталога не менялась с загрузки: снимок актуален"""
+        self.built_at = time.monotonic()
+
+    def invalidate(self) -> None:
+        """Пересобрать снимок при следующем запросе (массовое изменение каталога)"""
+        self.built = False
+        if self._pending is not None:
+            self._stale = True
+
+    def _reindex_positions(self) -> None:
+        self._positions = {str(object_id): position for position, object_id in enumerate(self._ids)}
+
+    def _find_position(self, created_at: datetime, object_id: ObjectId) -> int:
+        """Позиция вставки для ключа (created_at, _id)"""
+        value = _sort_value(created_at)
+        position = bisect_left(self._created, value)
+        end = bisect_right(self._created, value, lo=position)
+        while position < end and self._ids[position] < object_id:
+            position += 1
+        return position
+
+    def _insert(self, object_id: ObjectId, row: ProjectRow) -> None:
+        position = self._find_position(row.created_at, object_id)
+        self._created.insert(position, _sort_value(row.created_at))
+        self._ids.insert(position, object_id)
+        self._rows.insert(position, row)
+
+        values = {(field, getattr(row, field)) for field in BITMAP_FIELDS}
+        for key in list(self._bitmaps):
+            self._bitmaps[key] = _insert_bit(self._bitmaps[key], position, int(key in values))
+        for key in values:
+            if key[1] is not _MISSING and key[1] is not None and key not in self._bitmaps:
+                self._bitmaps[key] = 1 << position
+
+        if position == len(self._ids) - 1:
+            self._positions[str(object_id)] = position
+        else:
+            self._reindex_positions()
+
+    def _remove(self, doc_id: str) -> None:
+        position = self._positions.get(doc_id)
+        if position is None:
+            return
+        del self._created[position]
+        del self._ids[position]
+        del self._rows[position]
+        for key in list(self._bitmaps):
+            bitmap = _remove_bit(self._bitmaps[key], position)
+            # Пустые карты категорий удаляются, статусы и флаг завершения остаются всегда
+            if bitmap or key[0] != "category":
+                self._bitmaps[key] = bitmap
+            else:
+                del self._bitmaps[key]
+        self._reindex_positions()
+
+    def _replace(self, position: int, row: ProjectRow) -> None:
+        """Обновление без смены created_at: позиция прежняя, меняются только биты"""
+        old = self._rows[position]
+        self._rows[position] = row
+        bit = 1 << position
+        for field in BITMAP_FIELDS:
+            old_value, new_value = getattr(old, field), getattr(row, field)
+            if old_value == new_value:
+                continue
+            old_key = (field, old_value)
+            if old_key in self._bitmaps:
+                self._bitmaps[old_key] &= ~bit
+                if not self._bitmaps[old_key] and field == "category":
+                    del self._bitmaps[old_key]
+            if new_value is not _MISSING and new_value is not None:
+                new_key = (field, new_value)
+                self._bitmaps[new_key] = self._bitmaps.get(new_key, 0) | bit
+
+    def upsert(self, project: Dict) -> None:
+        """Добавить или заменить проект (документ MongoDB или словарь ответа с id)"""
+        object_id = project["_id"] if "_id" in project else ObjectId(project["id"])
+        row = ProjectRow(project)
+        position = self._positions.get(str(object_id))
+        if position is not None and self._created[position] == _sort_value(row.created_at):
+            self._replace(position, row)
+            return
+        self._remove(str(object_id))
+        self._insert(object_id, row)
+
+    def update(self, before: Optional[Dict], after: Optional[Dict]) -> None:
+        """Применить изменение документа (None — создание/удаление)"""
+        if self._pending is not None:
+            self._pending.append((before, after))
+            return
+        if not self.built:
+            return
+        if after is not None:
+            self.upsert(after)
+        elif before is not None:
+            self._remove(str(before["_id"]))
+
+    def apply_event(self, event_type: str, project_id: str, project: Optional[Dict]) -> None:
+        """Изменение, записанное другим процессом (событие change stream / опроса)"""
+        if event_type == "delete":
+            self.update({"_id": project_id}, None)
+        elif project is not None:
+            self.update(None, project)
+        else:
+            self.invalidate()
+
+    def page(
+        self,
+        filter_query: Dict,
+        before: Optional[Tuple[datetime, ObjectId]],
+        limit: int,
+        fields: Optional[Dict] = None
+    ) -> Tuple[List[Dict], bool]:
+        """Страница в порядке PROJECTS_SORT: (элементы, есть ли продолжение)"""
+        mask = (1 << len(self._ids)) - 1
+        for field, value in filter_query.items():
+            mask &= self._bitmaps.get((field, value), 0)
+            if not mask:
+                return [], False
+        if before is not None:
+            mask &= (1 << self._find_position(*before)) - 1
+
+        items = []
+        while mask and len(items) < limit:
+            position = mask.bit_length() - 1
+            items.append(self._rows[position].to_dict(self._ids[position], fields))
+            mask ^= 1 << position
+        return items, bool(mask)
+
+    def stats(self) -> Dict:
+        """Размер снимка; память оценивается через sys.getsizeof (строки значений учитываются у каждого проекта)"""
+        count = len(self._ids)
+        memory = (
+            sys.getsizeof(self._created)
+            + _deep_size(self._ids)
+            + sum(row.size() for row in self._rows)
+            + sum(sys.getsizeof(key) + sys.getsizeof(bitmap) for key, bitmap in self._bitmaps.items())
+            + _deep_size(self._positions)
+        )
+        return {
+            "built": self.built,
+            "age_seconds": round(self.age(), 1) if self.built else None,
+            "projects": count,
+            "bitmaps": len(self._bitmaps),
+            "memory_bytes": memory,
+            "bytes_per_project": round(memory / count) if count else 0
+        }
+
+columnar_catalogue = ColumnarCatalogue()
@@ -1,6 +1,8 @@
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReadPreference, monitoring
 from pymongo.errors import ConnectionFailure
 import os
+import threading
 from datetime import datetime
 from dotenv import load_dotenv
 import logging
@@ -9,12 +11,110 @@ import logging
 load_dotenv()
 
 # Настройка логирования
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Настройки подключения к MongoDB
 MONGODB_URL = os.getenv("MONGODB_URL")
 DATABASE_NAME = os.getenv("DATABASE_NAME")
+COLLECTION_NAME = "ai_assistants"
+
+def _env_int(name: str, default=None):
+    value = os.getenv(name)
+    return int(value) if value else default
+
+# Пул соединений и таймауты (пул создается в каждом воркере:
+# всего соединений до WORKERS * MONGO_MAX_POOL_SIZE на кластер)
+MONGO_MAX_POOL_SIZE = _env_int("MONGO_MAX_POOL_SIZE", 100)
+MONGO_MIN_POOL_SIZE = _env_int("MONGO_MIN_POOL_SIZE", 0)
+MONGO_MAX_IDLE_TIME_MS = _env_int("MONGO_MAX_IDLE_TIME_MS")
+MONGO_WAIT_QUEUE_TIMEOUT_MS = _env_int("MONGO_WAIT_QUEUE_TIMEOUT_MS")
+MONGO_SERVER_SELECTION_TIMEOUT_MS = _env_int("MONGO_SERVER_SELECTION_TIMEOUT_MS", 5000)
+MONGO_CONNECT_TIMEOUT_MS = _env_int("MONGO_CONNECT_TIMEOUT_MS", 5000)
+MONGO_SOCKET_TIMEOUT_MS = _env_int("MONGO_SOCKET_TIMEOUT_MS")
+
+# Сжатие трафика (недоступные компрессоры драйвер пропускает с предупреждением)
+MONGO_COMPRESSORS = os.getenv("MONGO_COMPRESSORS", "zstd,zlib")
+
+# Read preference для публичных эндпоинтов чтения. По умолчанию primary:
+# чтение с отстающей реплики сразу после записи закэширует старые данные
+# под новой версией каталога до истечения TTL кэша
+MONGO_PUBLIC_READ_PREFERENCE = os.getenv("MONGO_PUBLIC_READ_PREFERENCE", "primary")
+
+_READ_PREFERENCES = {
+    "primary": ReadPreference.PRIMARY,
+    "primaryPreferred": ReadPreference.PRIMARY_PREFERRED,
+    "secondary": ReadPreference.SECONDARY,
+    "secondaryPreferred": ReadPreference.SECONDARY_PREFERRED,
+    "nearest": ReadPreference.NEAREST
+}
+
+class PoolMonitor(monitoring.ConnectionPoolListener):
+    """Счетчики пулов соединений по адресам серверов"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pools = {}
+        # Наблюдатель изменений (метрики Prometheus): observer(адрес, {счетчик: приращение})
+        self.observer = None
+    
+    def _update(self, address, **deltas):
+        key = "%s:%s" % address
+        if self.observer is not None and deltas:
+            self.observer(key, deltas)
+        with self._lock:
+            pool = self._pools.setdefault(key, {
+                "open": 0,
+                "in_use": 0,
+                "created": 0,
+                "closed": 0,
+                "checkout_failures": 0,
+                "cleared": 0
+            })
+            for name, delta in deltas.items():
+                pool[name] += delta
+    
+    def pool_created(self, event):
+        self._update(event.address)
+    
+    def pool_ready(self, event):
+        pass
+    
+    def pool_cleared(self, event):
+        self._update(event.address, cleared=1)
+    
+    def pool_closed(self, event):
+        pass
+    
+    def connection_created(self, event):
+        self._update(event.address, open=1, created=1)
+    
+    def connection_ready(self, event):
+        pass
+    
+    def connection_closed(self, event):
+        self._update(event.address, open=-1, closed=1)
+    
+    def connection_check_out_started(self, event):
+        pass
+    
+    def connection_check_out_failed(self, event):
+        self._update(event.address, checkout_failures=1)
+    
+    def connection_checked_out(self, event):
+        self._update(event.address, in_use=1)
+    
+    def connection_checked_in(self, event):
+        self._update(event.address, in_use=-1)
+    
+    def stats(self) -> dict:
+        """Снимок счетчиков с долей занятых соединений"""
+        with self._lock:
+            pools = {address: dict(pool) for address, pool in self._pools.items()}
+        for pool in pools.values():
+            pool["utilization"] = round(pool["in_use"] / MONGO_MAX_POOL_SIZE, 4)
+        return pools
+
+pool_monitor = PoolMonitor()
 
 class Database:
     client: AsyncIOMotorClient = None
@@ -22,22 +122,63 @@ class Database:
 
 db = Database()
 
-async def connect_to_mongo():
-    """Подключение к MongoDB"""
+def client_options(extra_listeners=None) -> dict:
+    """Параметры AsyncIOMotorClient из переменных окружения"""
+    options = {
+        "maxPoolSize": MONGO_MAX_POOL_SIZE,
+        "minPoolSize": MONGO_MIN_POOL_SIZE,
+        "maxIdleTimeMS": MONGO_MAX_IDLE_TIME_MS,
+        "waitQueueTimeoutMS": MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        "serverSelectionTimeoutMS": MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "connectTimeoutMS": MONGO_CONNECT_TIMEOUT_MS,
+        "socketTimeoutMS": MONGO_SOCKET_TIMEOUT_MS,
+        "compressors": MONGO_COMPRESSORS or None
+    }
+    options = {name: value for name, value in options.items() if value is not None}
+    options["event_listeners"] = [pool_monitor, *(extra_listeners or [])]
+    return options
+
+def public_read_preference():
+    """Read preference для публичных эндпоинтов"""
+    try:
+        return _READ_PREFERENCES[MONGO_PUBLIC_READ_PREFERENCE]
+    except KeyError:
+        raise ValueError(f"Unknown read preference: {MONGO_PUBLIC_READ_PREFERENCE}")
+
+def get_collection(public: bool = False):
+    """Коллекция проектов; public=True — с read preference публичного чтения"""
+    if db.database is None:
+        raise ConnectionError("Database connection not established")
+    if public:
+        return db.database.get_collection(COLLECTION_NAME, read_preference=public_read_preference())
+    return db.database[COLLECTION_NAME]
+
+def pool_stats() -> dict:
+    """Конфигурация и счетчики пула соединений"""
+    return {
+        "max_pool_size": MONGO_MAX_POOL_SIZE,
+        "min_pool_size": MONGO_MIN_POOL_SIZE,
+        "public_read_preference": MONGO_PUBLIC_READ_PREFERENCE,
+        "pools": pool_monitor.stats()
+    }
+
+async def connect_to_mongo(extra_listeners=None, ping: bool = True):
+    """Подключение к MongoDB (extra_listeners — дополнительные слушатели событий драйвера)
+
+    При ping=False клиент создается без ожидания сервера: драйвер подключается
+    при первом запросе, а доступность базы показывает /health/ready.
+    """
     try:
-        db.client = AsyncIOMotorClient(MONGODB_URL)
+        db.client = AsyncIOMotorClient(MONGODB_URL, **client_options(extra_listeners))
         db.database = db.client[DATABASE_NAME]
         
+        if not ping:
+            return
+        
         # Проверка подключения
         await db.client.admin.command('ping')
         logger.info(f"Successfully connected to MongoDB")
         
-        # Создание индексов
-        await create_indexes()
-        
-        # Инициализация тестовых данных
-        await init_sample_data()
-        
     except ConnectionFailure as e:
         logger.error(f"Failed to connect to MongoDB: {e}")
         raise e
@@ -49,6 +190,8 @@ async def close_mongo_connection():
     """Закрытие подключения к MongoDB"""
     if db.client:
         db.client.close()
+        db.client = None
+        db.database = None
         logger.info("Disconnected from MongoDB")
 
 async def get_database():
@@ -58,43 +201,22 @@ async def get_database():
     return db.database
 
 async def create_indexes():
-    """Создание индексов для коллекций"""
+    """Создание недостающих индексов по единому описанию (indexes.INDEX_SPECS)"""
     if db.database is None:
         return
     
+    # Импорт здесь: indexes.py сам импортирует COLLECTION_NAME из этого модуля
+    from indexes import reconcile_indexes
+    
     try:
-        projects_collection = db.database.projects
-        
-        # Создаем индексы для быстрого поиска
-        await projects_collection.create_index("name")
-        await projects_collection.create_index("category")
-        await projects_collection.create_index("status")
-        await projects_collection.create_index("is_project_completed")
-        await projects_collection.create_index("created_at")
-        await projects_collection.create_index("rating")
-        
-        # Составной индекс для сортировки
-        await projects_collection.create_index([("status", 1), ("created_at", -1)])
-        
-        logger.info("Database indexes created successfully")
+        await reconcile_indexes(db.database)
+        logger.info("Database indexes are up to date")
     except Exception as e:
         logger.error(f"Error creating indexes: {e}")
 
-async def init_sample_data():
-    """Инициализация тестовых данных"""
-    if db.database is None:
-        return
-    
-    projects_collection = db.database.projects
-    
-    # Проверяем, есть ли уже данные
-    count = await projects_collection.count_documents({})
-    if count > 0:
-        logger.info(f"Database already contains {count} projects")
-        return
-    
-    # Создаем тестовые данные
-    sample_projects = [
+def build_sample_projects():
+    """Тестовые проекты (также используются бенчмарками для генерации данных)"""
+    return [
         {
             "name": "Megastandart AI Assistant",
             "admin_panel_name": "megastandart",
@@ -261,6 +383,22 @@ async def init_sample_data():
             "updated_at": datetime.utcnow()
         }
     ]
+
+async def init_sample_data():
+    """Инициализация тестовых данных"""
+    if db.database is None:
+        return
+    
+    projects_collection = db.database[COLLECTION_NAME]
+    
+    # Проверяем, есть ли уже данные
+    count = await projects_collection.count_documents({})
+    if count > 0:
+        logger.info(f"Database already contains {count} projects")
+        return
+    
+    # Создаем тестовые данные
+    sample_projects = build_sample_projects()
     
     result = await projects_collection.insert_many(sample_projects)
     logger.info(f"Inserted {len(result.inserted_ids)} sample projects")
@@ -269,6 +407,12 @@ async def init_sample_data():
 async def startup_db_client():
     """Запуск подключения к базе данных"""
     await connect_to_mongo()
+    
+    # Создание индексов
+    await create_indexes()
+    
+    # Инициализация тестовых данных
+    await init_sample_data()
 
 async def shutdown_db_client():
     """Остановка подключения к базе данных"""
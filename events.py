@@ -0,0 +1,332 @@
+import asyncio
+import logging
+import os
+import uuid
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, Optional
+
+import orjson
+from pymongo.errors import OperationFailure
+from dotenv import load_dotenv
+
+from serializers import RESPONSE_PROJECTION, project_to_dict
+from sync import SYNC_SAFETY_SECONDS
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Настройки живых обновлений
+EVENTS_QUEUE_SIZE = int(os.getenv("EVENTS_QUEUE_SIZE", "100"))
+EVENTS_REPLAY_SIZE = int(os.getenv("EVENTS_REPLAY_SIZE", "500"))
+EVENTS_HEARTBEAT_SECONDS = float(os.getenv("EVENTS_HEARTBEAT_SECONDS", "15"))
+EVENTS_POLL_INTERVAL_SECONDS = float(os.getenv("EVENTS_POLL_INTERVAL_SECONDS", "2"))
+
+# Коды ошибок сервера без поддержки change streams (standalone)
+_CHANGE_STREAM_UNSUPPORTED = {40573, 40324}
+
+_CHANGE_TYPES = {
+    "insert": "create",
+    "update": "update",
+    "replace": "update",
+    "delete": "delete"
+}
+
+class EventBroker:
+    """Раздача событий каталога подключенным клиентам внутри процесса"""
+
+    def __init__(self, queue_size: int = EVENTS_QUEUE_SIZE, replay_size: int = EVENTS_REPLAY_SIZE):
+        self.queue_size = queue_size
+        self._subscribers = set()
+        self._history = deque(maxlen=replay_size)
+        self._sequence = 0
+        self._new_boot()
+        self._task: Optional[asyncio.Task] = None
+        self.mode: Optional[str] = None
+        self.published = 0
+        self.dropped = 0
+
+    def _new_boot(self) -> None:
+        # id событий — "<boot_id>-<номер>": номер из другого процесса (или до перезапуска) не сравнивается с нашим
+        self.boot_id = uuid.uuid4().hex[:12]
+
+    def _event_id(self, sequence: int) -> str:
+        return f"{self.boot_id}-{sequence}"
+
+    def _parse_event_id(self, last_event_id: str) -> Optional[int]:
+        """Номер события этого процесса из Last-Event-ID (None — чужой или некорректный id)"""
+        boot_id, _, sequence = last_event_id.rpartition("-")
+        if boot_id != self.boot_id or not sequence.isdigit():
+            return None
+        return int(sequence)
+
+    def publish(self, event_type: str, project_id: str, project: Optional[Dict] = None) -> None:
+        """Разослать событие всем подписчикам без ожидания"""
+        self._sequence += 1
+        event = {
+            "id": self._event_id(self._sequence),
+            "sequence": self._sequence,
+            "type": event_type,
+            "data": {"id": project_id, "project": project}
+        }
+        self._history.append(event)
+        self.published += 1
+
+        for queue in self._subscribers:
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Медленный клиент: вместо очереди событий — команда полной синхронизации
+                self.dropped += 1
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(self._resync_event())
+
+    def resync(self) -> None:
+        """Все подписчики перечитывают каталог целиком (массовое изменение)"""
+        # История больше не описывает каталог: переподключение тоже получит resync
+        self._history.clear()
+        for queue in self._subscribers:
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(self._resync_event())
+
+    def _resync_event(self) -> Dict:
+        return {"id": self._event_id(self._sequence), "sequence": self._sequence, "type": "resync", "data": {}}
+
+    def subscribe(self, last_event_id: Optional[str] = None) -> asyncio.Queue:
+        """Новая очередь подписчика; при переподключении досылаются пропущенные события"""
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        if last_event_id is not None:
+            last_seen = self._parse_event_id(last_event_id)
+            if last_seen is None:
+                # id другого процесса (или этого до перезапуска) — нужна полная синхронизация
+                queue.put_nowait(self._resync_event())
+            elif last_seen != self._sequence:
+                missed = [event for event in self._history if event["sequence"] > last_seen]
+                oldest = self._history[0]["sequence"] if self._history else self._sequence + 1
+                # История уже вытеснена — тоже полная синхронизация
+                if last_seen > self._sequence or oldest > last_seen + 1 or len(missed) > self.queue_size:
+                    queue.put_nowait(self._resync_event())
+                else:
+                    for event in missed:
+                        queue.put_nowait(event)
+
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._subscribers.discard(queue)
+
+    def close_subscribers(self) -> None:
+        """Завершить все потоки (остановка процесса); клиенты переподключатся к другому"""
+        for queue in self._subscribers:
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(None)
+
+    def start(self, feed: Callable[[], Awaitable[None]]) -> None:
+        """Запустить единственный источник событий для процесса"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(feed())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict:
+        return {
+            "mode": self.mode,
+            "subscribers": len(self._subscribers),
+            "published": self.published,
+            "dropped": self.dropped,
+            "sequence": self._sequence,
+            "boot_id": self.boot_id
+        }
+
+broker = EventBroker()
+# Воркеры gunicorn наследуют брокер мастера (preload_app): у каждого свой boot_id
+os.register_at_fork(after_in_child=broker._new_boot)
+
+def format_sse(event: Dict) -> bytes:
+    """Событие в формате Server-Sent Events"""
+    return (
+        f"id: {event['id']}\nevent: {event['type']}\ndata: ".encode("utf8")
+        + orjson.dumps(event["data"])
+        + b"\n\n"
+    )
+
+async def stream_events(queue: asyncio.Queue):
+    """Поток SSE для одного клиента с периодическим heartbeat"""
+    yield f"retry: {int(EVENTS_HEARTBEAT_SECONDS * 1000)}\n\n".encode("utf8")
+    try:
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=EVENTS_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield b": ping\n\n"
+                continue
+            if event is None:
+                break
+            yield format_sse(event)
+    finally:
+        broker.unsubscribe(queue)
+
+async def watch_change_stream(collection, on_change: Callable[[str, str, Optional[Dict]], None]) -> None:
+    """Источник событий: change stream MongoDB (только replica set / sharded)"""
+    pipeline = [{"$match": {"operationType": {"$in": list(_CHANGE_TYPES)}}}]
+    async with collection.watch(pipeline, full_document="updateLookup") as stream:
+        broker.mode = "change_stream"
+        logger.info("Live updates: using change stream")
+        async for change in stream:
+            event_type = _CHANGE_TYPES[change["operationType"]]
+            project_id = str(change["documentKey"]["_id"])
+            document = change.get("fullDocument")
+            on_change(event_type, project_id, project_to_dict(document) if document else None)
+
+def _poll_floor(last_seen: datetime) -> datetime:
+    """Нижняя граница повторного просмотра: записи внутри окна могли быть еще не видны"""
+    if last_seen - datetime.min <= timedelta(seconds=SYNC_SAFETY_SECONDS):
+        return datetime.min
+    return last_seen - timedelta(seconds=SYNC_SAFETY_SECONDS)
+
+async def _poll_start(collection, field: str):
+    """Начальная позиция опроса: последнее значение поля и уже существующие документы окна"""
+    latest = await collection.find({}, {field: 1}).sort(field, -1).limit(1).to_list(length=1)
+    # Пустая коллекция: любой следующий документ новый
+    last_seen = latest[0][field] if latest else datetime.min
+    seen = {
+        str(doc["_id"]): doc[field]
+        async for doc in collection.find({field: {"$gte": _poll_floor(last_seen)}}, {field: 1})
+    }
+    return last_seen, seen
+
+async def _poll_once(collection, field: str, projection: Dict, position):
+    """Документы после позиции в порядке поля и новая позиция
+
+    Значение поля проставляется до записи, поэтому запись с меньшим значением может
+    стать видна позже записи с большим. Каждый проход заново просматривает окно
+    SYNC_SAFETY_SECONDS до последнего значения; уже отправленные (id, значение)
+    пропускаются, а вышедшие из окна забываются.
+    """
+    last_seen, seen = position
+    docs = await (
+        collection.find({field: {"$gte": _poll_floor(last_seen)}}, projection)
+        .sort(field, 1)
+        .to_list(length=None)
+    )
+    fresh = []
+    for doc in docs:
+        project_id = str(doc["_id"])
+        if seen.get(project_id) == doc[field]:
+            continue
+        seen[project_id] = doc[field]
+        last_seen = max(last_seen, doc[field])
+        fresh.append(doc)
+
+    floor = _poll_floor(last_seen)
+    seen = {project_id: value for project_id, value in seen.items() if value >= floor}
+    return fresh, (last_seen, seen)
+
+async def poll_updates(
+    collection,
+    on_change: Callable[[str, str, Optional[Dict]], None],
+    tombstones=None
+) -> None:
+    """Запасной источник событий: опрос проектов по updated_at и отметок удаления по deleted_at
+
+    Отметки удаления (sync.record_tombstones) пишет любой процесс, поэтому удаления
+    доходят до всех воркеров. Сбой запроса не завершает опрос: позиции сохраняются,
+    проход повторяется через интервал.
+    """
+    broker.mode = "polling"
+    logger.info("Live updates: change streams unavailable, polling updated_at")
+
+    projects_position = tombstones_position = None
+    while True:
+        try:
+            if projects_position is None:
+                projects_position = await _poll_start(collection, "updated_at")
+            else:
+                docs, projects_position = await _poll_once(
+                    collection, "updated_at", RESPONSE_PROJECTION, projects_position
+                )
+                for doc in docs:
+                    event_type = "create" if doc.get("created_at") == doc["updated_at"] else "update"
+                    on_change(event_type, str(doc["_id"]), project_to_dict(doc))
+
+            if tombstones is not None:
+                if tombstones_position is None:
+                    tombstones_position = await _poll_start(tombstones, "deleted_at")
+                else:
+                    docs, tombstones_position = await _poll_once(
+                        tombstones, "deleted_at", {"deleted_at": 1}, tombstones_position
+                    )
+                    for doc in docs:
+                        on_change("delete", str(doc["_id"]), None)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Polling for changes failed, retrying: {e}")
+        await asyncio.sleep(EVENTS_POLL_INTERVAL_SECONDS)
+
+async def watch_resets(read_epoch: Callable[[], Awaitable], on_reset: Callable[[], None]) -> None:
+    """Массовые изменения каталога (импорт) в любом процессе: опрос эпохи синхронизации
+
+    Импортированные документы сохраняют updated_at из выгрузки, и опрос изменений
+    их не видит, поэтому при смене эпохи процесс сбрасывает все производные данные.
+    """
+    epoch = _UNKNOWN = object()
+    while True:
+        try:
+            current = await read_epoch()
+            if epoch is not _UNKNOWN and current != epoch:
+                logger.info("Catalogue was reset by a bulk change, dropping local state")
+                on_reset()
+            epoch = current
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Reading the catalogue epoch failed, retrying: {e}")
+        await asyncio.sleep(EVENTS_POLL_INTERVAL_SECONDS)
+
+async def _follow_changes(collection, on_change: Callable[[str, str, Optional[Dict]], None], tombstones) -> None:
+    """Change stream, а при его недоступности — опрос"""
+    while True:
+        try:
+            await watch_change_stream(collection, on_change)
+            continue
+        except asyncio.CancelledError:
+            raise
+        except (OperationFailure, NotImplementedError, AttributeError, TypeError) as e:
+            # TypeError/NotImplementedError — локальные заглушки без watch()
+            if not isinstance(e, OperationFailure) or e.code in _CHANGE_STREAM_UNSUPPORTED:
+                break
+            logger.error(f"Change stream failed, reconnecting: {e}")
+        except Exception as e:
+            logger.error(f"Change stream failed, reconnecting: {e}")
+        await asyncio.sleep(EVENTS_POLL_INTERVAL_SECONDS)
+    # Опрос вне обработчика исключений: его сбои повторяются внутри poll_updates
+    await poll_updates(collection, on_change, tombstones)
+
+async def run_feed(
+    collection,
+    on_change: Callable[[str, str, Optional[Dict]], None],
+    tombstones=None,
+    read_epoch: Optional[Callable[[], Awaitable]] = None,
+    on_reset: Optional[Callable[[], None]] = None
+) -> None:
+    """Изменения документов (tombstones — коллекция отметок удаления) и, если задан read_epoch, сбросы каталога"""
+    if read_epoch is None:
+        await _follow_changes(collection, on_change, tombstones)
+        return
+    await asyncio.gather(
+        _follow_changes(collection, on_change, tombstones),
+        watch_resets(read_epoch, on_reset)
+    )
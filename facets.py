@@ -0,0 +1,107 @@
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from pymongo import ReplaceOne, UpdateOne
+from pymongo.errors import BulkWriteError
+
+from versioning import META_COLLECTION
+
+# Счетчики значений фильтров: {_id: {"field": ..., "value": ...}, "count": N}
+FACETS_COLLECTION = "catalogue_facets"
+FACET_FIELDS = ("status", "category")
+
+_DUPLICATE_KEY = 11000
+
+# Процесс уже убедился, что счетчики посчитаны (флаг в catalogue_meta)
+_seeded = set()
+
+def _meta_id(collection_name: str) -> str:
+    return f"facets:{collection_name}"
+
+def facet_deltas(changes: List[Tuple[Optional[Dict], Optional[Dict]]]) -> Counter:
+    """Изменения счетчиков по парам (документ до, документ после)"""
+    deltas = Counter()
+    for before, after in changes:
+        for field in FACET_FIELDS:
+            old = before.get(field) if before is not None else None
+            new = after.get(field) if after is not None else None
+            if old == new:
+                continue
+            if old:
+                deltas[(field, old)] -= 1
+            if new:
+                deltas[(field, new)] += 1
+    return deltas
+
+async def _replace_counts(facets, rows: List[Dict]) -> None:
+    operations = [ReplaceOne({"_id": row["_id"]}, {"count": row["count"]}, upsert=True) for row in rows]
+    try:
+        await facets.bulk_write(operations, ordered=False)
+    except BulkWriteError as e:
+        # Другой процесс вставил ту же строку одновременно: теперь она есть, upsert заменит ее
+        errors = e.details.get("writeErrors", [])
+        if any(error.get("code") != _DUPLICATE_KEY for error in errors):
+            raise
+        await facets.bulk_write([operations[error["index"]] for error in errors], ordered=False)
+
+async def rebuild_facets(db, collection_name: str) -> None:
+    """Пересчитать счетчики одной агрегацией $group (первый запуск, импорт)"""
+    pipeline = [{"$facet": {
+        field: [
+            {"$match": {field: {"$nin": [None, ""]}}},
+            {"$group": {"_id": f"${field}", "count": {"$sum": 1}}}
+        ]
+        for field in FACET_FIELDS
+    }}]
+    result = await db[collection_name].aggregate(pipeline).to_list(length=1)
+    groups = result[0] if result else {}
+    rows = [
+        {"_id": {"field": field, "value": row["_id"]}, "count": row["count"]}
+        for field in FACET_FIELDS
+        for row in groups.get(field, [])
+    ]
+
+    # Строки заменяются на месте, а не удаляются и вставляются заново: читатели
+    # не видят пустых счетчиков, одновременные пересчеты не конфликтуют
+    facets = db[FACETS_COLLECTION]
+    if rows:
+        await _replace_counts(facets, rows)
+    await facets.delete_many({"_id": {"$nin": [row["_id"] for row in rows]}})
+    await db[META_COLLECTION].update_one(
+        {"_id": _meta_id(collection_name)}, {"$set": {"seeded": True}}, upsert=True
+    )
+    _seeded.add(collection_name)
+
+async def ensure_facets(db, collection_name: str) -> bool:
+    """Посчитать счетчики, если этого еще не делали; True — если пересчет выполнен сейчас"""
+    if collection_name in _seeded:
+        return False
+    meta = await db[META_COLLECTION].find_one({"_id": _meta_id(collection_name)})
+    if meta is not None and meta.get("seeded"):
+        _seeded.add(collection_name)
+        return False
+    await rebuild_facets(db, collection_name)
+    return True
+
+async def apply_facet_changes(db, collection_name: str, changes: List[Tuple[Optional[Dict], Optional[Dict]]]) -> None:
+    """Атомарные $inc счетчиков после записи (одна пакетная операция на все изменения)"""
+    # Пересчет уже учитывает только что выполненную запись
+    if await ensure_facets(db, collection_name):
+        return
+    operations = [
+        UpdateOne({"_id": {"field": field, "value": value}}, {"$inc": {"count": delta}}, upsert=True)
+        for (field, value), delta in facet_deltas(changes).items()
+        if delta
+    ]
+    if operations:
+        await db[FACETS_COLLECTION].bulk_write(operations, ordered=False)
+
+async def load_facets(db, collection_name: str) -> Dict[str, Dict[str, int]]:
+    """Текущие счетчики: поле -> {значение: количество} (без нулевых)"""
+    await ensure_facets(db, collection_name)
+    counts = {field: {} for field in FACET_FIELDS}
+    async for row in db[FACETS_COLLECTION].find({"count": {"$gt": 0}}):
+        field = row["_id"]["field"]
+        if field in counts:
+            counts[field][row["_id"]["value"]] = row["count"]
+    return counts
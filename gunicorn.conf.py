@@ -0,0 +1,40 @@
+"""Продакшен-запуск: gunicorn main:app
+
+Мастер-процесс загружает приложение один раз (preload) и запускает WEB_CONCURRENCY
+воркеров uvicorn (по умолчанию — по числу CPU); индексы в фоне сверяет один из них.
+По SIGTERM воркеры снимают готовность, закрывают потоки событий и дорабатывают
+текущие запросы не дольше GRACEFUL_TIMEOUT секунд.
+"""
+import os
+import tempfile
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+bind = f"{os.getenv('HOST') or '0.0.0.0'}:{os.getenv('PORT', '6565')}"
+workers = int(os.getenv("WEB_CONCURRENCY") or os.cpu_count() or 1)
+worker_class = "server.CatalogueWorker"
+preload_app = True
+
+graceful_timeout = int(os.getenv("GRACEFUL_TIMEOUT", "30"))
+timeout = int(os.getenv("WORKER_TIMEOUT", "60"))
+keepalive = int(os.getenv("KEEPALIVE_SECONDS", "5"))
+forwarded_allow_ips = os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1")
+accesslog = "-"
+errorlog = "-"
+
+# Метрики Prometheus от всех воркеров; должно быть задано до импорта приложения
+if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="prometheus-")
+
+# Индексы сверяет один назначенный воркер (в фоне, с повторами до доступности базы)
+os.environ["CREATE_INDEXES_ON_STARTUP"] = "false"
+
+def pre_fork(server, worker):
+    from server import assign_index_worker
+    assign_index_worker(server, worker)
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,104 @@
+import asyncio
+import logging
+import os
+from datetime import datetime
+from typing import Dict, List
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from dotenv import load_dotenv
+
+from database import COLLECTION_NAME
+from search import TEXT_INDEX_KEYS, TEXT_INDEX_OPTIONS
+from sync import CHANGES_SORT, TOMBSTONE_INDEXES, TOMBSTONES_COLLECTION
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Удалять индексы, которых нет в описании (по умолчанию только сообщать о них)
+INDEX_DROP_UNKNOWN = os.getenv("INDEX_DROP_UNKNOWN", "false").lower() == "true"
+INDEX_RETRY_MAX_SECONDS = float(os.getenv("INDEX_RETRY_MAX_SECONDS", "60"))
+
+# Порядок выдачи каталога (pagination.PROJECTS_SORT) как суффикс составных индексов
+_PAGE_ORDER = [("created_at", DESCENDING), ("_id", DESCENDING)]
+
+# Единое описание индексов: коллекция -> индексы
+INDEX_SPECS: Dict[str, List[IndexModel]] = {
+    COLLECTION_NAME: [
+        # get_projects: равенство по фильтру + сортировка, без сортировки в памяти
+        IndexModel(_PAGE_ORDER, name="page_order"),
+        IndexModel([("status", ASCENDING)] + _PAGE_ORDER, name="status_page_order"),
+        IndexModel([("category", ASCENDING)] + _PAGE_ORDER, name="category_page_order"),
+        IndexModel([("is_project_completed", ASCENDING)] + _PAGE_ORDER, name="completed_page_order"),
+        # Версия каталога, опрос изменений и /api/projects/changes (_id разрешает равенство дат)
+        IndexModel(CHANGES_SORT, name="updated_at_order"),
+        IndexModel(TEXT_INDEX_KEYS, **TEXT_INDEX_OPTIONS)
+    ],
+    TOMBSTONES_COLLECTION: TOMBSTONE_INDEXES
+}
+
+# Результат последней сверки
+index_status = {"state": "pending", "checked_at": None, "collections": {}, "error": None}
+
+def _key_pattern(key) -> tuple:
+    return tuple((field, int(value) if isinstance(value, (int, float)) else value) for field, value in key.items())
+
+async def _reconcile_collection(collection, specs: List[IndexModel]) -> Dict:
+    existing = {index["name"]: index async for index in collection.list_indexes()}
+    existing_keys = {_key_pattern(index["key"]) for index in existing.values()}
+
+    # Индекс считается созданным, если совпадает имя или набор ключей
+    missing = [
+        spec for spec in specs
+        if spec.document["name"] not in existing
+        and _key_pattern(spec.document["key"]) not in existing_keys
+    ]
+    if missing:
+        await collection.create_indexes(missing)
+
+    known_names = {spec.document["name"] for spec in specs}
+    known_keys = {_key_pattern(spec.document["key"]) for spec in specs}
+    unknown = [
+        name for name, index in existing.items()
+        if name != "_id_" and name not in known_names and _key_pattern(index["key"]) not in known_keys
+    ]
+    dropped = []
+    if unknown and INDEX_DROP_UNKNOWN:
+        for name in unknown:
+            await collection.drop_index(name)
+            dropped.append(name)
+    elif unknown:
+        logger.warning(f"Indexes not in spec on {collection.name}: {', '.join(unknown)}")
+
+    return {
+        "created": [spec.document["name"] for spec in missing],
+        "unknown": unknown,
+        "dropped": dropped
+    }
+
+async def reconcile_indexes(database) -> Dict:
+    """Создать недостающие индексы из INDEX_SPECS (повторный вызов ничего не меняет)"""
+    collections = {}
+    for collection_name, specs in INDEX_SPECS.items():
+        collections[collection_name] = await _reconcile_collection(database[collection_name], specs)
+        created = collections[collection_name]["created"]
+        if created:
+            logger.info(f"✅ Created indexes on {collection_name}: {', '.join(created)}")
+
+    index_status.update(state="ready", checked_at=datetime.utcnow(), collections=collections, error=None)
+    return collections
+
+async def reconcile_indexes_in_background(database) -> None:
+    """Сверка индексов без блокировки старта; при недоступной базе — повтор с паузой"""
+    delay = 1.0
+    while True:
+        try:
+            await reconcile_indexes(database)
+            return
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            index_status.update(state="failed", error=str(e))
+            logger.error(f"Index reconciliation failed, retrying in {delay:.0f}s: {e}")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, INDEX_RETRY_MAX_SECONDS)
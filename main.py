@@ -1,76 +1,210 @@
 import os
+import re
+import time
+import asyncio
 import logging
 from datetime import datetime
 from typing import List, Optional
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, HTTPException, Depends, status
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
-from fastapi.security import HTTPBasic, HTTPBasicCredentials
+from fastapi import FastAPI, HTTPException, Depends, Header, Query, Request, Response, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBasic, HTTPBasicCredentials, HTTPBearer
 from fastapi.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import InsertOne, ReplaceOne, ReturnDocument
+from pymongo.errors import BulkWriteError, OperationFailure
+from bson import ObjectId
+from bson.errors import InvalidId
+import database
+from database import (
+    COLLECTION_NAME,
+    close_mongo_connection,
+    connect_to_mongo,
+    get_collection,
+    pool_stats
+)
+from pydantic import ValidationError
 from dotenv import load_dotenv
-import secrets
 
 from models import (
     AIAssistantCreate, 
     AIAssistantUpdate, 
     AIAssistantResponse, 
+    ProjectPatch,
     ProjectStats,
     CategoriesResponse,
     StatusesResponse,
+    BootstrapResponse,
+    FacetCount,
+    FacetsResponse,
+    ProjectChangesResponse,
+    SearchResponse,
+    BulkOperationType,
+    BulkRequest,
+    BulkItemResult,
+    BulkResponse,
+    LoginRequest,
+    TokenResponse,
     ProjectStatus
 )
-
-# Настройка логирования
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+from pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    PROJECTS_SORT,
+    build_projection,
+    cursor_filter,
+    decode_cursor,
+    encode_cursor
+)
+from cache import (
+    FACETS_KEY,
+    STATS_KEY,
+    catalogue_cache,
+    catalogue_flights,
+    invalidate_project_write,
+    invalidate_external_write,
+    project_key,
+    projects_key,
+    search_key
+)
+from events import broker, run_feed, stream_events
+from search import memory_index
+from columnar import columnar_catalogue
+from facets import apply_facet_changes, load_facets, rebuild_facets
+from indexes import index_status, reconcile_indexes_in_background
+from sync import (
+    CHANGES_SORT,
+    SYNC_DEFAULT_LIMIT,
+    SYNC_MAX_LIMIT,
+    TOMBSTONES_COLLECTION,
+    TOMBSTONES_SORT,
+    after_position,
+    decode_sync_token,
+    encode_sync_token,
+    epoch_matches,
+    get_sync_epoch,
+    record_tombstones,
+    reset_sync_epoch,
+    safe_position,
+    tombstones_expired
+)
+from query_diagnostics import query_shape, slow_query_logger, summarize_explain
+from catalogue_io import (
+    EXPORT_BATCH_SIZE,
+    IMPORT_BATCH_SIZE,
+    export_csv,
+    export_ndjson,
+    iter_csv,
+    iter_ndjson,
+    parse_timestamps
 )
+from serializers import RESPONSE_PROJECTION, project_to_dict
+from auth import AdminAuthenticator, LoginAttemptLimiter
+from ratelimit import RateLimitMiddleware, rate_limiter
+from structured_logging import REQUEST_ID_HEADER, RequestIdMiddleware, setup_logging
+from profiling import (
+    ProfilingMiddleware,
+    ServerTimingMiddleware,
+    db_timing_listener,
+    note,
+    timed
+)
+from metrics import MetricsMiddleware, mongo_command_timer, render_metrics
+from static_assets import (
+    IMMUTABLE_CACHE_CONTROL,
+    REVALIDATE_CACHE_CONTROL,
+    ApiGZipMiddleware,
+    asset_store,
+    asset_response
+)
+from versioning import (
+    bump_catalogue_version,
+    get_catalogue_version,
+    http_date,
+    invalidate_cached_version,
+    is_not_modified,
+    make_etag
+)
+
+# Настройка логирования: запись в очередь, вывод в отдельном потоке
+setup_logging()
 logger = logging.getLogger(__name__)
 
 # Загрузка переменных окружения
 load_dotenv()
 
 # Глобальные переменные для MongoDB
-db_client: Optional[AsyncIOMotorClient] = None
+db_client = None
 db = None
 
 # Конфигурация
-MONGODB_URL = os.getenv("MONGODB_URL")
-DATABASE_NAME = os.getenv("DATABASE_NAME")
-COLLECTION_NAME = "ai_assistants"
 HOST = os.getenv("HOST")
 PORT = int(os.getenv("PORT"))
 
+# Сверка индексов в фоне при старте процесса; многопроцессный сервер выполняет ее один раз сам
+CREATE_INDEXES_ON_STARTUP = os.getenv("CREATE_INDEXES_ON_STARTUP", "true").lower() == "true"
+
+# Поиск: "mongo" ($text) или "memory" (инвертированный индекс в процессе)
+SEARCH_BACKEND = os.getenv("SEARCH_BACKEND", "mongo")
+# После сбоя $text поиск идет по памяти, а MongoDB проверяется снова через этот интервал
+SEARCH_MONGO_RETRY_SECONDS = float(os.getenv("SEARCH_MONGO_RETRY_SECONDS", "60"))
+# Страницы каталога: "mongo" (запрос на каждый промах кэша) или "columnar" (снимок в памяти процесса)
+CATALOGUE_BACKEND = os.getenv("CATALOGUE_BACKEND", "mongo")
+# Снимок сверяется с версией каталога не реже этого интервала и пересобирается, если пропустил запись
+COLUMNAR_REFRESH_SECONDS = float(os.getenv("COLUMNAR_REFRESH_SECONDS", "300"))
+
 # Аутентификация
 ADMIN_USERNAME = os.getenv("ADMIN_USERNAME")
 ADMIN_PASSWORD = os.getenv("ADMIN_PASSWORD")
 
-security = HTTPBasic()
+# Basic для скриптов, Bearer-токен для админ-панели
+security = HTTPBasic(auto_error=False)
+bearer_security = HTTPBearer(auto_error=False)
+
+# Дайджесты учетных данных вычисляются один раз при старте
+authenticator = AdminAuthenticator(ADMIN_USERNAME, ADMIN_PASSWORD)
+login_limiter = LoginAttemptLimiter()
+
+# Процесс получил SIGTERM и дорабатывает текущие запросы
+draining = False
+
+def begin_draining():
+    """Снять готовность и закрыть потоки событий, чтобы остановка не ждала их таймаута"""
+    global draining
+    draining = True
+    broker.close_subscribers()
+    logger.info("Draining: readiness withdrawn, event streams closed")
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Управление жизненным циклом приложения"""
     # Startup
     global db_client, db
+    # Статика готовится один раз: минификация, сжатие, отпечатки
+    asset_store.load()
+    logger.info(f"✅ Static assets prepared: {len(asset_store.stats())} files")
+    
+    index_task = None
     try:
-        logger.info(f"Connecting to MongoDB at {MONGODB_URL}")
-        db_client = AsyncIOMotorClient(MONGODB_URL)
-        db = db_client[DATABASE_NAME]
+        # Без ping: старт не ждет сервер, готовность показывает /health/ready
+        logger.info(f"Connecting to MongoDB at {database.MONGODB_URL}")
+        await connect_to_mongo(extra_listeners=[mongo_command_timer, slow_query_logger, db_timing_listener], ping=False)
+        db_client = database.db.client
+        db = database.db.database
+        slow_query_logger.attach(db_client, asyncio.get_running_loop())
+        logger.info("✅ MongoDB client created")
         
-        # Проверка подключения
-        await db_client.admin.command('ping')
-        logger.info("✅ Successfully connected to MongoDB")
+        if CREATE_INDEXES_ON_STARTUP:
+            index_task = asyncio.create_task(reconcile_indexes_in_background(db))
         
-        # Создание индексов
-        collection = db[COLLECTION_NAME]
-        await collection.create_index("name")
-        await collection.create_index("status")
-        await collection.create_index("category")
-        await collection.create_index("created_at")
-        logger.info("✅ Database indexes created")
+        # Единый источник событий каталога для процесса
+        broker.start(lambda: run_feed(
+            db[COLLECTION_NAME],
+            _on_catalogue_change,
+            db[TOMBSTONES_COLLECTION],
+            read_epoch=lambda: get_sync_epoch(db, COLLECTION_NAME),
+            on_reset=_on_catalogue_reset
+        ))
         
     except Exception as e:
         logger.error(f"❌ Failed to connect to MongoDB: {e}")
@@ -79,8 +213,13 @@ async def lifespan(app: FastAPI):
     yield
     
     # Shutdown
+    if index_task is not None and not index_task.done():
+        index_task.cancel()
+    await broker.stop()
     if db_client:
-        db_client.close()
+        await close_mongo_connection()
+        db_client = None
+        db = None
         logger.info("✅ MongoDB connection closed")
 
 # Создание приложения
@@ -91,6 +230,62 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Пути публичного каталога с поддержкой условных запросов
+CONDITIONAL_PATHS = (
+    "/api/projects",
+    "/api/categories",
+    "/api/statuses",
+    "/api/stats",
+    "/api/facets",
+    "/api/bootstrap"
+)
+# Отдельный проект: сильный ETag с версией проекта (для If-Match в PATCH) ставит сам обработчик
+PROJECT_RESOURCE_PATH = re.compile(r"^/api/projects/[0-9a-fA-F]{24}$")
+
+# Объявлен до CORS, чтобы CORS оставался внешним слоем и для ответов 304
+@app.middleware("http")
+async def conditional_get(request: Request, call_next):
+    """ETag / Last-Modified для каталога: 304 без чтения документов"""
+    if (
+        request.method not in ("GET", "HEAD")
+        or not request.url.path.startswith(CONDITIONAL_PATHS)
+        or PROJECT_RESOURCE_PATH.match(request.url.path)
+        or db is None
+    ):
+        return await call_next(request)
+    
+    try:
+        version, updated_at = await get_catalogue_version(db, COLLECTION_NAME)
+    except Exception as e:
+        logger.error(f"Error getting catalogue version: {e}")
+        return await call_next(request)
+    
+    etag = make_etag(version, updated_at, f"{request.url.path}?{request.url.query}")
+    headers = {
+        "ETag": etag,
+        "Last-Modified": http_date(updated_at),
+        "Cache-Control": "no-cache"
+    }
+    
+    if is_not_modified(
+        etag,
+        updated_at,
+        request.headers.get("if-none-match"),
+        request.headers.get("if-modified-since")
+    ):
+        return Response(status_code=304, headers=headers)
+    
+    response = await call_next(request)
+    if response.status_code == 200:
+        response.headers.update(headers)
+    return response
+
+# Профилирование одного запроса по флагу администратора (внутри CORS и ограничения частоты)
+app.add_middleware(ProfilingMiddleware, authenticate=lambda request: _authenticate_admin(request))
+
+# Ограничение частоты: внутри CORS, чтобы ответ 429 был виден браузеру
+app.add_middleware(RateLimitMiddleware)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -98,79 +293,757 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[
+        "X-Next-Cursor", "Link", "ETag", "Last-Modified", "Retry-After", REQUEST_ID_HEADER, "Server-Timing"
+    ],
 )
 
+# Сжатие JSON-ответов API (статика отдается уже сжатой)
+app.add_middleware(ApiGZipMiddleware)
+
+# Метрики Prometheus (внешний слой: учитывает и ответы 304)
+app.add_middleware(MetricsMiddleware, routes=app.routes)
+
+# Server-Timing: время MongoDB и фаз обработки (общее время включает все внутренние слои)
+app.add_middleware(ServerTimingMiddleware)
+
+# ID запроса для журнала (самый внешний слой: виден всем записям запроса)
+app.add_middleware(RequestIdMiddleware)
+
 # Функция проверки аутентификации
-def verify_credentials(credentials: HTTPBasicCredentials = Depends(security)):
-    """Проверка учетных данных администратора"""
-    is_correct_username = secrets.compare_digest(
-        credentials.username.encode("utf8"), 
-        ADMIN_USERNAME.encode("utf8")
-    )
-    is_correct_password = secrets.compare_digest(
-        credentials.password.encode("utf8"), 
-        ADMIN_PASSWORD.encode("utf8")
-    )
+def _client_ip(request: Request) -> str:
+    return request.client.host if request.client else "unknown"
+
+def _check_password(request: Request, username: str, password: str):
+    """Проверка пароля с ограничением неудачных попыток по IP"""
+    client = _client_ip(request)
+    retry_after = login_limiter.retry_after(client)
+    if retry_after:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many failed login attempts",
+            headers={"Retry-After": str(retry_after)},
+        )
     
-    if not (is_correct_username and is_correct_password):
+    if not authenticator.check_credentials(username, password):
+        login_limiter.record_failure(client)
+        logger.warning(f"Failed admin login from {client}")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Basic"},
         )
+    login_limiter.reset(client)
+
+# async: проверка дешевая и не должна занимать поток из пула
+async def verify_credentials(
+    request: Request,
+    token: Optional[HTTPAuthorizationCredentials] = Depends(bearer_security),
+    credentials: Optional[HTTPBasicCredentials] = Depends(security)
+):
+    """Проверка токена или учетных данных администратора"""
+    if token is not None:
+        username = authenticator.verify_token(token.credentials)
+        if username is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid or expired token",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        return username
     
+    if credentials is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Basic"},
+        )
+    _check_password(request, credentials.username, credentials.password)
     return credentials.username
 
+async def _authenticate_admin(request: Request) -> str:
+    """verify_credentials вне зависимостей FastAPI (для middleware)"""
+    return await verify_credentials(request, await bearer_security(request), await security(request))
+
+async def _after_project_writes(changes: List[tuple]):
+    """Общие действия после изменения проектов: кэш и версия каталога
+
+    changes — пары (документ до, документ после); None означает создание/удаление.
+    """
+    if not changes:
+        return
+    for before, after in changes:
+        invalidate_project_write(before, after)
+        memory_index.update(before, after)
+        columnar_catalogue.update(before, after)
+    # Отметки удаления для дельта-синхронизации клиентов и опроса изменений во всех процессах
+    await record_tombstones(db, [before["_id"] for before, after in changes if after is None])
+    await apply_facet_changes(db, COLLECTION_NAME, changes)
+    await bump_catalogue_version(db, COLLECTION_NAME)
+
+def _clear_catalogue_state():
+    """Сбросить производные данные процесса: кэш, индекс поиска и снимок каталога"""
+    catalogue_cache.clear()
+    catalogue_flights.forget()
+    memory_index.built = False
+    columnar_catalogue.invalidate()
+
+async def _reset_catalogue_state():
+    """Сбросить все производные данные после массового изменения каталога
+
+    Новая эпоха синхронизации — сигнал остальным процессам (watch_resets в потоке событий).
+    """
+    _clear_catalogue_state()
+    await rebuild_facets(db, COLLECTION_NAME)
+    await reset_sync_epoch(db, COLLECTION_NAME)
+    await bump_catalogue_version(db, COLLECTION_NAME)
+
+def _on_catalogue_reset():
+    """Смена эпохи синхронизации (импорт в любом процессе): сброс данных процесса и клиентов"""
+    _clear_catalogue_state()
+    broker.resync()
+
+def _on_catalogue_change(event_type: str, project_id: str, project: Optional[dict]):
+    """Событие из change stream / опроса: сброс локального кэша и рассылка клиентам"""
+    invalidate_external_write(project_id)
+    invalidate_cached_version()
+    memory_index.built = False
+    columnar_catalogue.apply_event(event_type, project_id, project)
+    broker.publish(event_type, project_id, project)
+
+async def _after_project_write(before: Optional[dict], after: Optional[dict]):
+    """Действия после изменения одного проекта"""
+    await _after_project_writes([(before, after)])
+
+def _prepare_create(project: AIAssistantCreate) -> dict:
+    """Документ для вставки нового проекта"""
+    project_data = project.model_dump()
+    project_data["created_at"] = datetime.utcnow()
+    project_data["updated_at"] = project_data["created_at"]
+    project_data["version"] = 1
+    
+    # Убираем рейтинг при создании
+    project_data.pop("rating", None)
+    return project_data
+
+def _format_validation_error(error: ValidationError) -> str:
+    """Краткое описание ошибок валидации в одну строку"""
+    return "; ".join(
+        f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in error.errors()
+    )
+
+def _prepare_update(project: AIAssistantUpdate) -> dict:
+    """Поля для $set при обновлении проекта"""
+    update_data = {k: v for k, v in project.model_dump().items() if v is not None}
+    update_data["updated_at"] = datetime.utcnow()
+    
+    # Убираем рейтинг при обновлении
+    update_data.pop("rating", None)
+    return update_data
+
+def _updated_document(existing: dict, update_data: dict) -> dict:
+    """Документ после $set и увеличения версии (без повторного чтения)"""
+    return {**existing, **update_data, "version": existing.get("version", 0) + 1}
+
+def _prepare_patch(patch: ProjectPatch) -> dict:
+    """Операторы MongoDB для PATCH: одна запись без предварительного чтения"""
+    set_fields = patch.set.model_dump(exclude_unset=True) if patch.set is not None else {}
+    set_fields["updated_at"] = datetime.utcnow()
+    update = {"$set": set_fields, "$inc": {"version": 1}}
+    
+    for operator, items in (("$push", patch.push), ("$addToSet", patch.add_to_set)):
+        # Ссылки в том же виде, что и при создании (с type: None), иначе $addToSet/$pull не совпадут с ними
+        values = items.model_dump() if items is not None else {}
+        values = {field: value for field, value in values.items() if value is not None}
+        if values:
+            update[operator] = {field: {"$each": value} for field, value in values.items()}
+    
+    if patch.pull is not None:
+        pull = {}
+        if patch.pull.links:
+            pull["links"] = {"url": {"$in": patch.pull.links}}
+        if patch.pull.features:
+            pull["features"] = {"$in": patch.pull.features}
+        update["$pull"] = pull
+    return update
+
+def _patched_document(existing: dict, patch: ProjectPatch, update: dict) -> dict:
+    """Документ после PATCH: те же операции, примененные к прежней версии"""
+    project = _updated_document(existing, update["$set"])
+    for field, spec in update.get("$push", {}).items():
+        project[field] = list(project.get(field) or []) + spec["$each"]
+    for field, spec in update.get("$addToSet", {}).items():
+        values = list(project.get(field) or [])
+        values.extend(item for item in spec["$each"] if item not in values)
+        project[field] = values
+    if patch.pull is not None and patch.pull.links:
+        project["links"] = [link for link in project.get("links") or [] if link.get("url") not in patch.pull.links]
+    if patch.pull is not None and patch.pull.features:
+        project["features"] = [f for f in project.get("features") or [] if f not in patch.pull.features]
+    return project
+
+def _project_etag(version: int) -> str:
+    """Сильный ETag проекта: его версия ("3")"""
+    return f'"{version}"'
+
+def _parse_if_match(value: Optional[str]) -> Optional[List[int]]:
+    """Версии из If-Match ("3", как ETag ответа GET); None — без проверки
+
+    Список через запятую сравнивается строго (RFC 9110): слабые (W/"...") и чужие
+    теги не совпадают ни с одной версией, и запись получит 412, а не 400.
+    """
+    if value is None:
+        return None
+    versions = []
+    for tag in value.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return None
+        if tag.startswith("W/"):
+            continue
+        tag = tag.strip('"')
+        if tag.isdigit():
+            versions.append(int(tag))
+    return versions
+
+def _build_filter_query(
+    status_filter: Optional[str],
+    category_filter: Optional[str],
+    completed: Optional[bool]
+) -> dict:
+    """Построение фильтра по параметрам запроса"""
+    filter_query = {}
+    if status_filter:
+        filter_query["status"] = status_filter
+    if category_filter:
+        filter_query["category"] = category_filter
+    if completed is not None:
+        filter_query["is_project_completed"] = completed
+    return filter_query
+
 # API Endpoints
+def _projects_page_query(
+    status_filter: Optional[str],
+    category_filter: Optional[str],
+    completed: Optional[bool],
+    cursor: Optional[str],
+    fields: Optional[str]
+):
+    """Фильтр и проекция страницы проектов (400 при некорректном курсоре или полях)"""
+    filter_query = _build_filter_query(status_filter, category_filter, completed)
+    
+    try:
+        if cursor:
+            filter_query.update(cursor_filter(cursor))
+        projection = build_projection(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return filter_query, projection
+
+def _projects_page_find(collection, filter_query: dict, projection: Optional[dict], limit: int):
+    """Запрос страницы (+1 документ, чтобы понять, есть ли продолжение)"""
+    return (
+        collection.find(filter_query, projection or RESPONSE_PROJECTION)
+        .sort(PROJECTS_SORT)
+        .limit(limit + 1)
+    )
+
+async def _load_projects_page(
+    status_filter: Optional[str],
+    category_filter: Optional[str],
+    completed: Optional[bool],
+    limit: int,
+    cursor: Optional[str],
+    fields: Optional[str]
+):
+    """Загрузить страницу проектов: (элементы, курсор следующей страницы)"""
+    if CATALOGUE_BACKEND == "columnar":
+        return await _columnar_projects_page(
+            status_filter, category_filter, completed, limit, cursor, fields
+        )
+    
+    cache_key = projects_key(
+        status_filter, category_filter, completed, limit, cursor, fields
+    )
+    hit, cached = catalogue_cache.get(cache_key)
+    note("cache", "hit" if hit else "miss")
+    if hit:
+        return cached
+    
+    filter_query, projection = _projects_page_query(
+        status_filter, category_filter, completed, cursor, fields
+    )
+    
+    # Одинаковые одновременные запросы ждут одно чтение из базы
+    return await catalogue_flights.run(
+        cache_key, lambda: _query_projects_page(cache_key, filter_query, projection, limit)
+    )
+
+async def _query_projects_page(cache_key: tuple, filter_query: dict, projection: Optional[dict], limit: int):
+    """Прочитать страницу проектов из базы и сохранить в кэш"""
+    generation = catalogue_cache.generation
+    collection = get_collection(public=True)
+    docs = await _projects_page_find(collection, filter_query, projection, limit).to_list(length=limit + 1)
+    
+    next_cursor = None
+    if len(docs) > limit:
+        docs = docs[:limit]
+        next_cursor = encode_cursor(docs[-1])
+    
+    # Быстрый путь: документы уже валидированы при записи
+    with timed("serialize"):
+        items = [project_to_dict(project, projection) for project in docs]
+    
+    logger.info(f"Retrieved {len(items)} projects", extra={"sample": "retrieved_projects"})
+    
+    catalogue_cache.set(cache_key, (items, next_cursor), generation)
+    return items, next_cursor
+
+_columnar_build_lock = asyncio.Lock()
+_columnar_refresh: Optional[asyncio.Task] = None
+
+async def _build_columnar_catalogue(version):
+    """Загрузить снимок каталога в память (записи во время загрузки не теряются)"""
+    columnar_catalogue.begin_build()
+    try:
+        docs = await get_collection(public=True).find({}, RESPONSE_PROJECTION).to_list(length=None)
+    except Exception:
+        columnar_catalogue.abort_build()
+        raise
+    columnar_catalogue.build(docs, version)
+    stats = columnar_catalogue.stats()
+    logger.info(
+        f"Columnar catalogue built: {stats['projects']} projects, "
+        f"{stats['bytes_per_project']} bytes per project"
+    )
+
+async def _refresh_columnar_catalogue():
+    """Сверить снимок с версией каталога и пересобрать, если запись другого процесса не дошла событием"""
+    try:
+        async with _columnar_build_lock:
+            # Версия из базы, а не из кэша процесса: пропущенная запись могла не сбросить кэш
+            invalidate_cached_version()
+            version = await get_catalogue_version(db, COLLECTION_NAME)
+            if version == columnar_catalogue.version:
+                columnar_catalogue.confirm()
+                return
+            logger.info("Columnar catalogue is behind the catalogue version, rebuilding")
+            await _build_columnar_catalogue(version)
+    except Exception as e:
+        logger.error(f"Error refreshing columnar catalogue: {e}")
+
+async def _ensure_columnar_catalogue():
+    """Снимок каталога в памяти: загрузка при первом запросе, фоновая сверка по таймеру"""
+    global _columnar_refresh
+    if columnar_catalogue.built:
+        # Пока идет сверка, отдается прежний снимок
+        if columnar_catalogue.age() >= COLUMNAR_REFRESH_SECONDS and (
+            _columnar_refresh is None or _columnar_refresh.done()
+        ):
+            _columnar_refresh = asyncio.create_task(_refresh_columnar_catalogue())
+        return
+    async with _columnar_build_lock:
+        if columnar_catalogue.built:
+            return
+        await _build_columnar_catalogue(await get_catalogue_version(db, COLLECTION_NAME))
+
+async def _columnar_projects_page(
+    status_filter: Optional[str],
+    category_filter: Optional[str],
+    completed: Optional[bool],
+    limit: int,
+    cursor: Optional[str],
+    fields: Optional[str]
+):
+    """Страница проектов из снимка в памяти: пересечение битовых карт без запроса к MongoDB"""
+    try:
+        before = decode_cursor(cursor) if cursor else None
+        projection = build_projection(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    await _ensure_columnar_catalogue()
+    with timed("columnar"):
+        items, has_more = columnar_catalogue.page(
+            _build_filter_query(status_filter, category_filter, completed), before, limit, projection
+        )
+    next_cursor = None
+    if has_more:
+        next_cursor = encode_cursor({"created_at": items[-1]["created_at"], "_id": items[-1]["id"]})
+    return items, next_cursor
+
+# Вход администратора
+@app.post("/api/auth/login", response_model=TokenResponse)
+async def login(body: LoginRequest, request: Request):
+    """Выдать короткоживущий токен администратора"""
+    _check_password(request, body.username, body.password)
+    token, expires_in = authenticator.issue_token(body.username)
+    return TokenResponse(access_token=token, expires_in=expires_in)
+
 @app.get("/api/projects", response_model=List[AIAssistantResponse])
 async def get_projects(
+    request: Request,
     status_filter: Optional[str] = None,
     category_filter: Optional[str] = None,
-    completed: Optional[bool] = None
+    completed: Optional[bool] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None
 ):
-    """Получить список всех проектов с опциональной фильтрацией"""
+    """Получить страницу проектов с опциональной фильтрацией и проекцией полей"""
     try:
-        collection = db[COLLECTION_NAME]
+        items, next_cursor = await _load_projects_page(
+            status_filter, category_filter, completed, limit, cursor, fields
+        )
         
-        # Построение фильтра
-        filter_query = {}
-        if status_filter:
-            filter_query["status"] = status_filter
-        if category_filter:
-            filter_query["category"] = category_filter
-        if completed is not None:
-            filter_query["is_project_completed"] = completed
+        headers = {}
+        if next_cursor:
+            next_url = request.url.include_query_params(cursor=next_cursor)
+            headers["X-Next-Cursor"] = next_cursor
+            headers["Link"] = f'<{next_url}>; rel="next"'
         
-        # Получение проектов
-        cursor = collection.find(filter_query).sort("created_at", -1)
-        projects = []
+        # Ответ возвращается напрямую, минуя повторную валидацию response_model
+        with timed("encode"):
+            return ORJSONResponse(content=items, headers=headers)
         
-        async for project in cursor:
-            project["id"] = str(project["_id"])
-            projects.append(AIAssistantResponse(**project))
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error retrieving projects: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+# Момент следующей попытки $text после его недоступности (time.monotonic)
+text_search_retry_at = 0.0
+
+async def _search_mongo(query: str, filter_query: dict, limit: int, offset: int) -> list:
+    """Поиск по текстовому индексу MongoDB"""
+    collection = get_collection(public=True)
+    projection = dict(RESPONSE_PROJECTION, score={"$meta": "textScore"})
+    docs = await (
+        collection.find({"$text": {"$search": query}, **filter_query}, projection)
+        .sort([("score", {"$meta": "textScore"}), ("created_at", -1)])
+        .skip(offset)
+        .limit(limit + 1)
+        .to_list(length=limit + 1)
+    )
+    return [(doc["score"], doc) for doc in docs]
+
+async def _search_memory(query: str, filter_query: dict, limit: int, offset: int) -> list:
+    """Поиск по индексу в памяти (строится при первом запросе)"""
+    if not memory_index.built:
+        collection = get_collection(public=True)
+        memory_index.build(await collection.find({}, RESPONSE_PROJECTION).to_list(length=None))
+        logger.info("In-memory search index built")
+    return memory_index.search(query, filter_query)[offset:offset + limit + 1]
+
+def _next_sync_position(items: list, field: str, truncated: bool, now: datetime):
+    """Позиция для следующего токена: последний выданный документ или окно безопасности"""
+    if truncated:
+        return items[-1][field], items[-1]["_id"]
+    return safe_position(now)
+
+@app.get("/api/projects/changes", response_model=ProjectChangesResponse)
+async def get_project_changes(
+    since: Optional[str] = None,
+    limit: int = Query(SYNC_DEFAULT_LIMIT, ge=1, le=SYNC_MAX_LIMIT)
+):
+    """Дельта-синхронизация: проекты, измененные после токена, и id удаленных проектов"""
+    now = datetime.utcnow()
+    try:
+        epoch = await get_sync_epoch(db, COLLECTION_NAME)
+        reset = True
+        if since:
+            try:
+                token_epoch, projects_position, tombstones_position = decode_sync_token(since)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            reset = not epoch_matches(token_epoch, epoch) or tombstones_expired(tombstones_position, now)
+        if reset:
+            # Полная синхронизация: все проекты, удаления до этого момента клиенту не нужны
+            projects_position, tombstones_position = None, safe_position(now)
+
+        # Чтение с основного узла: отставание реплики больше окна токена означало бы пропуск изменений
+        docs = await (
+            db[COLLECTION_NAME]
+            .find(after_position("updated_at", projects_position), RESPONSE_PROJECTION)
+            .sort(CHANGES_SORT)
+            .limit(limit + 1)
+            .to_list(length=limit + 1)
+        )
+        tombstones = await (
+            db[TOMBSTONES_COLLECTION]
+            .find(after_position("deleted_at", tombstones_position))
+            .sort(TOMBSTONES_SORT)
+            .limit(limit + 1)
+            .to_list(length=limit + 1)
+        )
+
+        projects_truncated = len(docs) > limit
+        tombstones_truncated = len(tombstones) > limit
+        docs, tombstones = docs[:limit], tombstones[:limit]
+
+        if not reset and not docs and not tombstones:
+            # Токен не меняется: следующий визит с тем же URL получит 304 по ETag
+            next_token = since
+        else:
+            next_token = encode_sync_token(
+                epoch,
+                _next_sync_position(docs, "updated_at", projects_truncated, now),
+                _next_sync_position(tombstones, "deleted_at", tombstones_truncated, now)
+            )
+
+        logger.info(
+            f"Sync: {len(docs)} changed, {len(tombstones)} deleted, reset={reset}",
+            extra={"sample": "sync"}
+        )
+        return ORJSONResponse(content={
+            "reset": reset,
+            "projects": [project_to_dict(project) for project in docs],
+            "deleted": [str(tombstone["_id"]) for tombstone in tombstones],
+            "next_token": next_token,
+            "has_more": projects_truncated or tombstones_truncated
+        })
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error retrieving project changes: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/projects/explain")
+async def explain_projects(
+    status_filter: Optional[str] = None,
+    category_filter: Optional[str] = None,
+    completed: Optional[bool] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    username: str = Depends(verify_credentials)
+):
+    """План запроса get_projects для данной комбинации фильтров (требует аутентификации)"""
+    filter_query, projection = _projects_page_query(
+        status_filter, category_filter, completed, cursor, fields
+    )
+    try:
+        explain = await _projects_page_find(
+            get_collection(public=True), filter_query, projection, limit
+        ).explain()
+    except Exception as e:
+        logger.error(f"Error explaining projects query: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    return {
+        "filter": query_shape(filter_query),
+        "sort": dict(PROJECTS_SORT),
+        "summary": summarize_explain(explain),
+        "winning_plan": explain.get("queryPlanner", {}).get("winningPlan")
+    }
+
+@app.get("/api/projects/search", response_model=SearchResponse)
+async def search_projects(
+    q: str = Query(..., min_length=1, max_length=200),
+    status_filter: Optional[str] = None,
+    category_filter: Optional[str] = None,
+    completed: Optional[bool] = None,
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0)
+):
+    """Полнотекстовый поиск проектов с сортировкой по релевантности"""
+    global text_search_retry_at
+    try:
+        cache_key = search_key(q, status_filter, category_filter, completed, limit, offset)
+        generation = catalogue_cache.generation
+        hit, cached = catalogue_cache.get(cache_key)
+        if hit:
+            return ORJSONResponse(content=cached)
+        
+        filter_query = _build_filter_query(status_filter, category_filter, completed)
+        
+        results = None
+        if SEARCH_BACKEND == "mongo" and time.monotonic() >= text_search_retry_at:
+            try:
+                results = await _search_mongo(q, filter_query, limit, offset)
+            except (NotImplementedError, OperationFailure) as e:
+                # Нет $text (заглушка) или текстового индекса (например, еще строится) —
+                # этот и ближайшие запросы идут в память, затем снова MongoDB
+                if isinstance(e, OperationFailure) and e.code != 27:
+                    raise
+                logger.warning(
+                    f"Text search unavailable, using in-memory index for {SEARCH_MONGO_RETRY_SECONDS:.0f}s: {e}"
+                )
+                text_search_retry_at = time.monotonic() + SEARCH_MONGO_RETRY_SECONDS
+        if results is None:
+            results = await _search_memory(q, filter_query, limit, offset)
         
-        logger.info(f"Retrieved {len(projects)} projects")
-        return projects
+        next_offset = None
+        if len(results) > limit:
+            results = results[:limit]
+            next_offset = offset + limit
+        
+        payload = {
+            "items": [
+                dict(project_to_dict(project), score=round(score, 4))
+                for score, project in results
+            ],
+            "next_offset": next_offset
+        }
+        catalogue_cache.set(cache_key, payload, generation)
         
+        logger.info(f"Search '{q}' returned {len(results)} projects", extra={"sample": "search"})
+        return ORJSONResponse(content=payload)
+        
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error retrieving projects: {e}")
+        logger.error(f"Error searching projects: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/api/projects/{project_id}", response_model=AIAssistantResponse)
-async def get_project(project_id: str):
-    """Получить конкретный проект по ID"""
+@app.get("/api/projects/export")
+async def export_projects(
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    username: str = Depends(verify_credentials)
+):
+    """Потоковая выгрузка всего каталога в NDJSON или CSV (требует аутентификации)"""
     try:
-        from bson import ObjectId
+        collection = get_collection(public=True)
+        cursor = (
+            collection.find({}, RESPONSE_PROJECTION)
+            .sort("_id", 1)
+            .batch_size(EXPORT_BATCH_SIZE)
+        )
         
+        if export_format == "csv":
+            body, media_type = export_csv(cursor), "text/csv; charset=utf-8"
+        else:
+            body, media_type = export_ndjson(cursor), "application/x-ndjson"
+        
+        filename = f"projects-{datetime.utcnow():%Y%m%d-%H%M%S}.{export_format}"
+        logger.info(f"Export started by {username}: {export_format}")
+        return StreamingResponse(
+            body,
+            media_type=media_type,
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+        )
+        
+    except Exception as e:
+        logger.error(f"Error exporting projects: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+# Сколько ошибок импорта возвращать в ответе
+MAX_IMPORT_ERRORS = 100
+
+def _prepare_import(record: dict):
+    """Операция записи для одной записи импорта (id, даты, рейтинг и версия из экспорта сохраняются)"""
+    fields = {k: v for k, v in record.items() if k not in ("id", "created_at", "updated_at", "version")}
+    project = AIAssistantCreate(**fields)
+    project_data = _prepare_create(project)
+    # Импорт обратен экспорту: рейтинг не сбрасывается, как при создании через API
+    project_data["rating"] = project.rating
+    project_data.update(parse_timestamps(record))
+    if record.get("version"):
+        project_data["version"] = int(record["version"])
+    
+    if record.get("id"):
+        object_id = ObjectId(record["id"])
+        project_data["_id"] = object_id
+        return ReplaceOne({"_id": object_id}, project_data, upsert=True)
+    return InsertOne(project_data)
+
+@app.post("/api/projects/import")
+async def import_projects(
+    request: Request,
+    import_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    username: str = Depends(verify_credentials)
+):
+    """Потоковая загрузка каталога из NDJSON или CSV (требует аутентификации)"""
+    try:
         collection = db[COLLECTION_NAME]
-        project = await collection.find_one({"_id": ObjectId(project_id)})
+        parse = iter_csv if import_format == "csv" else iter_ndjson
         
-        if not project:
-            raise HTTPException(status_code=404, detail="Project not found")
+        imported = 0
+        error_count = 0
+        errors = []
+        
+        def add_error(line_number: int, message: str):
+            nonlocal error_count
+            error_count += 1
+            if len(errors) < MAX_IMPORT_ERRORS:
+                errors.append({"line": line_number, "error": message})
+        
+        async def flush(batch: list) -> int:
+            try:
+                await collection.bulk_write([op for _, op in batch], ordered=False)
+                return len(batch)
+            except BulkWriteError as e:
+                write_errors = e.details.get("writeErrors", [])
+                for write_error in write_errors:
+                    add_error(batch[write_error["index"]][0], write_error.get("errmsg", "Write error"))
+                return len(batch) - len(write_errors)
         
-        project["id"] = str(project["_id"])
-        return AIAssistantResponse(**project)
+        # Разбор, валидация и запись пакетами без чтения всего тела в память
+        batch = []
+        async for line_number, record, error in parse(request.stream()):
+            if error is None:
+                try:
+                    batch.append((line_number, _prepare_import(record)))
+                except ValidationError as e:
+                    error = _format_validation_error(e)
+                except (InvalidId, TypeError, ValueError) as e:
+                    error = str(e)
+            if error is not None:
+                add_error(line_number, error)
+                continue
+            
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                imported += await flush(batch)
+                batch = []
+        
+        if batch:
+            imported += await flush(batch)
+        
+        if imported:
+            await _reset_catalogue_state()
+        
+        logger.info(f"Import by {username}: {imported} imported, {error_count} errors")
+        return {"imported": imported, "error_count": error_count, "errors": errors}
         
+    except Exception as e:
+        logger.error(f"Error importing projects: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/projects/{project_id}", response_model=AIAssistantResponse)
+async def get_project(
+    project_id: str,
+    response: Response,
+    if_none_match: Optional[str] = Header(None)
+):
+    """Получить конкретный проект по ID (ETag — версия проекта для If-Match в PATCH)"""
+    try:
+        generation = catalogue_cache.generation
+        hit, result = catalogue_cache.get(project_key(project_id))
+        if not hit:
+            collection = get_collection(public=True)
+            project = await collection.find_one({"_id": ObjectId(project_id)})
+            
+            if not project:
+                raise HTTPException(status_code=404, detail="Project not found")
+            
+            project["id"] = str(project["_id"])
+            result = AIAssistantResponse(**project)
+            catalogue_cache.set(project_key(project_id), result, generation)
+        
+        headers = {
+            "ETag": _project_etag(result.version),
+            "Last-Modified": http_date(result.updated_at),
+            "Cache-Control": "no-cache"
+        }
+        if if_none_match and headers["ETag"] in {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}:
+            return Response(status_code=304, headers=headers)
+        response.headers.update(headers)
+        return result
+        
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error retrieving project: {e}")
         if "ObjectId" in str(e):
@@ -186,20 +1059,11 @@ async def create_project(
     try:
         collection = db[COLLECTION_NAME]
         
-        # Подготовка данных
-        project_data = project.model_dump()
-        project_data["created_at"] = datetime.utcnow()
-        project_data["updated_at"] = datetime.utcnow()
-        
-        # Убираем рейтинг при создании
-        project_data.pop("rating", None)
-        
-        # Создание проекта
-        result = await collection.insert_one(project_data)
-        
-        # Получение созданного проекта
-        created_project = await collection.find_one({"_id": result.inserted_id})
+        # Создание проекта (insert_one дописывает _id в сам документ)
+        created_project = _prepare_create(project)
+        await collection.insert_one(created_project)
         created_project["id"] = str(created_project["_id"])
+        await _after_project_write(None, created_project)
         
         logger.info(f"Project created by {username}: {project.name}")
         return AIAssistantResponse(**created_project)
@@ -216,41 +1080,95 @@ async def update_project(
 ):
     """Обновить существующий проект (требует аутентификации)"""
     try:
-        from bson import ObjectId
-        
         collection = db[COLLECTION_NAME]
+        update_data = _prepare_update(project)
         
-        # Проверка существования проекта
-        existing = await collection.find_one({"_id": ObjectId(project_id)})
-        if not existing:
-            raise HTTPException(status_code=404, detail="Project not found")
-        
-        # Подготовка данных для обновления
-        update_data = {k: v for k, v in project.model_dump().items() if v is not None}
-        update_data["updated_at"] = datetime.utcnow()
-        
-        # Убираем рейтинг при обновлении
-        update_data.pop("rating", None)
-        
-        # Обновление проекта
-        await collection.update_one(
+        # Обновление за один запрос: прежняя версия нужна для инвалидации кэша,
+        # новая получается наложением $set без повторного чтения
+        existing = await collection.find_one_and_update(
             {"_id": ObjectId(project_id)},
-            {"$set": update_data}
+            {"$set": update_data, "$inc": {"version": 1}},
+            return_document=ReturnDocument.BEFORE
         )
+        if not existing:
+            raise HTTPException(status_code=404, detail="Project not found")
         
-        # Получение обновленного проекта
-        updated_project = await collection.find_one({"_id": ObjectId(project_id)})
+        updated_project = _updated_document(existing, update_data)
         updated_project["id"] = str(updated_project["_id"])
+        await _after_project_write(existing, updated_project)
         
         logger.info(f"Project updated by {username}: {project_id}")
         return AIAssistantResponse(**updated_project)
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error updating project: {e}")
         if "ObjectId" in str(e):
             raise HTTPException(status_code=400, detail="Invalid project ID format")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.patch("/api/projects/{project_id}", response_model=AIAssistantResponse)
+async def patch_project(
+    project_id: str,
+    patch: ProjectPatch,
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    username: str = Depends(verify_credentials)
+):
+    """Частично изменить проект одной атомарной записью (требует аутентификации)
+
+    Ссылки и возможности меняются операциями $push/$addToSet/$pull без перезаписи
+    массивов; с If-Match запись выполняется, только если версия проекта не изменилась.
+    """
+    try:
+        collection = db[COLLECTION_NAME]
+        object_id = ObjectId(project_id)
+        expected_versions = _parse_if_match(if_match)
+        update = _prepare_patch(patch)
+        
+        query = {"_id": object_id}
+        if expected_versions is not None:
+            # У проектов, созданных до появления версий, поля нет (версия 0)
+            query["version"] = {"$in": expected_versions + [None] if 0 in expected_versions else expected_versions}
+        if patch.pull is not None and patch.pull.links:
+            # После удаления должна остаться хотя бы одна ссылка
+            query["links"] = {"$elemMatch": {"url": {"$nin": patch.pull.links}}}
+        
+        existing = await collection.find_one_and_update(
+            query, update, return_document=ReturnDocument.BEFORE
+        )
+        if existing is None:
+            # Условие не выполнено: причина выясняется только в этом случае
+            current = await collection.find_one({"_id": object_id}, {"version": 1, "links": 1})
+            if current is None:
+                raise HTTPException(status_code=404, detail="Project not found")
+            if patch.pull is not None and patch.pull.links and not any(
+                link.get("url") not in patch.pull.links for link in current.get("links") or []
+            ):
+                raise HTTPException(status_code=422, detail="Project must keep at least one link")
+            raise HTTPException(
+                status_code=412,
+                detail=f"Project was modified, current version is {current.get('version', 0)}",
+                headers={"ETag": _project_etag(current.get("version", 0))}
+            )
+        
+        patched_project = _patched_document(existing, patch, update)
+        patched_project["id"] = str(patched_project["_id"])
+        await _after_project_write(existing, patched_project)
+        
+        logger.info(f"Project patched by {username}: {project_id}")
+        response.headers["ETag"] = _project_etag(patched_project["version"])
+        return AIAssistantResponse(**patched_project)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error patching project: {e}")
+        if "ObjectId" in str(e):
+            raise HTTPException(status_code=400, detail="Invalid project ID format")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.delete("/api/projects/{project_id}")
 async def delete_project(
     project_id: str,
@@ -258,67 +1176,274 @@ async def delete_project(
 ):
     """Удалить проект (требует аутентификации)"""
     try:
-        from bson import ObjectId
-        
         collection = db[COLLECTION_NAME]
         
         # Удаление проекта
-        result = await collection.delete_one({"_id": ObjectId(project_id)})
+        deleted = await collection.find_one_and_delete({"_id": ObjectId(project_id)})
         
-        if result.deleted_count == 0:
+        if deleted is None:
             raise HTTPException(status_code=404, detail="Project not found")
         
+        await _after_project_write(deleted, None)
+        
         logger.info(f"Project deleted by {username}: {project_id}")
         return {"message": "Project successfully deleted"}
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error deleting project: {e}")
         if "ObjectId" in str(e):
             raise HTTPException(status_code=400, detail="Invalid project ID format")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/api/stats", response_model=ProjectStats)
-async def get_stats():
-    """Получить статистику проектов"""
+def _prepare_bulk_operation(operation) -> tuple:
+    """Проверить операцию пакета: (ObjectId или None, документ/поля для записи)"""
+    object_id = None
+    if operation.op != BulkOperationType.CREATE:
+        if not operation.id:
+            raise ValueError("Field 'id' is required")
+        object_id = ObjectId(operation.id)
+    
+    if operation.op == BulkOperationType.CREATE:
+        return object_id, _prepare_create(AIAssistantCreate(**(operation.data or {})))
+    if operation.op == BulkOperationType.UPDATE:
+        return object_id, _prepare_update(AIAssistantUpdate(**(operation.data or {})))
+    return object_id, None
+
+@app.post("/api/projects/bulk", response_model=BulkResponse)
+async def bulk_projects(
+    bulk: BulkRequest,
+    username: str = Depends(verify_credentials)
+):
+    """Пакетное создание, обновление и удаление проектов (требует аутентификации)"""
     try:
         collection = db[COLLECTION_NAME]
+        operations = bulk.operations
+        results = [
+            BulkItemResult(index=i, op=operation.op, id=operation.id, status="skipped")
+            for i, operation in enumerate(operations)
+        ]
+        
+        # Валидация всех операций до обращения к базе
+        prepared = {}
+        for i, operation in enumerate(operations):
+            try:
+                prepared[i] = _prepare_bulk_operation(operation)
+            except ValidationError as e:
+                results[i].status = "error"
+                results[i].error = _format_validation_error(e)
+            except (InvalidId, TypeError, ValueError) as e:
+                results[i].status = "error"
+                results[i].error = str(e)
+        
+        # В упорядоченном режиме выполняется только префикс до первой ошибки
+        executable = sorted(prepared)
+        if bulk.ordered:
+            first_error = next((r.index for r in results if r.status == "error"), None)
+            if first_error is not None:
+                executable = [i for i in executable if i < first_error]
+                for result in results[first_error + 1:]:
+                    result.status, result.error = "skipped", None
+        
+        # Итог записи по индексу операции: (документ до, документ после) или текст ошибки
+        changes = {}
+        failed = {}
         
-        # Подсчет статистики
-        total_projects = await collection.count_documents({})
-        active_projects = await collection.count_documents({"status": "Активен"})
-        completed_projects = await collection.count_documents({"is_project_completed": True})
+        async def insert(indexes: list):
+            executed = len(indexes)
+            try:
+                await collection.insert_many([prepared[i][1] for i in indexes], ordered=bulk.ordered)
+            except BulkWriteError as e:
+                write_errors = e.details.get("writeErrors", [])
+                for write_error in write_errors:
+                    failed[indexes[write_error["index"]]] = write_error.get("errmsg", "Write error")
+                # Упорядоченная вставка останавливается на первой ошибке
+                if bulk.ordered and write_errors:
+                    executed = min(write_error["index"] for write_error in write_errors)
+            for i in indexes[:executed]:
+                if i not in failed:
+                    changes[i] = (None, prepared[i][1])
         
-        # Средний рейтинг (игнорируем, так как убрали рейтинги)
-        average_rating = None
+        async def modify(i: int):
+            # Прежний документ возвращает сама запись: учитывается то, что было изменено,
+            # даже если проект параллельно правили или удаляли
+            object_id, data = prepared[i]
+            try:
+                if operations[i].op == BulkOperationType.UPDATE:
+                    before = await collection.find_one_and_update(
+                        {"_id": object_id},
+                        {"$set": data, "$inc": {"version": 1}},
+                        return_document=ReturnDocument.BEFORE
+                    )
+                    after = _updated_document(before, data) if before else None
+                else:
+                    before, after = await collection.find_one_and_delete({"_id": object_id}), None
+            except OperationFailure as e:
+                failed[i] = str(e)
+                return
+            if before is None:
+                failed[i] = "Project not found"
+            else:
+                changes[i] = (before, after)
         
-        return ProjectStats(
-            total_projects=total_projects,
-            active_projects=active_projects,
-            completed_projects=completed_projects,
-            average_rating=average_rating
+        if bulk.ordered:
+            # Подряд идущие создания — одна вставка, обновления и удаления — по одному
+            position = 0
+            while position < len(executable) and not failed:
+                run = [executable[position]]
+                if operations[run[0]].op == BulkOperationType.CREATE:
+                    while (
+                        position + len(run) < len(executable)
+                        and operations[executable[position + len(run)]].op == BulkOperationType.CREATE
+                    ):
+                        run.append(executable[position + len(run)])
+                    await insert(run)
+                else:
+                    await modify(run[0])
+                position += len(run)
+        else:
+            creates = [i for i in executable if operations[i].op == BulkOperationType.CREATE]
+            await asyncio.gather(
+                *([insert(creates)] if creates else []),
+                *(modify(i) for i in executable if operations[i].op != BulkOperationType.CREATE)
+            )
+        
+        response = BulkResponse(ordered=bulk.ordered, results=results)
+        for i, error in failed.items():
+            results[i].status = "error"
+            results[i].error = error
+        for i, (before, after) in changes.items():
+            results[i].status = "ok"
+            if before is None:
+                results[i].id = str(after["_id"])
+                response.inserted += 1
+            elif after is not None:
+                response.updated += 1
+            else:
+                response.deleted += 1
+        
+        response.errors = sum(1 for r in results if r.status == "error")
+        await _after_project_writes([changes[i] for i in sorted(changes)])
+        
+        logger.info(
+            f"Bulk operation by {username}: {response.inserted} created, "
+            f"{response.updated} updated, {response.deleted} deleted, {response.errors} errors"
         )
+        return response
         
     except Exception as e:
-        logger.error(f"Error getting stats: {e}")
+        logger.error(f"Error in bulk operation: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/api/categories", response_model=CategoriesResponse)
-async def get_categories():
-    """Получить список всех уникальных категорий"""
+# Вся статистика за один проход по коллекции
+STATS_PIPELINE = [
+    {"$facet": {
+        "totals": [
+            {"$group": {
+                "_id": None,
+                "total_projects": {"$sum": 1},
+                "active_projects": {
+                    "$sum": {"$cond": [{"$eq": ["$status", ProjectStatus.ACTIVE.value]}, 1, 0]}
+                },
+                "completed_projects": {
+                    "$sum": {"$cond": [{"$eq": ["$is_project_completed", True]}, 1, 0]}
+                },
+                "average_rating": {"$avg": "$rating"}
+            }}
+        ],
+        "by_status": [
+            {"$group": {"_id": "$status", "count": {"$sum": 1}}}
+        ],
+        "by_category": [
+            {"$match": {"category": {"$nin": [None, ""]}}},
+            {"$group": {"_id": "$category", "count": {"$sum": 1}}}
+        ]
+    }}
+]
+
+async def _query_stats() -> ProjectStats:
+    """Подсчитать статистику одним запросом и сохранить в кэш"""
+    generation = catalogue_cache.generation
+    collection = get_collection(public=True)
+    
+    result = await collection.aggregate(STATS_PIPELINE).to_list(length=1)
+    facets = result[0] if result else {}
+    totals = facets.get("totals") or [{}]
+    totals = totals[0]
+    
+    average_rating = totals.get("average_rating")
+    if average_rating is not None:
+        average_rating = round(average_rating, 2)
+    
+    stats = ProjectStats(
+        total_projects=totals.get("total_projects", 0),
+        active_projects=totals.get("active_projects", 0),
+        completed_projects=totals.get("completed_projects", 0),
+        average_rating=average_rating,
+        by_status={row["_id"]: row["count"] for row in facets.get("by_status", []) if row["_id"]},
+        by_category={row["_id"]: row["count"] for row in facets.get("by_category", [])}
+    )
+    catalogue_cache.set(STATS_KEY, stats, generation)
+    return stats
+
+@app.get("/api/stats", response_model=ProjectStats)
+async def get_stats():
+    """Получить статистику проектов"""
     try:
-        collection = db[COLLECTION_NAME]
+        hit, cached = catalogue_cache.get(STATS_KEY)
+        if hit:
+            return cached
         
-        # Получение уникальных категорий
-        categories = await collection.distinct("category")
+        return await catalogue_flights.run(STATS_KEY, _query_stats)
         
-        # Фильтрация пустых значений
-        categories = [cat for cat in categories if cat]
+    except Exception as e:
+        logger.error(f"Error getting stats: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+async def _query_facets() -> FacetsResponse:
+    """Прочитать поддерживаемые при записи счетчики и сохранить в кэш"""
+    generation = catalogue_cache.generation
+    counts = await load_facets(db, COLLECTION_NAME)
+    
+    categories = [
+        FacetCount(value=value, count=count)
+        for value, count in sorted(counts["category"].items())
+    ]
+    # Все статусы перечисления, включая пустые
+    statuses = [
+        FacetCount(value=status.value, count=counts["status"].get(status.value, 0))
+        for status in ProjectStatus
+    ]
+    
+    facets = FacetsResponse(categories=categories, statuses=statuses)
+    catalogue_cache.set(FACETS_KEY, facets, generation)
+    return facets
+
+@app.get("/api/facets", response_model=FacetsResponse)
+async def get_facets():
+    """Категории и статусы с количеством проектов для фильтров"""
+    try:
+        hit, cached = catalogue_cache.get(FACETS_KEY)
+        if hit:
+            return cached
         
-        # Сортировка
-        categories.sort()
+        return await catalogue_flights.run(FACETS_KEY, _query_facets)
         
-        return CategoriesResponse(categories=categories)
+    except Exception as e:
+        logger.error(f"Error getting facets: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/categories", response_model=CategoriesResponse)
+async def get_categories():
+    """Получить список всех уникальных категорий"""
+    try:
+        # Категории с ненулевым счетчиком, уже отсортированные
+        facets = await get_facets()
+        return CategoriesResponse(categories=[facet.value for facet in facets.categories])
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting categories: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -335,26 +1460,133 @@ async def get_statuses():
         logger.error(f"Error getting statuses: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-# Статические файлы
-app.mount("/static", StaticFiles(directory="static"), name="static")
+@app.get("/api/db/pool")
+async def get_pool_stats(username: str = Depends(verify_credentials)):
+    """Конфигурация и загрузка пула соединений MongoDB (требует аутентификации)"""
+    return pool_stats()
+
+@app.get("/api/db/indexes")
+async def get_index_status(username: str = Depends(verify_credentials)):
+    """Результат последней сверки индексов (требует аутентификации)"""
+    return index_status
+
+@app.get("/api/events")
+async def project_events(request: Request):
+    """Server-Sent Events: создание, изменение и удаление проектов"""
+    queue = broker.subscribe(request.headers.get("last-event-id"))
+    return StreamingResponse(
+        stream_events(queue),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.get("/api/events/stats")
+async def get_events_stats(username: str = Depends(verify_credentials)):
+    """Счетчики рассылки живых обновлений (требует аутентификации)"""
+    return broker.stats()
+
+@app.get("/api/cache/stats")
+async def get_cache_stats(username: str = Depends(verify_credentials)):
+    """Счетчики кэша каталога, объединения запросов и снимка в памяти (требует аутентификации)"""
+    return dict(
+        catalogue_cache.stats(),
+        single_flight=catalogue_flights.stats(),
+        columnar=columnar_catalogue.stats()
+    )
+
+@app.get("/api/ratelimit/stats")
+async def get_rate_limit_stats(username: str = Depends(verify_credentials)):
+    """Счетчики ограничителя частоты запросов (требует аутентификации)"""
+    return rate_limiter.stats()
+
+@app.get("/api/bootstrap", response_model=BootstrapResponse)
+async def get_bootstrap():
+    """Все данные первого экрана страницы проектов одним запросом"""
+    try:
+        (projects, next_cursor), facets, statuses, stats = await asyncio.gather(
+            _load_projects_page(None, None, None, DEFAULT_PAGE_SIZE, None, None),
+            get_facets(),
+            get_statuses(),
+            get_stats()
+        )
+        
+        return ORJSONResponse(content={
+            "projects": projects,
+            "next_cursor": next_cursor,
+            "categories": [facet.value for facet in facets.categories],
+            "statuses": statuses.statuses,
+            "stats": stats.model_dump(),
+            "facets": facets.model_dump()
+        })
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error loading bootstrap data: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+# Статические файлы из памяти
+@app.api_route("/static/{path:path}", methods=["GET", "HEAD"], include_in_schema=False)
+async def static_file(path: str, request: Request):
+    """Статический файл; имя с отпечатком содержимого кэшируется навсегда"""
+    asset = asset_store.get_fingerprinted(path)
+    if asset is not None:
+        return asset_response(asset, request, IMMUTABLE_CACHE_CONTROL)
+    
+    asset = asset_store.get(path)
+    if asset is None:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return asset_response(asset, request, REVALIDATE_CACHE_CONTROL)
+
+def _page_response(name: str, request: Request) -> Response:
+    asset = asset_store.get(name)
+    if asset is None:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return asset_response(asset, request, REVALIDATE_CACHE_CONTROL)
 
 # HTML страницы
 @app.get("/")
-async def root():
+async def root(request: Request):
     """Перенаправление на страницу проектов"""
-    return FileResponse("static/projects.html")
+    return _page_response("projects.html", request)
 
 @app.get("/projects")
-async def projects_page():
+async def projects_page(request: Request):
     """Страница с проектами"""
-    return FileResponse("static/projects.html")
+    return _page_response("projects.html", request)
 
 @app.get("/admin")
-async def admin_page():
+async def admin_page(request: Request):
     """Админ панель"""
-    return FileResponse("static/admin.html")
+    return _page_response("admin.html", request)
+
+# Метрики
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Метрики в формате Prometheus"""
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
 
 # Health check
+@app.get("/health/live")
+async def liveness():
+    """Процесс жив и обрабатывает запросы (без обращения к базе)"""
+    return {"status": "alive"}
+
+@app.get("/health/ready")
+async def readiness():
+    """Процесс готов принимать трафик: база доступна и остановка не начата"""
+    if draining:
+        raise HTTPException(status_code=503, detail={"status": "draining"})
+    if db_client is None:
+        raise HTTPException(status_code=503, detail={"status": "starting"})
+    try:
+        await db_client.admin.command('ping')
+    except Exception as e:
+        logger.error(f"Readiness check failed: {e}")
+        raise HTTPException(status_code=503, detail={"status": "unavailable", "error": str(e)})
+    return {"status": "ready"}
+
 @app.get("/health")
 async def health_check():
     """Проверка состояния сервиса"""
@@ -373,6 +1605,7 @@ async def health_check():
             detail={"status": "unhealthy", "database": "disconnected", "error": str(e)}
         )
 
+# Режим разработки; в продакшене: gunicorn main:app (настройки в gunicorn.conf.py)
 if __name__ == "__main__":
     import uvicorn
     
@@ -0,0 +1,180 @@
+import os
+import time
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+    REGISTRY
+)
+from pymongo import monitoring
+from starlette.routing import Match
+
+from cache import catalogue_cache, catalogue_flights
+from database import pool_monitor
+from ratelimit import rate_limiter
+
+# Границы гистограмм
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Время обработки HTTP-запроса",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "Запросы в обработке",
+    ["method", "route"],
+    multiprocess_mode="livesum"
+)
+RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes",
+    "Размер тела ответа",
+    ["method", "route"],
+    buckets=SIZE_BUCKETS
+)
+MONGO_COMMAND_LATENCY = Histogram(
+    "mongodb_command_duration_seconds",
+    "Время выполнения команд MongoDB",
+    ["command", "outcome"],
+    buckets=LATENCY_BUCKETS
+)
+MONGO_COMMAND_ERRORS = Counter(
+    "mongodb_command_errors_total",
+    "Команды MongoDB, завершившиеся ошибкой",
+    ["command"]
+)
+
+class MongoCommandTimer(monitoring.CommandListener):
+    """Время команд MongoDB по имени команды"""
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        MONGO_COMMAND_LATENCY.labels(event.command_name, "success").observe(
+            event.duration_micros / 1_000_000
+        )
+
+    def failed(self, event):
+        MONGO_COMMAND_LATENCY.labels(event.command_name, "failure").observe(
+            event.duration_micros / 1_000_000
+        )
+        MONGO_COMMAND_ERRORS.labels(event.command_name).inc()
+
+mongo_command_timer = MongoCommandTimer()
+
+# Счетчики кэша, ограничителя и пула обновляются в момент события: в многопроцессном
+# режиме значения каждого воркера лежат в PROMETHEUS_MULTIPROC_DIR и суммируются при сборе
+CACHE_EVENTS = {
+    name: Counter(f"catalogue_cache_{name}", f"Кэш каталога: {name}")
+    for name in ("hits", "misses", "stores", "evictions", "invalidations", "discarded")
+}
+CACHE_ENTRIES = Gauge(
+    "catalogue_cache_entries",
+    "Записей в кэше каталога",
+    multiprocess_mode="livesum"
+)
+REQUESTS_COALESCED = Counter(
+    "catalogue_requests_coalesced",
+    "Запросы, дождавшиеся уже идущей загрузки"
+)
+REQUESTS_RATE_LIMITED = Counter(
+    "http_requests_rate_limited",
+    "Запросы, отклоненные ограничителем частоты"
+)
+POOL_CONNECTIONS_IN_USE = Gauge(
+    "mongodb_pool_connections_in_use",
+    "Занятые соединения пула",
+    ["address"],
+    multiprocess_mode="livesum"
+)
+POOL_CONNECTIONS_OPEN = Gauge(
+    "mongodb_pool_connections_open",
+    "Открытые соединения пула",
+    ["address"],
+    multiprocess_mode="livesum"
+)
+POOL_CHECKOUT_FAILURES = Counter(
+    "mongodb_pool_checkout_failures",
+    "Неудачные попытки взять соединение",
+    ["address"]
+)
+
+def _observe_cache(name: str, amount: int) -> None:
+    CACHE_EVENTS[name].inc(amount)
+    CACHE_ENTRIES.set(len(catalogue_cache))
+
+def _observe_pool(address: str, deltas: dict) -> None:
+    if deltas.get("in_use"):
+        POOL_CONNECTIONS_IN_USE.labels(address).inc(deltas["in_use"])
+    if deltas.get("open"):
+        POOL_CONNECTIONS_OPEN.labels(address).inc(deltas["open"])
+    if deltas.get("checkout_failures"):
+        POOL_CHECKOUT_FAILURES.labels(address).inc(deltas["checkout_failures"])
+
+catalogue_cache.observer = _observe_cache
+catalogue_flights.observer = lambda name, amount: REQUESTS_COALESCED.inc(amount)
+rate_limiter.observer = lambda name, amount: REQUESTS_RATE_LIMITED.inc(amount)
+pool_monitor.observer = _observe_pool
+
+def render_metrics():
+    """Тело и тип ответа /metrics (с учетом многопроцессного режима)"""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+class MetricsMiddleware:
+    """ASGI middleware: задержка, запросы в обработке и размер ответа по маршрутам"""
+
+    def __init__(self, app, routes, skip_paths=("/metrics",)):
+        self.app = app
+        self.routes = routes
+        self.skip_paths = set(skip_paths)
+
+    def _route_name(self, scope) -> str:
+        # Шаблон пути вместо фактического, чтобы ID не раздували число меток
+        for route in self.routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return getattr(route, "path", scope["path"])
+        return "unmatched"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.skip_paths:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = self._route_name(scope)
+        status_code = 500
+        body_size = 0
+
+        async def send_wrapper(message):
+            nonlocal status_code, body_size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                body_size += len(message.get("body", b""))
+            await send(message)
+
+        in_flight = REQUESTS_IN_FLIGHT.labels(method, route)
+        in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            in_flight.dec()
+            REQUEST_LATENCY.labels(method, route, str(status_code)).observe(
+                time.perf_counter() - started
+            )
+            RESPONSE_SIZE.labels(method, route).observe(body_size)
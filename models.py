@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field, field_validator
-from typing import List, Optional
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 from enum import Enum
 
@@ -80,21 +80,99 @@ class AIAssistantUpdate(AIAssistantBase):
     is_project_completed: Optional[bool] = None
     status: Optional[ProjectStatus] = None
 
+class ProjectArrayItems(BaseModel):
+    """Элементы массивов проекта для $push и $addToSet"""
+    links: Optional[List[ProjectLink]] = Field(None, min_items=1, description="Ссылки")
+    features: Optional[List[str]] = Field(None, min_items=1, description="Возможности")
+    
+    @field_validator('features')
+    @classmethod
+    def validate_features(cls, v):
+        if v is None:
+            return v
+        features = [f.strip() for f in v if f and f.strip()]
+        if not features:
+            raise ValueError('Список не может быть пустым')
+        return features
+
+class ProjectArrayPull(BaseModel):
+    """Удаляемые элементы массивов проекта для $pull"""
+    links: Optional[List[str]] = Field(None, min_items=1, description="URL удаляемых ссылок")
+    features: Optional[List[str]] = Field(None, min_items=1, description="Удаляемые возможности")
+    
+    @field_validator('links', 'features')
+    @classmethod
+    def strip_values(cls, v):
+        return [item.strip() for item in v] if v is not None else v
+
+# Поля, которые нельзя очистить через $set (обязательные в AIAssistantCreate)
+_REQUIRED_PATCH_FIELDS = ("name", "project_description", "status", "is_project_completed")
+
+class ProjectPatch(BaseModel):
+    """Частичное изменение проекта: $set для скалярных полей, операции над links и features"""
+    model_config = ConfigDict(populate_by_name=True)
+    
+    set: Optional[AIAssistantUpdate] = Field(None, alias="$set", description="Новые значения скалярных полей")
+    push: Optional[ProjectArrayItems] = Field(None, alias="$push", description="Добавить в конец массивов")
+    add_to_set: Optional[ProjectArrayItems] = Field(None, alias="$addToSet", description="Добавить, если еще нет")
+    pull: Optional[ProjectArrayPull] = Field(None, alias="$pull", description="Удалить из массивов")
+    
+    @model_validator(mode='after')
+    def validate_operations(self):
+        if self.set is not None:
+            fields = self.set.model_fields_set
+            if fields & {"links", "features", "rating"}:
+                raise ValueError('$set принимает только скалярные поля (links и features меняются через $push/$addToSet/$pull)')
+            for name in fields.intersection(_REQUIRED_PATCH_FIELDS):
+                if getattr(self.set, name) is None:
+                    raise ValueError(f'Поле {name} не может быть пустым')
+        
+        # Один массив в двух операциях — конфликт путей в MongoDB
+        used = []
+        for operation in (self.push, self.add_to_set, self.pull):
+            if operation is not None:
+                used.extend(name for name in operation.model_fields_set if getattr(operation, name) is not None)
+        if len(used) != len(set(used)):
+            raise ValueError('Каждый массив можно изменить только одной операцией')
+        if not used and not (self.set and self.set.model_fields_set):
+            raise ValueError('Нет изменений')
+        return self
+
 class AIAssistantResponse(AIAssistantBase):
     """Модель ответа ИИ ассистента"""
     id: str = Field(..., description="ID проекта")
     created_at: datetime = Field(..., description="Дата создания")
     updated_at: datetime = Field(..., description="Дата обновления")
+    version: int = Field(0, description="Версия проекта (для заголовка If-Match)")
     
     class Config:
         from_attributes = True
 
+class SearchResult(AIAssistantResponse):
+    """Проект в результатах поиска"""
+    score: float = Field(..., description="Релевантность")
+
+class SearchResponse(BaseModel):
+    """Страница результатов поиска"""
+    items: List[SearchResult] = Field(..., description="Найденные проекты")
+    next_offset: Optional[int] = Field(None, description="Смещение следующей страницы")
+
+class ProjectChangesResponse(BaseModel):
+    """Изменения каталога после токена синхронизации"""
+    reset: bool = Field(..., description="Локальную копию нужно очистить (полная синхронизация)")
+    projects: List[AIAssistantResponse] = Field(..., description="Созданные и измененные проекты")
+    deleted: List[str] = Field(..., description="ID удаленных проектов")
+    next_token: str = Field(..., description="Токен для следующего запроса")
+    has_more: bool = Field(..., description="Есть ли еще изменения (повторить запрос с next_token)")
+
 class ProjectStats(BaseModel):
     """Статистика проектов"""
     total_projects: int = Field(..., description="Общее количество проектов")
     active_projects: int = Field(..., description="Количество активных проектов")
     completed_projects: int = Field(..., description="Количество завершенных проектов")
     average_rating: Optional[float] = Field(None, description="Средний рейтинг")
+    by_status: Dict[str, int] = Field(default_factory=dict, description="Количество проектов по статусам")
+    by_category: Dict[str, int] = Field(default_factory=dict, description="Количество проектов по категориям")
 
 class CategoriesResponse(BaseModel):
     """Список категорий"""
@@ -102,4 +180,67 @@ class CategoriesResponse(BaseModel):
 
 class StatusesResponse(BaseModel):
     """Список статусов"""
-    statuses: List[str] = Field(..., description="Список доступных статусов")
\ No newline at end of file
+    statuses: List[str] = Field(..., description="Список доступных статусов")
+
+class FacetCount(BaseModel):
+    """Значение фильтра и число проектов с ним"""
+    value: str = Field(..., description="Значение")
+    count: int = Field(..., description="Количество проектов")
+
+class FacetsResponse(BaseModel):
+    """Категории и статусы с количеством проектов"""
+    categories: List[FacetCount] = Field(..., description="Категории (по алфавиту)")
+    statuses: List[FacetCount] = Field(..., description="Статусы (в порядке перечисления)")
+
+class BootstrapResponse(BaseModel):
+    """Данные для первого экрана страницы проектов"""
+    projects: List[AIAssistantResponse] = Field(..., description="Первая страница проектов")
+    next_cursor: Optional[str] = Field(None, description="Курсор следующей страницы")
+    categories: List[str] = Field(..., description="Список уникальных категорий")
+    statuses: List[str] = Field(..., description="Список доступных статусов")
+    stats: ProjectStats = Field(..., description="Статистика проектов")
+    facets: FacetsResponse = Field(..., description="Категории и статусы с количеством проектов")
+
+class LoginRequest(BaseModel):
+    """Учетные данные администратора"""
+    username: str = Field(..., min_length=1, max_length=200, description="Имя пользователя")
+    password: str = Field(..., min_length=1, max_length=200, description="Пароль")
+
+class TokenResponse(BaseModel):
+    """Токен доступа администратора"""
+    access_token: str = Field(..., description="Подписанный токен")
+    token_type: str = Field("bearer", description="Тип токена")
+    expires_in: int = Field(..., description="Срок действия в секундах")
+
+class BulkOperationType(str, Enum):
+    CREATE = "create"
+    UPDATE = "update"
+    DELETE = "delete"
+
+class BulkOperation(BaseModel):
+    """Одна операция пакетного запроса"""
+    op: BulkOperationType = Field(..., description="Тип операции")
+    id: Optional[str] = Field(None, description="ID проекта (для update и delete)")
+    data: Optional[Dict[str, Any]] = Field(None, description="Данные проекта (для create и update)")
+
+class BulkRequest(BaseModel):
+    """Пакет операций над проектами"""
+    operations: List[BulkOperation] = Field(..., min_items=1, max_items=1000, description="Операции")
+    ordered: bool = Field(True, description="Остановиться на первой ошибке")
+
+class BulkItemResult(BaseModel):
+    """Результат одной операции пакета"""
+    index: int = Field(..., description="Позиция операции в запросе")
+    op: BulkOperationType = Field(..., description="Тип операции")
+    id: Optional[str] = Field(None, description="ID проекта")
+    status: str = Field(..., description="ok, error или skipped")
+    error: Optional[str] = Field(None, description="Описание ошибки")
+
+class BulkResponse(BaseModel):
+    """Итог пакетной операции"""
+    ordered: bool
+    inserted: int = 0
+    updated: int = 0
+    deleted: int = 0
+    errors: int = 0
+    results: List[BulkItemResult]
@@ -0,0 +1,68 @@
+import base64
+import json
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from bson import ObjectId
+from bson.errors import InvalidId
+
+from models import AIAssistantResponse
+
+# Настройки пагинации
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Порядок сортировки списка проектов (новые первыми, _id разрешает равенство дат)
+PROJECTS_SORT = [("created_at", -1), ("_id", -1)]
+
+# Поля, которые всегда попадают в проекцию (нужны для курсора и id)
+_REQUIRED_FIELDS = {"_id", "created_at"}
+
+# Поля, доступные для проекции через ?fields=
+PROJECTABLE_FIELDS = set(AIAssistantResponse.model_fields) - {"id"}
+
+
+def encode_cursor(project: Dict) -> str:
+    """Сформировать непрозрачный курсор по последнему документу страницы"""
+    payload = {
+        "c": project["created_at"].isoformat(),
+        "i": str(project["_id"]),
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, ObjectId]:
+    """Разобрать курсор, выданный encode_cursor"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(payload["c"]), ObjectId(payload["i"])
+    except (ValueError, KeyError, TypeError, InvalidId) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def cursor_filter(cursor: str) -> Dict:
+    """Условие keyset-пагинации: документы строго после курсора"""
+    created_at, last_id = decode_cursor(cursor)
+    return {
+        "$or": [
+            {"created_at": {"$lt": created_at}},
+            {"created_at": created_at, "_id": {"$lt": last_id}},
+        ]
+    }
+
+
+def build_projection(fields: Optional[str]) -> Optional[Dict[str, int]]:
+    """Построить проекцию MongoDB из списка полей через запятую"""
+    if not fields:
+        return None
+
+    requested = {f.strip() for f in fields.split(",") if f.strip()}
+    requested.discard("id")
+
+    unknown = requested - PROJECTABLE_FIELDS
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+
+    return {field: 1 for field in requested | _REQUIRED_FIELDS}
@@ -0,0 +1,214 @@
+import logging
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+import orjson
+from fastapi import HTTPException, Request
+from pymongo import monitoring
+from dotenv import load_dotenv
+
+try:
+    from pyinstrument import Profiler
+    from pyinstrument.renderers import ConsoleRenderer, HTMLRenderer, SpeedscopeRenderer
+except ImportError:
+    Profiler = None
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Интервал выборки профилировщика
+PROFILE_INTERVAL_SECONDS = float(os.getenv("PROFILE_INTERVAL_SECONDS", "0.001"))
+
+# Форматы отчета: ?profile=<формат> или заголовок X-Profile: <формат>
+PROFILE_FORMATS = ("html", "text", "speedscope")
+
+class RequestTimings:
+    """Фазы обработки одного запроса для заголовка Server-Timing"""
+
+    __slots__ = ("started", "phases", "notes", "db_durations")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+        self.notes: Dict[str, str] = {}
+        # Команды MongoDB завершаются в потоках Motor: list.append атомарен
+        self.db_durations: List[float] = []
+
+    def add(self, name: str, duration_ms: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + duration_ms
+
+    def header(self) -> str:
+        entries = []
+        if self.db_durations:
+            entries.append(
+                f'db;dur={sum(self.db_durations):.1f};desc="{len(self.db_durations)} queries"'
+            )
+        entries.extend(f"{name};dur={duration:.1f}" for name, duration in self.phases.items())
+        entries.extend(f"{name};desc={value}" for name, value in self.notes.items())
+        entries.append(f"app;dur={(time.perf_counter() - self.started) * 1000:.1f}")
+        return ", ".join(entries)
+
+# Фазы текущего запроса (None вне запроса: фоновые задачи, поток событий)
+request_timings: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+@contextmanager
+def timed(name: str):
+    """Учесть время блока в Server-Timing текущего запроса"""
+    timings = request_timings.get()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        if timings is not None:
+            timings.add(name, (time.perf_counter() - started) * 1000)
+
+def note(name: str, value: str) -> None:
+    """Метка без длительности в Server-Timing (например, cache;desc=hit)"""
+    timings = request_timings.get()
+    if timings is not None:
+        timings.notes[name] = value
+
+class DbTimingListener(monitoring.CommandListener):
+    """Время команд MongoDB в Server-Timing запроса (Motor переносит contextvars в свои потоки)"""
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        timings = request_timings.get()
+        if timings is not None:
+            timings.db_durations.append(event.duration_micros / 1000)
+
+    def failed(self, event):
+        self.succeeded(event)
+
+db_timing_listener = DbTimingListener()
+
+class ServerTimingMiddleware:
+    """ASGI middleware: заголовок Server-Timing (MongoDB, фазы обработчика, общее время) для каждого ответа"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = request_timings.set(timings)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"server-timing", timings.header().encode("latin-1"))
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            request_timings.reset(token)
+
+def _render(profiler, profile_format: str) -> Tuple[bytes, str]:
+    session = profiler.last_session
+    if profile_format == "text":
+        return ConsoleRenderer(unicode=True, color=False).render(session).encode("utf8"), "text/plain; charset=utf-8"
+    if profile_format == "speedscope":
+        return SpeedscopeRenderer().render(session).encode("utf8"), "application/json"
+    return HTMLRenderer().render(session).encode("utf8"), "text/html; charset=utf-8"
+
+class ProfilingMiddleware:
+    """ASGI middleware: профиль одного запроса по флагу администратора вместо обычного ответа
+
+    Флаг — параметр ?profile=html|text|speedscope или заголовок X-Profile. Учетные данные
+    проверяются той же функцией, что и у административных эндпоинтов. Отчет pyinstrument:
+    html — интерактивное дерево вызовов, speedscope — flame graph для speedscope.app.
+    """
+
+    def __init__(self, app, authenticate: Callable[[Request], Awaitable[str]]):
+        self.app = app
+        self.authenticate = authenticate
+        self._active = False
+
+    @staticmethod
+    def _requested_format(scope) -> Optional[str]:
+        for name, value in scope["headers"]:
+            if name == b"x-profile":
+                return value.decode("latin-1").strip().lower() or "html"
+        query = scope.get("query_string", b"")
+        if b"profile=" not in query:
+            return None
+        values = parse_qs(query.decode("latin-1")).get("profile")
+        return values[0].lower() if values else None
+
+    async def _send_json(self, send, status_code: int, content: Dict, headers: Optional[Dict] = None) -> None:
+        body = orjson.dumps(content)
+        raw_headers = [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode("latin-1"))
+        ]
+        raw_headers.extend(
+            (name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in (headers or {}).items()
+        )
+        await send({"type": "http.response.start", "status": status_code, "headers": raw_headers})
+        await send({"type": "http.response.body", "body": body})
+
+    async def __call__(self, scope, receive, send):
+        profile_format = self._requested_format(scope) if scope["type"] == "http" else None
+        if profile_format is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            username = await self.authenticate(Request(scope))
+        except HTTPException as e:
+            await self._send_json(send, e.status_code, {"detail": e.detail}, e.headers)
+            return
+        if Profiler is None:
+            await self._send_json(send, 501, {"detail": "Profiling requires pyinstrument"})
+            return
+        if profile_format not in PROFILE_FORMATS:
+            await self._send_json(send, 400, {"detail": f"profile must be one of: {', '.join(PROFILE_FORMATS)}"})
+            return
+        if self._active:
+            await self._send_json(send, 409, {"detail": "Another request is being profiled"})
+            return
+
+        # Ответ приложения не отправляется: клиент получает отчет
+        status_code = 500
+
+        async def capture(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+
+        self._active = True
+        profiler = Profiler(interval=PROFILE_INTERVAL_SECONDS, async_mode="enabled")
+        try:
+            profiler.start()
+            try:
+                await self.app(scope, receive, capture)
+            finally:
+                profiler.stop()
+        finally:
+            self._active = False
+
+        body, content_type = _render(profiler, profile_format)
+        logger.info(f"Profiled {scope['method']} {scope['path']} for {username}: status {status_code}")
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", content_type.encode("latin-1")),
+                (b"content-length", str(len(body)).encode("latin-1")),
+                (b"x-profiled-status", str(status_code).encode("latin-1")),
+                (b"cache-control", b"no-store")
+            ]
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,150 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from pymongo import monitoring
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Порог медленного запроса и фоновый explain для него
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "100"))
+SLOW_QUERY_EXPLAIN = os.getenv("SLOW_QUERY_EXPLAIN", "true").lower() == "true"
+# Один и тот же вид запроса разбирается не чаще, чем раз в указанный интервал
+SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS = float(os.getenv("SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS", "300"))
+
+_TRACKED_COMMANDS = {"find", "aggregate", "count", "distinct", "findAndModify", "update", "delete"}
+# Поля команды find, которые нужны для повторного выполнения через explain
+_FIND_FIELDS = ("find", "filter", "sort", "projection", "limit", "skip", "hint")
+
+def query_shape(value: Any) -> Any:
+    """Форма фильтра: ключи и операторы сохраняются, значения заменяются на '?'"""
+    if isinstance(value, dict):
+        return {key: query_shape(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [query_shape(value[0])] if value else []
+    return "?"
+
+def _plan_stages(plan: Dict) -> List[Dict]:
+    """Стадии плана от корня к листьям"""
+    stages = []
+    pending = [plan]
+    while pending:
+        stage = pending.pop()
+        stages.append(stage)
+        if "inputStage" in stage:
+            pending.append(stage["inputStage"])
+        pending.extend(stage.get("inputStages", []))
+    return stages
+
+def summarize_explain(explain: Dict) -> Dict:
+    """Главное из вывода explain: индексы, сканирование коллекции, сортировка в памяти, число документов"""
+    planner = explain.get("queryPlanner", {})
+    winning_plan = planner.get("winningPlan", {})
+    # Slot-based engine (MongoDB 7+) вкладывает классический план в queryPlan
+    plan = winning_plan.get("queryPlan", winning_plan)
+    stages = _plan_stages(plan)
+    names = [stage.get("stage") for stage in stages]
+    execution = explain.get("executionStats", {})
+
+    return {
+        "stages": names,
+        "indexes": [stage["indexName"] for stage in stages if "indexName" in stage],
+        "collection_scan": "COLLSCAN" in names,
+        "in_memory_sort": "SORT" in names,
+        "rejected_plans": len(planner.get("rejectedPlans", [])),
+        "returned": execution.get("nReturned"),
+        "docs_examined": execution.get("totalDocsExamined"),
+        "keys_examined": execution.get("totalKeysExamined"),
+        "execution_ms": execution.get("executionTimeMillis")
+    }
+
+def _returned_count(command_name: str, reply: Dict) -> Optional[int]:
+    if "cursor" in reply:
+        return len(reply["cursor"].get("firstBatch", []))
+    if command_name in ("count", "update", "delete"):
+        return reply.get("n")
+    if command_name == "distinct":
+        return len(reply.get("values", []))
+    return None
+
+class SlowQueryLogger(monitoring.CommandListener):
+    """Журнал медленных команд MongoDB: форма фильтра, длительность, возвращено/просмотрено документов
+
+    Число просмотренных документов в ответе команды нет, поэтому для медленного find
+    в фоне выполняется explain того же запроса (не чаще интервала на форму запроса).
+    """
+
+    def __init__(self, threshold_ms: float = SLOW_QUERY_MS, explain: bool = SLOW_QUERY_EXPLAIN):
+        self.threshold_ms = threshold_ms
+        self.explain = explain
+        self.slow_queries = 0
+        self._started: Dict[int, Dict] = {}
+        self._explained_at: Dict[str, float] = {}
+        self._client = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def attach(self, client, loop: asyncio.AbstractEventLoop) -> None:
+        """Клиент и цикл событий для фонового explain"""
+        self._client = client
+        self._loop = loop
+
+    def started(self, event):
+        if event.command_name in _TRACKED_COMMANDS:
+            self._started[event.request_id] = event.command
+
+    def succeeded(self, event):
+        command = self._started.pop(event.request_id, None)
+        if command is None or event.duration_micros < self.threshold_ms * 1000:
+            return
+
+        self.slow_queries += 1
+        collection = command.get(event.command_name)
+        filter_ = command.get("filter", command.get("query", {}))
+        shape = {"filter": query_shape(filter_), "sort": command.get("sort")}
+        if event.command_name == "aggregate":
+            shape = {"pipeline": query_shape(command.get("pipeline", []))}
+        logger.warning(
+            f"Slow query: {event.command_name} {event.database_name}.{collection} "
+            f"shape={shape} returned={_returned_count(event.command_name, event.reply)} "
+            f"duration={event.duration_micros / 1000:.1f}ms"
+        )
+
+        if self.explain and event.command_name == "find":
+            self._schedule_explain(event.database_name, command, f"{collection}:{shape}")
+
+    def failed(self, event):
+        self._started.pop(event.request_id, None)
+
+    def _schedule_explain(self, database_name: str, command: Dict, shape_key: str) -> None:
+        if self._client is None or self._loop is None or self._loop.is_closed():
+            return
+        now = time.monotonic()
+        if now - self._explained_at.get(shape_key, float("-inf")) < SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS:
+            return
+        self._explained_at[shape_key] = now
+
+        find = {field: command[field] for field in _FIND_FIELDS if field in command}
+        asyncio.run_coroutine_threadsafe(self._log_explain(database_name, find, shape_key), self._loop)
+
+    async def _log_explain(self, database_name: str, find: Dict, shape_key: str) -> None:
+        try:
+            explain = await self._client[database_name].command(
+                {"explain": find, "verbosity": "executionStats"}
+            )
+        except Exception as e:
+            logger.error(f"Explain for slow query {shape_key} failed: {e}")
+            return
+        summary = summarize_explain(explain)
+        logger.warning(
+            f"Slow query plan {shape_key}: docs_examined={summary['docs_examined']} "
+            f"keys_examined={summary['keys_examined']} returned={summary['returned']} "
+            f"indexes={summary['indexes']} collection_scan={summary['collection_scan']} "
+            f"in_memory_sort={summary['in_memory_sort']}"
+        )
+
+slow_query_logger = SlowQueryLogger()
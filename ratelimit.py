@@ -0,0 +1,136 @@
+import math
+import os
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+import orjson
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Настройки ограничения частоты запросов
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+RATE_LIMIT_PER_SECOND = float(os.getenv("RATE_LIMIT_PER_SECOND", "20"))
+RATE_LIMIT_BURST = int(os.getenv("RATE_LIMIT_BURST", "60"))
+RATE_LIMIT_MAX_CLIENTS = int(os.getenv("RATE_LIMIT_MAX_CLIENTS", "10000"))
+# За обратным прокси клиент определяется по первому адресу X-Forwarded-For
+RATE_LIMIT_TRUST_FORWARDED = os.getenv("RATE_LIMIT_TRUST_FORWARDED", "false").lower() == "true"
+
+class RateLimitBackend:
+    """Хранилище корзин токенов; общий для процессов вариант (например, Redis) наследует этот класс"""
+
+    async def acquire(self, key: str, rate: float, burst: int) -> Tuple[bool, float]:
+        """Взять один токен: (разрешено, секунд до появления следующего токена)"""
+        raise NotImplementedError
+
+    def stats(self) -> Dict:
+        return {}
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """Корзины токенов в памяти процесса с вытеснением давно не приходивших клиентов"""
+
+    def __init__(self, max_clients: int = RATE_LIMIT_MAX_CLIENTS):
+        self.max_clients = max_clients
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self.evictions = 0
+
+    async def acquire(self, key: str, rate: float, burst: int) -> Tuple[bool, float]:
+        now = time.monotonic()
+        tokens, updated_at = self._buckets.get(key, (float(burst), now))
+        tokens = min(float(burst), tokens + (now - updated_at) * rate)
+
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_clients:
+            self._buckets.popitem(last=False)
+            self.evictions += 1
+
+        return allowed, 0.0 if allowed else (1 - tokens) / rate
+
+    def stats(self) -> Dict:
+        return {"clients": len(self._buckets), "max_clients": self.max_clients, "evictions": self.evictions}
+
+class RateLimiter:
+    """Параметры корзины, хранилище и счетчики отказов"""
+
+    def __init__(self, backend: RateLimitBackend = None, rate: float = RATE_LIMIT_PER_SECOND,
+                 burst: int = RATE_LIMIT_BURST, enabled: bool = RATE_LIMIT_ENABLED):
+        self.backend = backend or InMemoryRateLimitBackend()
+        self.rate = rate
+        self.burst = burst
+        self.enabled = enabled
+        self.allowed = 0
+        self.rejected = 0
+        # Наблюдатель счетчика отказов (метрики Prometheus)
+        self.observer: Optional[Callable[[str, int], None]] = None
+
+    async def check(self, key: str) -> Tuple[bool, float]:
+        allowed, retry_after = await self.backend.acquire(key, self.rate, self.burst)
+        if allowed:
+            self.allowed += 1
+        else:
+            self.rejected += 1
+            if self.observer is not None:
+                self.observer("rejected", 1)
+        return allowed, retry_after
+
+    def stats(self) -> Dict:
+        return {
+            "enabled": self.enabled,
+            "rate_per_second": self.rate,
+            "burst": self.burst,
+            "allowed": self.allowed,
+            "rejected": self.rejected,
+            "backend": self.backend.stats()
+        }
+
+rate_limiter = RateLimiter()
+
+class RateLimitMiddleware:
+    """ASGI middleware: token bucket на клиента для путей API"""
+
+    def __init__(self, app, limiter: RateLimiter = rate_limiter, prefix: str = "/api/",
+                 trust_forwarded: bool = RATE_LIMIT_TRUST_FORWARDED):
+        self.app = app
+        self.limiter = limiter
+        self.prefix = prefix
+        self.trust_forwarded = trust_forwarded
+
+    def _client_key(self, scope) -> str:
+        if self.trust_forwarded:
+            for name, value in scope["headers"]:
+                if name == b"x-forwarded-for":
+                    return value.decode("latin-1").split(",")[0].strip()
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or not self.limiter.enabled
+            or scope["method"] == "OPTIONS"
+            or not scope["path"].startswith(self.prefix)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        allowed, retry_after = await self.limiter.check(self._client_key(scope))
+        if allowed:
+            await self.app(scope, receive, send)
+            return
+
+        body = orjson.dumps({"detail": "Too many requests"})
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("latin-1")),
+                (b"retry-after", str(max(1, math.ceil(retry_after))).encode("latin-1"))
+            ]
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,123 @@
+import re
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Текстовый индекс MongoDB (контент на русском, стемминг на стороне сервера)
+TEXT_INDEX_WEIGHTS = {
+    "name": 10,
+    "category": 5,
+    "features": 3,
+    "project_description": 1
+}
+TEXT_INDEX_KEYS = [(field, "text") for field in TEXT_INDEX_WEIGHTS]
+TEXT_INDEX_OPTIONS = {
+    "name": "projects_text",
+    "default_language": "russian",
+    "weights": TEXT_INDEX_WEIGHTS
+}
+
+_TOKEN_RE = re.compile(r"[\w]+", re.UNICODE)
+
+# Окончания для упрощенного стемминга (от длинных к коротким)
+_RU_ENDINGS = sorted(
+    [
+        "иями", "ями", "ами", "ией", "ием", "иях", "ого", "его", "ому", "ему",
+        "ыми", "ими", "ая", "яя", "ое", "ее", "ие", "ые", "ой", "ей", "ий", "ый",
+        "ом", "ем", "ам", "ям", "ах", "ях", "ов", "ев", "ию", "ью", "ия", "ья",
+        "ть", "ет", "ют", "ут", "ит", "ат", "ят",
+        "а", "я", "о", "е", "и", "ы", "у", "ю", "ь", "й"
+    ],
+    key=len,
+    reverse=True
+)
+_MIN_STEM = 3
+
+def stem(token: str) -> str:
+    """Упрощенный стеммер: отсечение типичных русских окончаний"""
+    for ending in _RU_ENDINGS:
+        if token.endswith(ending) and len(token) - len(ending) >= _MIN_STEM:
+            return token[: -len(ending)]
+    return token
+
+def tokenize(text: str) -> List[str]:
+    """Нормализованные термы строки"""
+    return [stem(token) for token in _TOKEN_RE.findall(text.lower())]
+
+def _field_values(project: Dict, field: str) -> Iterable[str]:
+    value = project.get(field)
+    if not value:
+        return ()
+    if isinstance(value, list):
+        return [v for v in value if isinstance(v, str)]
+    return (str(value),)
+
+class InMemoryTextIndex:
+    """Инвертированный индекс в памяти для серверов без $text (локальные заглушки)"""
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[str, float]] = defaultdict(dict)
+        self._terms: Dict[str, List[str]] = {}
+        self._documents: Dict[str, Dict] = {}
+        self.built = False
+
+    def build(self, projects: Iterable[Dict]) -> None:
+        """Построить индекс заново"""
+        self._postings.clear()
+        self._terms.clear()
+        self._documents.clear()
+        for project in projects:
+            self.add(project)
+        self.built = True
+
+    def add(self, project: Dict) -> None:
+        """Добавить или заменить документ"""
+        doc_id = str(project["_id"])
+        self.remove(doc_id)
+
+        weights: Dict[str, float] = defaultdict(float)
+        for field, weight in TEXT_INDEX_WEIGHTS.items():
+            for value in _field_values(project, field):
+                for term in tokenize(value):
+                    weights[term] += weight
+
+        for term, weight in weights.items():
+            self._postings[term][doc_id] = weight
+        self._terms[doc_id] = list(weights)
+        self._documents[doc_id] = project
+
+    def remove(self, doc_id: str) -> None:
+        """Удалить документ из индекса"""
+        for term in self._terms.pop(doc_id, ()):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[term]
+        self._documents.pop(doc_id, None)
+
+    def update(self, before: Optional[Dict], after: Optional[Dict]) -> None:
+        """Применить изменение документа (None — создание/удаление)"""
+        if not self.built:
+            return
+        if after is not None:
+            self.add(after)
+        elif before is not None:
+            self.remove(str(before["_id"]))
+
+    def search(self, query: str, filter_query: Dict) -> List[Tuple[float, Dict]]:
+        """Документы, содержащие хотя бы один терм запроса, по убыванию релевантности"""
+        scores: Dict[str, float] = defaultdict(float)
+        for term in set(tokenize(query)):
+            for doc_id, weight in self._postings.get(term, {}).items():
+                scores[doc_id] += weight
+
+        results = []
+        for doc_id, score in scores.items():
+            project = self._documents[doc_id]
+            if all(project.get(field) == value for field, value in filter_query.items()):
+                results.append((score, project))
+
+        results.sort(key=lambda item: (item[0], item[1]["created_at"]), reverse=True)
+        return results
+
+memory_index = InMemoryTextIndex()
@@ -0,0 +1,30 @@
+from typing import Any, Callable, Dict, Optional
+
+from models import AIAssistantResponse
+
+# Поля ответа и фабрики значений по умолчанию для отсутствующих в документе
+RESPONSE_DEFAULTS: Dict[str, Callable[[], Any]] = {
+    name: (field.default_factory or (lambda value=field.default: value))
+    for name, field in AIAssistantResponse.model_fields.items()
+    if name != "id" and not field.is_required()
+}
+RESPONSE_FIELDS = tuple(name for name in AIAssistantResponse.model_fields if name != "id")
+
+# Проекция MongoDB: только поля, которые попадут в ответ
+RESPONSE_PROJECTION = {name: 1 for name in RESPONSE_FIELDS}
+
+
+def project_to_dict(project: Dict, fields: Optional[Dict] = None) -> Dict:
+    """Документ MongoDB -> словарь ответа без построения Pydantic-модели
+
+    Документы валидируются при записи (AIAssistantCreate/Update), поэтому
+    при чтении достаточно переименовать _id и подставить значения по умолчанию.
+    """
+    names = RESPONSE_FIELDS if fields is None else [f for f in RESPONSE_FIELDS if f in fields]
+    result = {"id": str(project["_id"])}
+    for name in names:
+        if name in project:
+            result[name] = project[name]
+        elif name in RESPONSE_DEFAULTS:
+            result[name] = RESPONSE_DEFAULTS[name]()
+    return result
@@ -0,0 +1,54 @@
+import sys
+
+from gunicorn.arbiter import Arbiter
+from uvicorn.server import Server
+from uvicorn.workers import UvicornWorker
+
+from structured_logging import route_uvicorn_loggers
+
+# Запас, чтобы uvicorn успел закрыть соединение с базой до SIGKILL от gunicorn
+_SHUTDOWN_MARGIN_SECONDS = 2
+
+class DrainingServer(Server):
+    """Сервер uvicorn, который при сигнале остановки сначала переводит приложение в режим дренажа"""
+
+    def handle_exit(self, sig, frame):
+        if not self.should_exit:
+            import main
+            main.begin_draining()
+        super().handle_exit(sig, frame)
+
+class CatalogueWorker(UvicornWorker):
+    """Воркер gunicorn: uvloop + httptools и ограниченное время дренажа"""
+
+    CONFIG_KWARGS = {"loop": "uvloop", "http": "httptools"}
+    # Назначенный воркер сверяет индексы в фоне с повторами (см. assign_index_worker)
+    reconcile_indexes = False
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # UvicornWorker отдает логгеры uvicorn синхронным обработчикам gunicorn
+        route_uvicorn_loggers(access_log=self.cfg.accesslog is not None)
+        self.config.timeout_graceful_shutdown = max(
+            1, self.cfg.graceful_timeout - _SHUTDOWN_MARGIN_SECONDS
+        )
+
+    def init_process(self) -> None:
+        if self.reconcile_indexes:
+            import main
+            main.CREATE_INDEXES_ON_STARTUP = True
+        super().init_process()
+
+    async def _serve(self) -> None:
+        self.config.app = self.wsgi
+        server = DrainingServer(config=self.config)
+        self._install_sigquit_handler()
+        await server.serve(sockets=self.sockets)
+        if not server.started:
+            sys.exit(Arbiter.WORKER_BOOT_ERROR)
+
+def assign_index_worker(server, worker) -> None:
+    """Назначить воркеру сверку индексов, если ее не ведет ни один живой воркер (мастер, до fork)"""
+    worker.reconcile_indexes = not any(
+        getattr(other, "reconcile_indexes", False) for other in server.WORKERS.values()
+    )
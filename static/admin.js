@@ -0,0 +1,384 @@
+const { createApp } = Vue;
+
+createApp({
+    data() {
+        return {
+            // Auth
+            isAuthenticated: false,
+            authForm: {
+                username: '',
+                password: ''
+            },
+            authError: '',
+            authCredentials: null,
+
+            // Projects
+            projects: [],
+            loading: false,
+            error: null,
+            successMessage: '',
+            copiedProjectId: null,
+
+            // Modal
+            showModal: false,
+            editingProject: null,
+            formData: {
+                name: '',
+                admin_panel_name: '',
+                project_description: '',
+                links: [],
+                is_project_completed: false,
+                status: '',
+                features: [],
+                category: '',
+                rating: null
+            },
+            customCategory: '',
+
+            // Options
+            availableStatuses: [
+                'В разработке',
+                'В тестировании',
+                'Активен',
+                'Завершен',
+                'Приостановлен',
+                'Отменен'
+            ],
+            availableCategories: []
+        }
+    },
+    methods: {
+        // Auth methods
+        async login() {
+            this.authError = '';
+
+            try {
+                // Пароль отправляется один раз, дальше — подписанный токен
+                const response = await fetch('/api/auth/login', {
+                    method: 'POST',
+                    headers: { 'Content-Type': 'application/json' },
+                    body: JSON.stringify(this.authForm)
+                });
+
+                if (response.status === 401) {
+                    this.authError = 'Invalid username or password';
+                    return;
+                }
+
+                if (response.status === 429) {
+                    const retryAfter = response.headers.get('Retry-After');
+                    this.authError = `Too many attempts, try again in ${retryAfter} s`;
+                    return;
+                }
+
+                if (response.ok) {
+                    const data = await response.json();
+                    this.setAuthToken(data.access_token, data.expires_in);
+                    this.authForm.password = '';
+                    this.isAuthenticated = true;
+                    await this.fetchProjects();
+                    await this.fetchCategories();
+                }
+            } catch (err) {
+                this.authError = 'Connection error';
+            }
+        },
+
+        setAuthToken(token, expiresIn) {
+            this.authCredentials = token;
+            sessionStorage.setItem('adminToken', JSON.stringify({
+                token: token,
+                expiresAt: Date.now() + expiresIn * 1000
+            }));
+        },
+
+        restoreAuthToken() {
+            try {
+                const saved = JSON.parse(sessionStorage.getItem('adminToken'));
+                if (saved && saved.expiresAt > Date.now()) {
+                    this.authCredentials = saved.token;
+                }
+            } catch (err) {
+                sessionStorage.removeItem('adminToken');
+            }
+        },
+
+        clearAuthToken() {
+            this.authCredentials = null;
+            this.isAuthenticated = false;
+            sessionStorage.removeItem('adminToken');
+        },
+
+        getAuthHeaders() {
+            return {
+                'Authorization': `Bearer ${this.authCredentials}`,
+                'Content-Type': 'application/json'
+            };
+        },
+
+        // Category methods
+        async fetchCategories() {
+            try {
+                const response = await fetch('/api/categories');
+                if (response.ok) {
+                    const data = await response.json();
+                    this.availableCategories = data.categories || [];
+                }
+            } catch (err) {
+                console.error('Error loading categories:', err);
+            }
+        },
+
+        handleCustomCategory() {
+            if (this.customCategory.trim()) {
+                this.formData.category = this.customCategory.trim();
+                this.customCategory = '';
+            } else {
+                this.formData.category = '';
+            }
+        },
+
+        // Project methods
+        async fetchProjects() {
+            try {
+                this.loading = true;
+                this.error = null;
+
+                // Проходим все страницы по курсору
+                const projects = [];
+                let url = '/api/projects?limit=200';
+
+                while (url) {
+                    const response = await fetch(url);
+                    if (!response.ok) {
+                        throw new Error(`HTTP error! Status: ${response.status}`);
+                    }
+
+                    projects.push(...await response.json());
+
+                    const nextCursor = response.headers.get('X-Next-Cursor');
+                    url = nextCursor
+                        ? `/api/projects?limit=200&cursor=${encodeURIComponent(nextCursor)}`
+                        : null;
+                }
+
+                this.projects = projects;
+
+            } catch (err) {
+                console.error('Error loading projects:', err);
+                this.error = err.message;
+            } finally {
+                this.loading = false;
+            }
+        },
+
+        openCreateModal() {
+            this.editingProject = null;
+            this.resetForm();
+            this.showModal = true;
+        },
+
+        editProject(project) {
+            this.editingProject = project;
+            this.formData = {
+                name: project.name,
+                admin_panel_name: project.admin_panel_name || '',
+                project_description: project.project_description,
+                links: project.links ? [...project.links] : [],
+                is_project_completed: project.is_project_completed,
+                status: project.status,
+                features: project.features ? [...project.features] : [],
+                category: project.category || '',
+                rating: null // Убираем рейтинг
+            };
+            this.showModal = true;
+        },
+
+        closeModal() {
+            this.showModal = false;
+            this.editingProject = null;
+            this.resetForm();
+        },
+
+        resetForm() {
+            this.formData = {
+                name: '',
+                admin_panel_name: '',
+                project_description: '',
+                links: [],
+                is_project_completed: false,
+                status: this.availableStatuses[0],
+                features: [],
+                category: '',
+                rating: null
+            };
+            this.customCategory = '';
+        },
+
+        addLink() {
+            this.formData.links.push({
+                name: '',
+                url: '',
+                type: ''
+            });
+        },
+
+        removeLink(index) {
+            this.formData.links.splice(index, 1);
+        },
+
+        addFeature() {
+            this.formData.features.push('');
+        },
+
+        removeFeature(index) {
+            this.formData.features.splice(index, 1);
+        },
+
+        copyLinks(project) {
+            if (!project.links || project.links.length === 0) return;
+
+            const linksText = project.links
+                .map(link => `${link.name}: ${link.url}`)
+                .join('\n');
+
+            navigator.clipboard.writeText(linksText).then(() => {
+                this.copiedProjectId = project.id;
+                setTimeout(() => {
+                    this.copiedProjectId = null;
+                }, 2000);
+            }).catch(err => {
+                console.error('Failed to copy:', err);
+            });
+        },
+
+        async saveProject() {
+            try {
+                // Validation
+                if (!this.formData.name.trim()) {
+                    alert('Project name is required');
+                    return;
+                }
+
+                if (!this.formData.project_description.trim()) {
+                    alert('Project description is required');
+                    return;
+                }
+
+                if (!this.formData.links.length) {
+                    alert('Add at least one link');
+                    return;
+                }
+
+                // Check link fields
+                for (let link of this.formData.links) {
+                    if (!link.name.trim() || !link.url.trim()) {
+                        alert('Fill in all link fields');
+                        return;
+                    }
+                }
+
+                // Clean empty features
+                this.formData.features = this.formData.features.filter(f => f.trim());
+
+                const url = this.editingProject 
+                    ? `/api/projects/${this.editingProject.id}`
+                    : '/api/projects';
+
+                const method = this.editingProject ? 'PUT' : 'POST';
+
+                const response = await fetch(url, {
+                    method: method,
+                    headers: this.getAuthHeaders(),
+                    body: JSON.stringify(this.formData)
+                });
+
+                if (response.status === 401) {
+                    this.clearAuthToken();
+                    return;
+                }
+
+                if (!response.ok) {
+                    const errorData = await response.json();
+                    throw new Error(errorData.detail || 'Save error');
+                }
+
+                this.showSuccessMessage(this.editingProject 
+                    ? 'Project updated successfully!' 
+                    : 'Project created successfully!');
+
+                this.closeModal();
+                await this.fetchProjects();
+                await this.fetchCategories();
+
+            } catch (err) {
+                console.error('Error saving project:', err);
+                alert('Error: ' + err.message);
+            }
+        },
+
+        async deleteProject(projectId) {
+            if (!confirm('Are you sure you want to delete this project?')) {
+                return;
+            }
+
+            try {
+                const response = await fetch(`/api/projects/${projectId}`, {
+                    method: 'DELETE',
+                    headers: this.getAuthHeaders()
+                });
+
+                if (response.status === 401) {
+                    this.clearAuthToken();
+                    return;
+                }
+
+                if (!response.ok) {
+                    throw new Error('Delete error');
+                }
+
+                this.showSuccessMessage('Project deleted successfully!');
+                await this.fetchProjects();
+
+            } catch (err) {
+                console.error('Error deleting project:', err);
+                alert('Error: ' + err.message);
+            }
+        },
+
+        async refreshProjects() {
+            await this.fetchProjects();
+            await this.fetchCategories();
+            this.showSuccessMessage('Data refreshed!');
+        },
+
+        showSuccessMessage(message) {
+            this.successMessage = message;
+            setTimeout(() => {
+                this.successMessage = '';
+            }, 3000);
+        },
+
+        getStatusClass(status) {
+            const map = {
+                'Активен': 'active',
+                'В разработке': 'development',
+                'В тестировании': 'testing',
+                'Завершен': 'completed',
+                'Приостановлен': 'completed',
+                'Отменен': 'completed'
+            };
+            return map[status] || 'development';
+        }
+    },
+
+    mounted() {
+        // Check if already authenticated
+        this.restoreAuthToken();
+        if (this.authCredentials) {
+            this.isAuthenticated = true;
+            this.fetchProjects();
+            this.fetchCategories();
+        }
+    }
+}).mount('#app');
@@ -0,0 +1,213 @@
+const { createApp } = Vue;
+
+createApp({
+    data() {
+        return {
+            projects: [],
+            categories: [],
+            statuses: [],
+            categoryCounts: {},
+            statusCounts: {},
+            stats: null,
+            selectedCategory: 'All',
+            selectedStatus: 'All',
+            loading: true,
+            error: null,
+            metaRefreshTimer: null
+        }
+    },
+    computed: {
+        filteredProjects() {
+            let filtered = this.projects;
+
+            if (this.selectedCategory !== 'All') {
+                filtered = filtered.filter(project => 
+                    project.category === this.selectedCategory
+                );
+            }
+
+            if (this.selectedStatus !== 'All') {
+                filtered = filtered.filter(project => 
+                    project.status === this.selectedStatus
+                );
+            }
+
+            return filtered;
+        }
+    },
+    methods: {
+        async fetchBootstrap() {
+            try {
+                this.loading = true;
+                this.error = null;
+
+                // Первый экран одним запросом: проекты, категории, статусы, статистика
+                const response = await fetch('/api/bootstrap');
+
+                if (!response.ok) {
+                    throw new Error(`HTTP error! Status: ${response.status}`);
+                }
+
+                const data = await response.json();
+                this.projects = data.projects || [];
+                this.categories = data.categories || [];
+                this.statuses = data.statuses || [];
+                this.stats = data.stats;
+                this.applyFacets(data.facets);
+                this.loading = false;
+
+                await this.fetchRemainingProjects(data.next_cursor);
+
+            } catch (err) {
+                console.error('Error loading projects:', err);
+                this.error = 'Failed to load projects';
+            } finally {
+                this.loading = false;
+            }
+        },
+
+        async fetchRemainingProjects(cursor) {
+            // Остальные страницы догружаются по курсору в фоне
+            while (cursor) {
+                const response = await fetch(
+                    `/api/projects?cursor=${encodeURIComponent(cursor)}`
+                );
+
+                if (!response.ok) {
+                    throw new Error(`HTTP error! Status: ${response.status}`);
+                }
+
+                this.projects = this.projects.concat(await response.json());
+                cursor = response.headers.get('X-Next-Cursor');
+            }
+        },
+
+        subscribeToUpdates() {
+            if (!window.EventSource) return;
+
+            // Живые обновления: браузер сам переподключается и передает Last-Event-ID
+            const source = new EventSource('/api/events');
+            ['create', 'update', 'delete'].forEach(type => {
+                source.addEventListener(type, event => {
+                    this.applyProjectEvent(type, JSON.parse(event.data));
+                });
+            });
+            source.addEventListener('resync', () => this.fetchBootstrap());
+        },
+
+        applyProjectEvent(type, data) {
+            const index = this.projects.findIndex(project => project.id === data.id);
+
+            if (type === 'delete') {
+                if (index !== -1) this.projects.splice(index, 1);
+            } else if (data.project) {
+                if (index !== -1) {
+                    this.projects.splice(index, 1, data.project);
+                } else {
+                    this.projects.unshift(data.project);
+                }
+            }
+
+            this.scheduleMetaRefresh();
+        },
+
+        scheduleMetaRefresh() {
+            // Пачка событий — одно обновление категорий и статистики
+            clearTimeout(this.metaRefreshTimer);
+            this.metaRefreshTimer = setTimeout(() => this.refreshMeta(), 1000);
+        },
+
+        applyFacets(facets) {
+            if (!facets) return;
+            // Счетчики для бейджей фильтров без загрузки всех проектов
+            this.categories = facets.categories.map(facet => facet.value);
+            this.categoryCounts = Object.fromEntries(facets.categories.map(facet => [facet.value, facet.count]));
+            this.statusCounts = Object.fromEntries(facets.statuses.map(facet => [facet.value, facet.count]));
+        },
+
+        async refreshMeta() {
+            try {
+                const [facetsResponse, statsResponse] = await Promise.all([
+                    fetch('/api/facets'),
+                    fetch('/api/stats')
+                ]);
+                if (facetsResponse.ok) {
+                    this.applyFacets(await facetsResponse.json());
+                }
+                if (statsResponse.ok) {
+                    this.stats = await statsResponse.json();
+                }
+            } catch (err) {
+                console.error('Error refreshing stats:', err);
+            }
+        },
+
+        filterByCategory(category) {
+            this.selectedCategory = category;
+        },
+
+        filterByStatus(status) {
+            this.selectedStatus = status;
+        },
+
+        openLink(url) {
+            if (!url) return;
+
+            if (window.Telegram?.WebApp) {
+                window.Telegram.WebApp.openLink(url);
+            } else {
+                window.open(url, '_blank');
+            }
+        },
+
+        getStatusClass(status) {
+            const map = {
+                'Активен': 'active',
+                'В разработке': 'development',
+                'В тестировании': 'testing',
+                'Завершен': 'completed',
+                'Приостановлен': 'completed',
+                'Отменен': 'completed'
+            };
+            return map[status] || 'development';
+        },
+
+        getStatusName(status) {
+            const map = {
+                'Активен': 'Active',
+                'В разработке': 'In Development',
+                'В тестировании': 'Testing',
+                'Завершен': 'Completed',
+                'Приостановлен': 'Paused',
+                'Отменен': 'Cancelled'
+            };
+            return map[status] || status;
+        },
+
+        getLinkIcon(type) {
+            const icons = {
+                'whatsapp': '💬',
+                'telegram': '✈️',
+                'demo': '▶️',
+                'website': '🌐',
+                'api': '⚡',
+                'documentation': '📚',
+                'github': '💻'
+            };
+            return icons[type] || '🔗';
+        },
+
+        initTelegramWebApp() {
+            if (window.Telegram?.WebApp) {
+                const webApp = window.Telegram.WebApp;
+                webApp.ready();
+            }
+        }
+    },
+
+    async mounted() {
+        this.initTelegramWebApp();
+        await this.fetchBootstrap();
+        this.subscribeToUpdates();
+    }
+}).mount('#app');
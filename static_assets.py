@@ -0,0 +1,233 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+from datetime import datetime
+from typing import Dict, Optional
+
+from fastapi import Request, Response
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipResponder
+from dotenv import load_dotenv
+
+from versioning import http_date, is_not_modified
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+load_dotenv()
+
+# Настройки статических файлов и сжатия ответов
+STATIC_DIR = os.getenv("STATIC_DIR", "static")
+STATIC_MINIFY = os.getenv("STATIC_MINIFY", "true").lower() == "true"
+STATIC_COMPRESS_MIN_SIZE = int(os.getenv("STATIC_COMPRESS_MIN_SIZE", "512"))
+GZIP_MINIMUM_SIZE = int(os.getenv("GZIP_MINIMUM_SIZE", "1024"))
+GZIP_COMPRESS_LEVEL = int(os.getenv("GZIP_COMPRESS_LEVEL", "6"))
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+_MINIFIABLE = {".html", ".css", ".js", ".svg"}
+_HTML_COMMENT = re.compile(rb"<!--(?!\[if).*?-->", re.S)
+_PRESERVE_OPEN = re.compile(rb"<(pre|textarea)\b", re.I)
+_PRESERVE_CLOSE = re.compile(rb"</(pre|textarea)>", re.I)
+# Ссылки страниц на локальные файлы: src="/static/..." и href="/static/..."
+_ASSET_REFERENCE = re.compile(rb'(?P<quote>["\'])/static/(?P<path>[^"\'?#]+)(?P=quote)')
+
+def minify(content: bytes) -> bytes:
+    """Консервативная минификация: отступы, пустые строки и HTML-комментарии
+
+    Переводы строк сохраняются (JS без точек с запятой и // комментарии остаются
+    корректными); строки внутри <pre>, <textarea> и многострочных `...` не трогаются.
+    """
+    content = _HTML_COMMENT.sub(b"", content)
+    lines = []
+    preserve = False
+    in_template = False
+    for line in content.split(b"\n"):
+        if preserve or in_template:
+            lines.append(line)
+        else:
+            stripped = line.strip()
+            if stripped:
+                lines.append(stripped)
+        if _PRESERVE_OPEN.search(line) and not _PRESERVE_CLOSE.search(line):
+            preserve = True
+        elif _PRESERVE_CLOSE.search(line):
+            preserve = False
+        if line.count(b"`") % 2:
+            in_template = not in_template
+    return b"\n".join(lines)
+
+def _compress_variants(content: bytes) -> Dict[str, bytes]:
+    """Варианты тела по Content-Encoding; сжатые — только если они меньше"""
+    variants = {"identity": content}
+    if len(content) < STATIC_COMPRESS_MIN_SIZE:
+        return variants
+    compressed = gzip.compress(content, compresslevel=9, mtime=0)
+    if len(compressed) < len(content):
+        variants["gzip"] = compressed
+    if brotli is not None:
+        compressed = brotli.compress(content, quality=11)
+        if len(compressed) < len(content):
+            variants["br"] = compressed
+    return variants
+
+def _accepted_encodings(header: str) -> set:
+    accepted = set()
+    for part in header.split(","):
+        name, _, params = part.partition(";")
+        params = params.replace(" ", "")
+        try:
+            if params.startswith("q=") and float(params[2:] or 0) == 0:
+                continue
+        except ValueError:
+            continue
+        accepted.add(name.strip().lower())
+    return accepted
+
+class StaticAsset:
+    """Файл из static/, подготовленный при старте и хранящийся в памяти"""
+
+    __slots__ = ("path", "fingerprinted_path", "media_type", "etag", "modified", "variants")
+
+    def __init__(self, path: str, content: bytes, modified: datetime):
+        self.path = path
+        extension = os.path.splitext(path)[1].lower()
+        if STATIC_MINIFY and extension in _MINIFIABLE:
+            content = minify(content)
+        digest = hashlib.sha256(content).hexdigest()[:16]
+        stem, _ = os.path.splitext(path)
+        self.fingerprinted_path = f"{stem}.{digest}{extension}"
+        self.media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        self.etag = f'W/"{digest}"'
+        self.modified = modified
+        self.variants = _compress_variants(content)
+
+    def encoding_for(self, accept_encoding: str) -> str:
+        accepted = _accepted_encodings(accept_encoding)
+        for encoding in ("br", "gzip"):
+            if encoding in self.variants and encoding in accepted:
+                return encoding
+        return "identity"
+
+class AssetStore:
+    """Статические файлы в памяти: минифицированные, сжатые, с отпечатком содержимого"""
+
+    def __init__(self, directory: str = STATIC_DIR):
+        self.directory = directory
+        self._assets: Dict[str, StaticAsset] = {}
+        self._fingerprinted: Dict[str, StaticAsset] = {}
+        self.loaded = False
+
+    def load(self) -> None:
+        """Прочитать и подготовить все файлы каталога (один раз при старте)
+
+        Сначала готовятся стили и скрипты, затем страницы: ссылки /static/... в HTML
+        заменяются на url() с отпечатком, поэтому страница (no-cache) всегда указывает
+        на актуальные файлы, а сами файлы кэшируются браузером навсегда.
+        """
+        files = {}
+        for root, _, names in os.walk(self.directory):
+            for filename in names:
+                full_path = os.path.join(root, filename)
+                path = os.path.relpath(full_path, self.directory).replace(os.sep, "/")
+                with open(full_path, "rb") as f:
+                    content = f.read()
+                files[path] = (content, datetime.utcfromtimestamp(os.path.getmtime(full_path)))
+
+        pages = {path for path in files if path.endswith(".html")}
+        self._assets = {
+            path: StaticAsset(path, content, modified)
+            for path, (content, modified) in files.items() if path not in pages
+        }
+        self.loaded = True
+        for path in pages:
+            content, modified = files[path]
+            content = _ASSET_REFERENCE.sub(
+                lambda match: match["quote"] + self.url(match["path"].decode("utf8")).encode("utf8") + match["quote"],
+                content
+            )
+            self._assets[path] = StaticAsset(path, content, modified)
+        self._fingerprinted = {asset.fingerprinted_path: asset for asset in self._assets.values()}
+
+    def get(self, path: str) -> Optional[StaticAsset]:
+        if not self.loaded:
+            self.load()
+        return self._assets.get(path)
+
+    def get_fingerprinted(self, path: str) -> Optional[StaticAsset]:
+        if not self.loaded:
+            self.load()
+        return self._fingerprinted.get(path)
+
+    def url(self, path: str) -> str:
+        """URL с отпечатком для ссылок из страниц (кэшируется навсегда)"""
+        asset = self.get(path)
+        return f"/static/{asset.fingerprinted_path}" if asset else f"/static/{path}"
+
+    def stats(self) -> Dict:
+        return {
+            path: {name: len(body) for name, body in asset.variants.items()}
+            for path, asset in self._assets.items()
+        }
+
+asset_store = AssetStore()
+
+def asset_response(asset: StaticAsset, request: Request, cache_control: str) -> Response:
+    """Ответ с готовым вариантом тела по Accept-Encoding и поддержкой 304"""
+    headers = {
+        "ETag": asset.etag,
+        "Last-Modified": http_date(asset.modified),
+        "Cache-Control": cache_control,
+        "Vary": "Accept-Encoding"
+    }
+    if is_not_modified(
+        asset.etag,
+        asset.modified,
+        request.headers.get("if-none-match"),
+        request.headers.get("if-modified-since")
+    ):
+        return Response(status_code=304, headers=headers)
+
+    encoding = asset.encoding_for(request.headers.get("accept-encoding", ""))
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(content=asset.variants[encoding], media_type=asset.media_type, headers=headers)
+
+class _SizedGZipResponder(GZipResponder):
+    """Порог по Content-Length: через BaseHTTPMiddleware тело приходит частями"""
+
+    async def send_with_gzip(self, message):
+        await super().send_with_gzip(message)
+        if message["type"] == "http.response.start":
+            length = Headers(raw=message["headers"]).get("content-length")
+            if length is not None and int(length) < self.minimum_size:
+                # Маленький ответ передается без сжатия
+                self.content_encoding_set = True
+
+class ApiGZipMiddleware:
+    """GZip для ответов API крупнее порога; поток событий не сжимается (буферизация ломает SSE)"""
+
+    def __init__(self, app, minimum_size: int = GZIP_MINIMUM_SIZE, compresslevel: int = GZIP_COMPRESS_LEVEL,
+                 prefix: str = "/api/", skip_paths=("/api/events",)):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.compresslevel = compresslevel
+        self.prefix = prefix
+        self.skip_paths = set(skip_paths)
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] == "http"
+            and scope["path"].startswith(self.prefix)
+            and scope["path"] not in self.skip_paths
+            and "gzip" in Headers(scope=scope).get("accept-encoding", "")
+        ):
+            responder = _SizedGZipResponder(self.app, self.minimum_size, compresslevel=self.compresslevel)
+            await responder(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
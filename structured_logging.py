@@ -0,0 +1,193 @@
+import atexit
+import copy
+import logging
+import os
+import queue
+import re
+import sys
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+import orjson
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Настройки журналирования
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+# Частые информационные записи (extra={"sample": ключ}) пишутся одна из N
+LOG_SAMPLE_EVERY = int(os.getenv("LOG_SAMPLE_EVERY", "100"))
+
+REQUEST_ID_HEADER = "X-Request-ID"
+_REQUEST_ID_RE = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+# ID текущего запроса (задается RequestIdMiddleware, попадает в каждую запись журнала)
+request_id_var: ContextVar[str] = ContextVar("request_id", default="-")
+
+_UVICORN_LOGGERS = ("uvicorn", "uvicorn.error", "uvicorn.access")
+# Стандартные атрибуты LogRecord; все остальное пришло через extra и попадает в JSON
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "request_id"}
+
+_TRACEBACK_FORMATTER = logging.Formatter()
+
+class JsonFormatter(logging.Formatter):
+    """Одна JSON-строка на запись: время UTC, уровень, логгер, сообщение, ID запроса и поля extra"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", "-")
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_text:
+            payload["exception"] = record.exc_text
+        elif record.exc_info:
+            payload["exception"] = self.formatException(record.exc_info)
+        return orjson.dumps(payload, default=str).decode("utf8")
+
+class ContextFilter(logging.Filter):
+    """Проставить ID запроса в потоке, где сделана запись (поток журнала контекста не видит)"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+class SamplingFilter(logging.Filter):
+    """Пропускать одну из N записей с extra={"sample": ключ}; остальные записи не трогаются"""
+
+    def __init__(self, every: int = LOG_SAMPLE_EVERY):
+        super().__init__()
+        self.every = max(1, every)
+        self._counters: Dict[str, int] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        key = getattr(record, "sample", None)
+        if key is None:
+            return True
+        count = self._counters.get(key, 0)
+        self._counters[key] = count + 1
+        if count % self.every:
+            return False
+        record.sample_every = self.every
+        return True
+
+class NonBlockingQueueHandler(QueueHandler):
+    """QueueHandler, который при переполненной очереди отбрасывает запись вместо ожидания"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Сообщение и трассировка вычисляются сразу (аргументы могут измениться), оформление — в потоке записи
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _TRACEBACK_FORMATTER.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+class _LoggingState:
+    handler: Optional[NonBlockingQueueHandler] = None
+    listener: Optional[QueueListener] = None
+    output: Optional[logging.Handler] = None
+
+_state = _LoggingState()
+
+def _start_listener() -> None:
+    log_queue = queue.Queue(LOG_QUEUE_SIZE)
+    _state.handler.queue = log_queue
+    _state.listener = QueueListener(log_queue, _state.output, respect_handler_level=True)
+    _state.listener.start()
+
+def _restart_after_fork() -> None:
+    # Поток записи не переживает fork (воркеры gunicorn с preload_app): новая очередь и поток
+    if _state.listener is not None:
+        _start_listener()
+
+def _stop_listener() -> None:
+    if _state.listener is not None:
+        _state.listener.stop()
+
+def route_uvicorn_loggers(access_log: bool = True) -> None:
+    """Записи uvicorn через общую очередь (uvicorn и gunicorn ставят им свои синхронные обработчики)"""
+    for name in _UVICORN_LOGGERS:
+        uvicorn_logger = logging.getLogger(name)
+        uvicorn_logger.handlers = []
+        uvicorn_logger.propagate = name != "uvicorn.access" or access_log
+
+def setup_logging() -> None:
+    """Корневой логгер пишет в очередь; форматирование и вывод — в отдельном потоке"""
+    if _state.handler is not None:
+        return
+
+    _state.output = logging.StreamHandler(sys.stdout)
+    if LOG_FORMAT == "json":
+        _state.output.setFormatter(JsonFormatter())
+    else:
+        _state.output.setFormatter(logging.Formatter(
+            "%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s"
+        ))
+
+    _state.handler = NonBlockingQueueHandler(queue.Queue(LOG_QUEUE_SIZE))
+    _state.handler.addFilter(SamplingFilter())
+    _state.handler.addFilter(ContextFilter())
+
+    root = logging.getLogger()
+    root.handlers = [_state.handler]
+    root.setLevel(LOG_LEVEL)
+    route_uvicorn_loggers()
+
+    _start_listener()
+    os.register_at_fork(after_in_child=_restart_after_fork)
+    atexit.register(_stop_listener)
+
+class RequestIdMiddleware:
+    """ASGI middleware: ID запроса из X-Request-ID (или новый) в contextvars и в заголовок ответа"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")
+                break
+        if request_id is None or not _REQUEST_ID_RE.match(request_id):
+            request_id = uuid.uuid4().hex
+
+        token = request_id_var.set(request_id)
+
+        async def send_with_request_id(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-request-id", request_id.encode("latin-1"))
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            request_id_var.reset(token)
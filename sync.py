@@ -0,0 +1,118 @@
+import base64
+import json
+import os
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo import ASCENDING, IndexModel, ReplaceOne
+from dotenv import load_dotenv
+
+from versioning import META_COLLECTION
+
+load_dotenv()
+
+# Отметки об удалении: {_id: id проекта, deleted_at}; удаляются TTL-индексом
+TOMBSTONES_COLLECTION = "catalogue_tombstones"
+TOMBSTONE_TTL_SECONDS = int(os.getenv("TOMBSTONE_TTL_SECONDS", str(30 * 24 * 3600)))
+
+SYNC_DEFAULT_LIMIT = 500
+SYNC_MAX_LIMIT = 1000
+# Записи последних секунд могут быть еще не видны (часы разных процессов, незавершенные запросы),
+# поэтому токен не продвигается дальше этого окна и такие документы приходят повторно
+SYNC_SAFETY_SECONDS = float(os.getenv("SYNC_SAFETY_SECONDS", "5"))
+
+# Порядок выдачи изменений (совпадает с индексами)
+CHANGES_SORT = [("updated_at", ASCENDING), ("_id", ASCENDING)]
+TOMBSTONES_SORT = [("deleted_at", ASCENDING), ("_id", ASCENDING)]
+
+TOMBSTONE_INDEXES = [
+    IndexModel([("deleted_at", ASCENDING)], name="deleted_at_ttl", expireAfterSeconds=TOMBSTONE_TTL_SECONDS),
+    IndexModel(TOMBSTONES_SORT, name="deleted_at_order")
+]
+
+# Позиция в потоке изменений: (время, id последнего выданного документа или None)
+Position = Tuple[datetime, Optional[ObjectId]]
+
+def _meta_id(collection_name: str) -> str:
+    return f"sync:{collection_name}"
+
+def _epoch_value(epoch: Optional[datetime]) -> Optional[str]:
+    return epoch.isoformat() if epoch is not None else None
+
+def _encode_position(position: Position) -> list:
+    timestamp, last_id = position
+    return [timestamp.isoformat(), str(last_id) if last_id is not None else None]
+
+def _decode_position(value: list) -> Position:
+    timestamp, last_id = value
+    return datetime.fromisoformat(timestamp), ObjectId(last_id) if last_id is not None else None
+
+def encode_sync_token(epoch: Optional[datetime], projects: Position, tombstones: Position) -> str:
+    """Непрозрачный токен синхронизации: эпоха каталога и позиции в проектах и отметках удаления"""
+    payload = {
+        "e": _epoch_value(epoch),
+        "p": _encode_position(projects),
+        "d": _encode_position(tombstones)
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_sync_token(token: str) -> Tuple[Optional[str], Position, Position]:
+    """Разобрать токен, выданный encode_sync_token"""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return payload["e"], _decode_position(payload["p"]), _decode_position(payload["d"])
+    except (ValueError, KeyError, TypeError, InvalidId) as e:
+        raise ValueError("Invalid sync token") from e
+
+def after_position(field: str, position: Optional[Position]) -> Dict:
+    """Условие: документы строго после позиции в порядке (field, _id)"""
+    if position is None:
+        return {}
+    timestamp, last_id = position
+    if last_id is None:
+        return {field: {"$gt": timestamp}}
+    return {
+        "$or": [
+            {field: {"$gt": timestamp}},
+            {field: timestamp, "_id": {"$gt": last_id}}
+        ]
+    }
+
+def safe_position(now: datetime) -> Position:
+    """Самая поздняя позиция, на которой можно остановить токен (MongoDB хранит миллисекунды)"""
+    horizon = now - timedelta(seconds=SYNC_SAFETY_SECONDS)
+    return horizon.replace(microsecond=horizon.microsecond // 1000 * 1000), None
+
+def tombstones_expired(position: Position, now: datetime) -> bool:
+    """Отметки после позиции могли быть уже удалены TTL-индексом"""
+    return position[0] < now - timedelta(seconds=TOMBSTONE_TTL_SECONDS)
+
+async def record_tombstones(db, project_ids: List[ObjectId]) -> None:
+    """Отметить удаленные проекты (одна пакетная операция)"""
+    if not project_ids:
+        return
+    deleted_at = datetime.utcnow()
+    await db[TOMBSTONES_COLLECTION].bulk_write(
+        [ReplaceOne({"_id": project_id}, {"deleted_at": deleted_at}, upsert=True) for project_id in project_ids],
+        ordered=False
+    )
+
+async def get_sync_epoch(db, collection_name: str) -> Optional[datetime]:
+    """Время последнего массового изменения каталога (токены до него требуют полной синхронизации)"""
+    meta = await db[META_COLLECTION].find_one({"_id": _meta_id(collection_name)})
+    return meta.get("reset_at") if meta is not None else None
+
+async def reset_sync_epoch(db, collection_name: str) -> None:
+    """Начать новую эпоху: импорт мог записать документы с прежними updated_at"""
+    await db[META_COLLECTION].update_one(
+        {"_id": _meta_id(collection_name)},
+        {"$set": {"reset_at": datetime.utcnow()}},
+        upsert=True
+    )
+
+def epoch_matches(token_epoch: Optional[str], epoch: Optional[datetime]) -> bool:
+    return token_epoch == _epoch_value(epoch)
@@ -0,0 +1,55 @@
+"""Общие настройки тестов: конфигурация окружения до импорта модулей приложения
+
+Запуск из корня репозитория:
+    pip install -r tests/requirements.txt
+    python -m pytest -q
+"""
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# main.py читает конфигурацию при импорте
+os.environ.setdefault("PORT", "6565")
+os.environ.setdefault("ADMIN_USERNAME", "admin")
+os.environ.setdefault("ADMIN_PASSWORD", "admin")
+os.environ.setdefault("AUTH_TOKEN_SECRET", "test")
+os.environ.setdefault("DATABASE_NAME", "test")
+
+@pytest.fixture
+def api(monkeypatch):
+    """Запуск сценария с HTTP-клиентом приложения поверх mongomock (lifespan не выполняется)"""
+    import httpx
+    from mongomock_motor import AsyncMongoMockClient
+
+    import database
+    import main
+    from versioning import invalidate_cached_version
+
+    monkeypatch.setattr(main.rate_limiter, "enabled", False)
+
+    def run(scenario):
+        async def wrapper():
+            client = AsyncMongoMockClient()
+            main.db_client = database.db.client = client
+            main.db = database.db.database = client[os.environ["DATABASE_NAME"]]
+            main.catalogue_cache.clear()
+            invalidate_cached_version()
+            transport = httpx.ASGITransport(app=main.app)
+            async with httpx.AsyncClient(
+                transport=transport,
+                base_url="http://test",
+                auth=(main.ADMIN_USERNAME, main.ADMIN_PASSWORD)
+            ) as http:
+                await scenario(http)
+
+        try:
+            asyncio.run(wrapper())
+        finally:
+            main.db_client = database.db.client = None
+            main.db = database.db.database = None
+
+    return run
@@ -0,0 +1,19 @@
+from auth import AdminAuthenticator
+
+def test_token_round_trip_and_tampering():
+    authenticator = AdminAuthenticator("admin", "admin", secret="test")
+    token, _ = authenticator.issue_token("admin")
+    assert authenticator.verify_token(token) == "admin"
+
+    payload, _, signature = token.partition(".")
+    assert authenticator.verify_token(f"{payload}.{signature[:-1]}x") is None
+    assert AdminAuthenticator("admin", "admin", secret="other").verify_token(token) is None
+    # Не-ASCII символы в подписи — недействительный токен, а не исключение
+    assert authenticator.verify_token(f"{payload}.d\xe9f") is None
+
+def test_non_ascii_bearer_token_is_rejected(api):
+    async def scenario(http):
+        response = await http.get("/api/cache/stats", headers={"Authorization": b"Bearer abc.d\xe9f"}, auth=None)
+        assert response.status_code == 401
+
+    api(scenario)
@@ -0,0 +1,70 @@
+PROJECT = {
+    "name": "Ассистент",
+    "project_description": "Описание тестового проекта",
+    "links": [{"name": "Telegram", "url": "https://t.me/test_bot"}],
+    "status": "Активен",
+    "features": ["Запись"],
+    "category": "Тест"
+}
+
+MISSING_ID = "0123456789abcdef01234567"
+
+async def category_counts(http):
+    return {row["value"]: row["count"] for row in (await http.get("/api/facets")).json()["categories"]}
+
+def test_ordered_stops_at_first_failure(api):
+    async def scenario(http):
+        project_id = (await http.post("/api/projects", json=PROJECT)).json()["id"]
+
+        response = await http.post("/api/projects/bulk", json={"operations": [
+            {"op": "create", "data": dict(PROJECT, name="Первый")},
+            {"op": "create", "data": dict(PROJECT, name="Второй")},
+            {"op": "update", "id": project_id, "data": dict(PROJECT, category="Другое")},
+            {"op": "delete", "id": MISSING_ID},
+            {"op": "create", "data": dict(PROJECT, name="Не выполнится")}
+        ]})
+        assert response.status_code == 200, response.text
+        body = response.json()
+        assert [r["status"] for r in body["results"]] == ["ok", "ok", "ok", "error", "skipped"]
+        assert body["results"][3]["error"] == "Project not found"
+        assert (body["inserted"], body["updated"], body["deleted"], body["errors"]) == (2, 1, 0, 1)
+        assert all(r["id"] for r in body["results"][:3])
+
+        assert len((await http.get("/api/projects")).json()) == 3
+        assert await category_counts(http) == {"Тест": 2, "Другое": 1}
+
+    api(scenario)
+
+def test_unordered_reports_each_item(api):
+    async def scenario(http):
+        first = (await http.post("/api/projects", json=PROJECT)).json()["id"]
+        second = (await http.post("/api/projects", json=PROJECT)).json()["id"]
+
+        response = await http.post("/api/projects/bulk", json={"ordered": False, "operations": [
+            {"op": "delete", "id": MISSING_ID},
+            {"op": "create", "data": {"name": "Без описания"}},
+            {"op": "delete", "id": first},
+            {"op": "update", "id": second, "data": dict(PROJECT, category="Другое")},
+            {"op": "create", "data": dict(PROJECT, name="Новый")}
+        ]})
+        body = response.json()
+        assert [r["status"] for r in body["results"]] == ["error", "error", "ok", "ok", "ok"]
+        assert (body["inserted"], body["updated"], body["deleted"], body["errors"]) == (1, 1, 1, 2)
+        assert await category_counts(http) == {"Тест": 1, "Другое": 1}
+
+    api(scenario)
+
+def test_already_deleted_project_is_not_counted_again(api):
+    async def scenario(http):
+        project_id = (await http.post("/api/projects", json=PROJECT)).json()["id"]
+        await http.post("/api/projects", json=PROJECT)
+
+        # Проект удален другим запросом раньше, чем до него дошел пакет
+        assert (await http.delete(f"/api/projects/{project_id}")).status_code == 200
+        body = (await http.post("/api/projects/bulk", json={"operations": [
+            {"op": "delete", "id": project_id}
+        ]})).json()
+        assert body["deleted"] == 0 and body["results"][0]["status"] == "error"
+        assert await category_counts(http) == {"Тест": 1}
+
+    api(scenario)
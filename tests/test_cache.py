@@ -0,0 +1,63 @@
+import asyncio
+
+import main
+from cache import TTLCache
+
+PROJECT = {
+    "name": "Старое имя",
+    "project_description": "Описание тестового проекта",
+    "links": [{"name": "Telegram", "url": "https://t.me/test_bot"}],
+    "status": "Активен",
+    "features": ["Запись"],
+    "category": "Тест"
+}
+
+class GatedCursor:
+    """Курсор, который отдает документы только после открытия шлюза"""
+
+    def __init__(self, cursor, gate: asyncio.Event, started: asyncio.Event):
+        self.cursor = cursor
+        self.gate = gate
+        self.started = started
+
+    async def to_list(self, length):
+        docs = await self.cursor.to_list(length=length)
+        self.started.set()
+        await self.gate.wait()
+        return docs
+
+def test_set_after_invalidation_is_discarded():
+    cache = TTLCache()
+    generation = cache.generation
+    cache.invalidate(("stats",))
+    cache.set(("stats",), "stale", generation)
+    assert cache.get(("stats",)) == (False, None)
+    assert cache.discarded == 1
+
+    cache.set(("stats",), "fresh", cache.generation)
+    assert cache.get(("stats",)) == (True, "fresh")
+
+def test_read_in_flight_during_write_is_not_cached(api, monkeypatch):
+    gate, started = asyncio.Event(), asyncio.Event()
+    find_page = main._projects_page_find
+
+    def slow_find(*args):
+        if gate.is_set():
+            return find_page(*args)
+        return GatedCursor(find_page(*args), gate, started)
+
+    async def scenario(http):
+        project = (await http.post("/api/projects", json=PROJECT)).json()
+        monkeypatch.setattr(main, "_projects_page_find", slow_find)
+
+        # Чтение прочитало старый документ и ждет; запись завершается раньше
+        slow_read = asyncio.create_task(http.get("/api/projects"))
+        await started.wait()
+        response = await http.put(f"/api/projects/{project['id']}", json=dict(PROJECT, name="Новое имя"))
+        assert response.status_code == 200, response.text
+        gate.set()
+        assert (await slow_read).json()[0]["name"] == "Старое имя"
+
+        assert (await http.get("/api/projects")).json()[0]["name"] == "Новое имя"
+
+    api(scenario)
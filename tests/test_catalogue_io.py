@@ -0,0 +1,47 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+import main
+
+def make_projects():
+    started = datetime(2024, 1, 1)
+    return [
+        {
+            "name": f"Проект {i}",
+            "project_description": f"Описание проекта номер {i}",
+            "links": [{"name": "Сайт", "url": f"https://example.com/{i}", "type": "website"}],
+            "is_project_completed": i % 2 == 0,
+            "status": "Активен",
+            "features": ["Запись"],
+            "category": "Тест",
+            "rating": [4.5, None, 3.0][i % 3],
+            "created_at": started + timedelta(minutes=i),
+            "updated_at": started + timedelta(minutes=i),
+            "version": i + 1
+        }
+        for i in range(6)
+    ]
+
+@pytest.mark.parametrize("export_format", ["ndjson", "csv"])
+def test_export_import_round_trip_keeps_ratings(api, export_format):
+    async def scenario(http):
+        collection = main.db[main.COLLECTION_NAME]
+        await collection.insert_many(make_projects())
+        before = (await http.get("/api/projects")).json()
+        average = (await http.get("/api/stats")).json()["average_rating"]
+        assert average == 3.75
+
+        exported = await http.get("/api/projects/export", params={"format": export_format})
+        assert exported.status_code == 200
+        await collection.delete_many({})
+
+        response = await http.post(
+            "/api/projects/import", params={"format": export_format}, content=exported.content
+        )
+        assert response.json()["imported"] == 6 and response.json()["error_count"] == 0, response.json()
+
+        assert (await http.get("/api/projects")).json() == before
+        assert (await http.get("/api/stats")).json()["average_rating"] == average
+
+    api(scenario)
@@ -0,0 +1,36 @@
+import asyncio
+from datetime import datetime
+
+import main
+from columnar import ColumnarCatalogue
+from versioning import bump_catalogue_version
+
+PROJECT = {
+    "name": "Первый",
+    "project_description": "Описание тестового проекта",
+    "links": [{"name": "Telegram", "url": "https://t.me/test_bot"}],
+    "status": "Активен",
+    "features": ["Запись"],
+    "category": "Тест"
+}
+
+def test_snapshot_catches_up_with_writes_missed_by_the_feed(api, monkeypatch):
+    monkeypatch.setattr(main, "CATALOGUE_BACKEND", "columnar")
+    monkeypatch.setattr(main, "columnar_catalogue", ColumnarCatalogue())
+
+    async def scenario(http):
+        await http.post("/api/projects", json=PROJECT)
+        assert [p["name"] for p in (await http.get("/api/projects")).json()] == ["Первый"]
+
+        # Запись другого процесса, событие о которой не пришло
+        now = datetime.utcnow()
+        await main.db[main.COLLECTION_NAME].insert_one(dict(PROJECT, name="Второй", created_at=now, updated_at=now))
+        await bump_catalogue_version(main.db, main.COLLECTION_NAME)
+        assert [p["name"] for p in (await http.get("/api/projects")).json()] == ["Первый"]
+
+        monkeypatch.setattr(main, "COLUMNAR_REFRESH_SECONDS", 0)
+        await http.get("/api/projects")
+        await main._columnar_refresh
+        assert [p["name"] for p in (await http.get("/api/projects")).json()] == ["Второй", "Первый"]
+
+    api(scenario)
@@ -0,0 +1,156 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from mongomock_motor import AsyncMongoMockClient
+from pymongo.errors import AutoReconnect
+
+import events
+from sync import get_sync_epoch, reset_sync_epoch
+
+class FlakyCollection:
+    """Коллекция, у которой один вызов find (по номеру) завершается сбоем сети"""
+
+    def __init__(self, collection, fail_on_call: int):
+        self.collection = collection
+        self.fail_on_call = fail_on_call
+        self.calls = 0
+
+    def find(self, *args, **kwargs):
+        self.calls += 1
+        if self.calls == self.fail_on_call:
+            raise AutoReconnect("AutoReconnect blip")
+        return self.collection.find(*args, **kwargs)
+
+def test_polling_survives_transient_failure(monkeypatch):
+    monkeypatch.setattr(events, "EVENTS_POLL_INTERVAL_SECONDS", 0.01)
+
+    async def scenario():
+        collection = AsyncMongoMockClient()["test"]["projects"]
+        started = datetime.utcnow() - timedelta(minutes=1)
+        await collection.insert_one({"name": "old", "created_at": started, "updated_at": started})
+
+        # Вызовы 1–2 — начальная позиция, 3 — первый проход опроса
+        flaky = FlakyCollection(collection, fail_on_call=3)
+        received = []
+        task = asyncio.create_task(
+            events.run_feed(flaky, lambda event_type, project_id, project: received.append(project["name"]))
+        )
+        try:
+            await asyncio.sleep(0.05)
+            assert flaky.calls >= 3
+            now = datetime.utcnow()
+            await collection.insert_one({"name": "new", "created_at": now, "updated_at": now})
+            for _ in range(100):
+                if received:
+                    break
+                await asyncio.sleep(0.01)
+            assert not task.done()
+            assert received == ["new"]
+        finally:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(scenario())
+
+def test_polling_delivers_deletes_from_other_processes(monkeypatch):
+    monkeypatch.setattr(events, "EVENTS_POLL_INTERVAL_SECONDS", 0.01)
+
+    async def scenario():
+        database = AsyncMongoMockClient()["test"]
+        collection, tombstones = database["projects"], database["catalogue_tombstones"]
+        project_id = (await collection.insert_one(
+            {"name": "old", "created_at": datetime.utcnow(), "updated_at": datetime.utcnow()}
+        )).inserted_id
+
+        received = []
+        task = asyncio.create_task(events.run_feed(
+            collection,
+            lambda event_type, changed_id, project: received.append((event_type, changed_id)),
+            tombstones
+        ))
+        try:
+            await asyncio.sleep(0.05)
+            # Удаление, выполненное другим воркером: документ и отметка об удалении
+            await collection.delete_one({"_id": project_id})
+            await tombstones.insert_one({"_id": project_id, "deleted_at": datetime.utcnow()})
+            for _ in range(100):
+                if received:
+                    break
+                await asyncio.sleep(0.01)
+            assert received == [("delete", str(project_id))]
+        finally:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(scenario())
+
+def test_polling_delivers_writes_committed_out_of_order():
+    async def scenario():
+        collection = AsyncMongoMockClient()["test"]["projects"]
+        position = await events._poll_start(collection, "updated_at")
+
+        # A проставил t1 раньше, но B с t2 > t1 записан первым
+        t1 = datetime.utcnow().replace(microsecond=0)
+        t2 = t1 + timedelta(seconds=1)
+        await collection.insert_one({"name": "B", "created_at": t2, "updated_at": t2})
+        docs, position = await events._poll_once(collection, "updated_at", {"name": 1, "updated_at": 1}, position)
+        assert [doc["name"] for doc in docs] == ["B"]
+
+        await collection.insert_one({"name": "A", "created_at": t1, "updated_at": t1})
+        docs, position = await events._poll_once(collection, "updated_at", {"name": 1, "updated_at": 1}, position)
+        assert [doc["name"] for doc in docs] == ["A"]
+
+        # Повторный проход ничего не досылает, обновление того же документа — новое событие
+        docs, position = await events._poll_once(collection, "updated_at", {"name": 1, "updated_at": 1}, position)
+        assert docs == []
+        await collection.update_one({"name": "A"}, {"$set": {"updated_at": t2}})
+        docs, position = await events._poll_once(collection, "updated_at", {"name": 1, "updated_at": 1}, position)
+        assert [doc["name"] for doc in docs] == ["A"]
+
+    asyncio.run(scenario())
+
+def test_epoch_change_resets_every_process(monkeypatch):
+    monkeypatch.setattr(events, "EVENTS_POLL_INTERVAL_SECONDS", 0.01)
+
+    async def scenario():
+        database = AsyncMongoMockClient()["test"]
+        resets = []
+        task = asyncio.create_task(
+            events.watch_resets(lambda: get_sync_epoch(database, "projects"), lambda: resets.append(True))
+        )
+        try:
+            await asyncio.sleep(0.05)
+            assert resets == []
+            # Импорт в другом процессе начинает новую эпоху
+            await reset_sync_epoch(database, "projects")
+            for _ in range(100):
+                if resets:
+                    break
+                await asyncio.sleep(0.01)
+            assert resets == [True]
+        finally:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(scenario())
+
+def test_last_event_id_from_another_process_gets_resync():
+    async def scenario():
+        broker, other = events.EventBroker(), events.EventBroker()
+        broker.publish("create", "a")
+        queue = broker.subscribe()
+        broker.publish("update", "a")
+        last_id = queue.get_nowait()["id"]
+        broker.publish("delete", "a")
+
+        # Переподключение к тому же процессу: досылаются пропущенные события
+        replay = broker.subscribe(last_id)
+        assert replay.get_nowait()["type"] == "delete" and replay.empty()
+
+        # Тот же номер из другого процесса не сравнивается с нашей последовательностью
+        other.publish("create", "b")
+        foreign = broker.subscribe(other._event_id(1))
+        assert foreign.get_nowait()["type"] == "resync" and foreign.empty()
+        assert events.format_sse(broker._resync_event()).startswith(f"id: {broker.boot_id}-3\n".encode())
+
+    asyncio.run(scenario())
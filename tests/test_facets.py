@@ -0,0 +1,29 @@
+import asyncio
+
+from mongomock_motor import AsyncMongoMockClient
+
+from facets import FACETS_COLLECTION, load_facets, rebuild_facets
+
+def test_rebuild_replaces_counts_in_place():
+    async def scenario():
+        db = AsyncMongoMockClient()["test"]
+        await db["projects"].insert_many([
+            {"status": "Активен", "category": "Продажи"},
+            {"status": "Активен", "category": "Недвижимость"},
+            {"status": "Пауза", "category": "Продажи"}
+        ])
+        # Устаревшие счетчики: неверное значение и категория, которой больше нет
+        await db[FACETS_COLLECTION].insert_many([
+            {"_id": {"field": "status", "value": "Активен"}, "count": 7},
+            {"_id": {"field": "category", "value": "Удаленная"}, "count": 2}
+        ])
+
+        await asyncio.gather(rebuild_facets(db, "projects"), rebuild_facets(db, "projects"))
+
+        assert await load_facets(db, "projects") == {
+            "status": {"Активен": 2, "Пауза": 1},
+            "category": {"Продажи": 2, "Недвижимость": 1}
+        }
+        assert await db[FACETS_COLLECTION].count_documents({}) == 4
+
+    asyncio.run(scenario())
@@ -0,0 +1,70 @@
+PROJECT = {
+    "name": "Ассистент",
+    "project_description": "Описание тестового проекта",
+    "links": [{"name": "Telegram", "url": "https://t.me/test_bot"}],
+    "status": "Активен",
+    "features": ["Запись"],
+    "category": "Тест"
+}
+
+def test_get_etag_is_accepted_by_patch(api):
+    async def scenario(http):
+        project_id = (await http.post("/api/projects", json=PROJECT)).json()["id"]
+
+        response = await http.get(f"/api/projects/{project_id}")
+        assert response.status_code == 200
+        etag = response.headers["etag"]
+        assert etag == '"1"'
+
+        response = await http.patch(
+            f"/api/projects/{project_id}",
+            json={"$set": {"category": "Другое"}},
+            headers={"If-Match": etag}
+        )
+        assert response.status_code == 200, response.text
+        assert response.headers["etag"] == '"2"'
+
+        # Устаревшая версия отклоняется, новая совпадает с ETag ответа GET
+        response = await http.patch(f"/api/projects/{project_id}", json={"$set": {"category": "Третье"}}, headers={"If-Match": etag})
+        assert response.status_code == 412
+        response = await http.get(f"/api/projects/{project_id}")
+        assert response.headers["etag"] == '"2"' and response.json()["category"] == "Другое"
+        response = await http.get(f"/api/projects/{project_id}", headers={"If-None-Match": '"2"'})
+        assert response.status_code == 304
+
+    api(scenario)
+
+def test_add_to_set_matches_existing_link(api):
+    async def scenario(http):
+        project_id = (await http.post("/api/projects", json=PROJECT)).json()["id"]
+
+        response = await http.patch(f"/api/projects/{project_id}", json={"$addToSet": {"links": PROJECT["links"]}})
+        assert response.status_code == 200, response.text
+        assert len(response.json()["links"]) == 1
+        stored = (await http.get(f"/api/projects/{project_id}")).json()
+        assert stored["links"] == [{"name": "Telegram", "url": "https://t.me/test_bot", "type": None}]
+
+    api(scenario)
+
+def test_if_match_uses_strong_comparison_over_a_list(api):
+    async def scenario(http):
+        project_id = (await http.post("/api/projects", json=PROJECT)).json()["id"]
+        url = f"/api/projects/{project_id}"
+
+        # Слабый тег и несовпадающий список — 412, а не ошибка клиента
+        for if_match in ('W/"1"', '"7", "8"', '"abc"'):
+            response = await http.patch(url, json={"$set": {"category": "Другое"}}, headers={"If-Match": if_match})
+            assert response.status_code == 412, (if_match, response.text)
+
+        response = await http.patch(url, json={"$set": {"category": "Другое"}}, headers={"If-Match": '"7", "1"'})
+        assert response.status_code == 200, response.text
+        assert response.headers["etag"] == '"2"'
+        response = await http.patch(url, json={"$set": {"category": "Третье"}}, headers={"If-Match": "*"})
+        assert response.status_code == 200
+
+        response = await http.patch(
+            "/api/projects/0123456789abcdef01234567", json={"$set": {"category": "Другое"}}, headers={"If-Match": 'W/"1"'}
+        )
+        assert response.status_code == 404
+
+    api(scenario)
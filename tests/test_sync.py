@@ -0,0 +1,134 @@
+from datetime import datetime, timedelta
+
+import pytest
+from bson import ObjectId
+
+import main
+from sync import (
+    SYNC_SAFETY_SECONDS,
+    TOMBSTONE_TTL_SECONDS,
+    decode_sync_token,
+    encode_sync_token,
+    get_sync_epoch,
+    reset_sync_epoch
+)
+
+PROJECT = {
+    "name": "Ассистент",
+    "project_description": "Описание тестового проекта",
+    "links": [{"name": "Telegram", "url": "https://t.me/test_bot"}],
+    "status": "Активен",
+    "features": ["Запись"],
+    "category": "Тест"
+}
+
+def stored(name: str, age_seconds: float) -> dict:
+    """Документ, записанный age_seconds назад (с точностью MongoDB до миллисекунд)"""
+    stamp = datetime.utcnow() - timedelta(seconds=age_seconds)
+    stamp = stamp.replace(microsecond=stamp.microsecond // 1000 * 1000)
+    return dict(PROJECT, name=name, created_at=stamp, updated_at=stamp, version=1)
+
+async def changes(http, token=None, **params):
+    if token is not None:
+        params["since"] = token
+    response = await http.get("/api/projects/changes", params=params)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+def test_token_round_trip():
+    epoch = datetime(2024, 5, 1, 12, 30)
+    projects = (datetime(2024, 5, 2, 8, 0, 0, 123000), ObjectId())
+    tombstones = (datetime(2024, 5, 2, 9, 0), None)
+    assert decode_sync_token(encode_sync_token(epoch, projects, tombstones)) == (epoch.isoformat(), projects, tombstones)
+    assert decode_sync_token(encode_sync_token(None, projects, tombstones))[0] is None
+    with pytest.raises(ValueError):
+        decode_sync_token("not-a-token")
+
+def test_invalid_token_is_rejected(api):
+    async def scenario(http):
+        response = await http.get("/api/projects/changes", params={"since": "not-a-token"})
+        assert response.status_code == 400
+
+    api(scenario)
+
+def test_incremental_sync_pages_and_stops(api):
+    async def scenario(http):
+        await main.db[main.COLLECTION_NAME].insert_many([stored(f"P{i}", 60 - i) for i in range(3)])
+
+        first = await changes(http, limit=2)
+        assert first["reset"] and first["has_more"]
+        assert [p["name"] for p in first["projects"]] == ["P0", "P1"]
+
+        second = await changes(http, first["next_token"], limit=2)
+        assert not second["reset"] and not second["has_more"]
+        assert [p["name"] for p in second["projects"]] == ["P2"]
+
+        # Изменений нет: тот же токен, чтобы повторный запрос мог получить 304
+        idle = await changes(http, second["next_token"])
+        assert idle["projects"] == [] and idle["deleted"] == []
+        assert idle["next_token"] == second["next_token"]
+
+    api(scenario)
+
+def test_writes_inside_safety_window_are_delivered_again(api):
+    async def scenario(http):
+        collection = main.db[main.COLLECTION_NAME]
+        await collection.insert_one(stored("Старый", 60))
+        token = (await changes(http))["next_token"]
+
+        # Записи внутри окна: свежая и «опоздавшая» (время проставлено раньше, чем она стала видна)
+        await collection.insert_one(stored("Свежий", 0))
+        await collection.insert_one(stored("Опоздавший", SYNC_SAFETY_SECONDS / 2))
+        delivered = await changes(http, token)
+        assert sorted(p["name"] for p in delivered["projects"]) == ["Опоздавший", "Свежий"]
+
+        # Позиция не заходит в окно: те же документы приходят повторно, клиент применяет их по id
+        again = await changes(http, delivered["next_token"])
+        assert sorted(p["name"] for p in again["projects"]) == ["Опоздавший", "Свежий"]
+
+    api(scenario)
+
+def test_deletes_are_delivered_as_tombstones(api):
+    async def scenario(http):
+        project_id = (await http.post("/api/projects", json=PROJECT)).json()["id"]
+        token = (await changes(http))["next_token"]
+
+        assert (await http.delete(f"/api/projects/{project_id}")).status_code == 200
+        delivered = await changes(http, token)
+        assert not delivered["reset"]
+        assert delivered["deleted"] == [project_id]
+        assert delivered["projects"] == []
+
+    api(scenario)
+
+def test_epoch_change_forces_full_sync(api):
+    async def scenario(http):
+        await main.db[main.COLLECTION_NAME].insert_one(stored("Старый", 60))
+        token = (await changes(http))["next_token"]
+        assert not (await changes(http, token))["reset"]
+
+        # Импорт начинает новую эпоху: старые токены требуют полной синхронизации
+        await reset_sync_epoch(main.db, main.COLLECTION_NAME)
+        after_reset = await changes(http, token)
+        assert after_reset["reset"]
+        assert [p["name"] for p in after_reset["projects"]] == ["Старый"]
+        assert not (await changes(http, after_reset["next_token"]))["reset"]
+
+    api(scenario)
+
+def test_token_older_than_tombstone_ttl_forces_full_sync(api):
+    async def scenario(http):
+        await main.db[main.COLLECTION_NAME].insert_one(stored("Старый", 60))
+        await reset_sync_epoch(main.db, main.COLLECTION_NAME)
+        epoch = await get_sync_epoch(main.db, main.COLLECTION_NAME)
+
+        # Отметки об удалении после такой позиции могли быть уже удалены TTL-индексом
+        expired = datetime.utcnow() - timedelta(seconds=TOMBSTONE_TTL_SECONDS + 60)
+        token = encode_sync_token(epoch, (expired, None), (expired, None))
+        assert (await changes(http, token))["reset"]
+
+        recent = datetime.utcnow() - timedelta(seconds=TOMBSTONE_TTL_SECONDS - 60)
+        token = encode_sync_token(epoch, (recent, None), (recent, None))
+        assert not (await changes(http, token))["reset"]
+
+    api(scenario)
@@ -0,0 +1,99 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional, Tuple
+
+from cache import catalogue_cache
+
+# Коллекция со служебными документами каталога
+META_COLLECTION = "catalogue_meta"
+
+_VERSION_KEY = ("version",)
+
+
+async def get_catalogue_version(db, collection_name: str) -> Tuple[int, datetime]:
+    """Текущая версия коллекции: (счетчик записей, время последнего изменения)"""
+    generation = catalogue_cache.generation
+    hit, cached = catalogue_cache.get(_VERSION_KEY)
+    if hit:
+        return cached
+
+    meta = await db[META_COLLECTION].find_one({"_id": collection_name})
+    if meta is None:
+        # Первый запуск: берем максимальный updated_at из самой коллекции
+        latest = await (
+            db[collection_name]
+            .find({}, {"updated_at": 1})
+            .sort("updated_at", -1)
+            .limit(1)
+            .to_list(length=1)
+        )
+        updated_at = latest[0]["updated_at"] if latest else datetime.utcnow()
+        await db[META_COLLECTION].update_one(
+            {"_id": collection_name},
+            {"$setOnInsert": {"version": 0, "updated_at": updated_at}},
+            upsert=True
+        )
+        meta = await db[META_COLLECTION].find_one({"_id": collection_name})
+
+    version = (meta["version"], meta["updated_at"])
+    catalogue_cache.set(_VERSION_KEY, version, generation)
+    return version
+
+
+async def bump_catalogue_version(db, collection_name: str) -> None:
+    """Увеличить версию коллекции после записи"""
+    await db[META_COLLECTION].update_one(
+        {"_id": collection_name},
+        {"$inc": {"version": 1}, "$set": {"updated_at": datetime.utcnow()}},
+        upsert=True
+    )
+    catalogue_cache.invalidate(_VERSION_KEY)
+
+
+def invalidate_cached_version() -> None:
+    """Перечитать версию при следующем запросе (запись другим процессом)"""
+    catalogue_cache.invalidate(_VERSION_KEY)
+
+
+def make_etag(version: int, updated_at: datetime, resource: str) -> str:
+    """Слабый ETag для представления ресурса в данной версии коллекции"""
+    digest = hashlib.sha1(f"{version}:{updated_at.isoformat()}:{resource}".encode("utf8"))
+    return f'W/"{digest.hexdigest()[:20]}"'
+
+
+def http_date(value: datetime) -> str:
+    """Дата в формате заголовка Last-Modified (хранимые даты — naive UTC)"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def is_not_modified(
+    etag: str,
+    last_modified: datetime,
+    if_none_match: Optional[str],
+    if_modified_since: Optional[str]
+) -> bool:
+    """Проверить условные заголовки запроса (If-None-Match приоритетнее)"""
+    if if_none_match:
+        candidates = {tag.strip() for tag in if_none_match.split(",")}
+        if "*" in candidates:
+            return True
+        # Слабое сравнение: W/ префикс не учитывается
+        normalized = {tag[2:] if tag.startswith("W/") else tag for tag in candidates}
+        return etag[2:] in normalized
+
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        modified = last_modified
+        if modified.tzinfo is None:
+            modified = modified.replace(tzinfo=timezone.utc)
+        return modified.replace(microsecond=0) <= since
+
+    return False